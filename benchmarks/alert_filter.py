@@ -0,0 +1,99 @@
+"""
+Compares checking alerts of a batch one by one with `is_snoozed` and at once with `is_snoozed_many`.
+
+Round-trips are counted as commands and pipelines sent to redis. The redis backend
+uses fakeredis, set REDIS_URL to run it against a real server.
+
+Usage: uv run python benchmarks/alert_filter.py
+"""
+
+import asyncio
+import os
+import time
+import typing as t
+
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio import Redis
+from redis.asyncio.connection import AbstractConnection
+
+from alert_manager.services.alert_filter_backend import BaseAlertFilter, InMemoryAlertFilter, RedisAlertFilter
+
+BATCH_SIZES = (1, 10, 100, 1000)
+NUMBER = 20
+CHANNEL = 'alerts'
+
+
+class RoundTripCounter:
+    """
+    Counts commands and pipelines sent to redis by all connections.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def install(self) -> None:
+        send_packed_command = AbstractConnection.send_packed_command
+
+        async def counting_send_packed_command(connection: AbstractConnection, *args: t.Any, **kwargs: t.Any) -> None:
+            self.count += 1
+            await send_packed_command(connection, *args, **kwargs)
+
+        AbstractConnection.send_packed_command = counting_send_packed_command  # type: ignore[method-assign]
+
+
+async def check_one_by_one(alert_filter: BaseAlertFilter, rule_urls: list[str]) -> None:
+    for rule_url in rule_urls:
+        await alert_filter.is_snoozed(CHANNEL, rule_url)
+
+
+async def check_many(alert_filter: BaseAlertFilter, rule_urls: list[str]) -> None:
+    await alert_filter.is_snoozed_many(CHANNEL, rule_urls)
+
+
+async def measure(
+    func: t.Callable[[BaseAlertFilter, list[str]], t.Awaitable[None]],
+    alert_filter: BaseAlertFilter,
+    rule_urls: list[str],
+    round_trips: RoundTripCounter,
+) -> tuple[float, float]:
+    """
+    Returns round-trips and microseconds per batch.
+    """
+    await func(alert_filter, rule_urls)
+    round_trips.count = 0
+    started_at = time.perf_counter()
+    for _ in range(NUMBER):
+        await func(alert_filter, rule_urls)
+    return round_trips.count / NUMBER, (time.perf_counter() - started_at) / NUMBER * 1e6
+
+
+async def main() -> None:
+    round_trips = RoundTripCounter()
+    round_trips.install()
+    redis = Redis.from_url(redis_url) if (redis_url := os.environ.get('REDIS_URL')) else FakeRedis()
+    backends: list[tuple[str, BaseAlertFilter]] = [
+        ('in_memory', InMemoryAlertFilter()),
+        ('redis', RedisAlertFilter(redis)),
+    ]
+
+    print(f'{"backend":<10} {"batch":>6} {"loop, trips":>12} {"many, trips":>12} {"loop, us":>10} {"many, us":>10}')
+    for name, alert_filter in backends:
+        for batch_size in BATCH_SIZES:
+            rule_urls = [f'http://grafana/rule/{i}' for i in range(batch_size)]
+            for rule_url in rule_urls[::2]:
+                await alert_filter.snooze(CHANNEL, 'title', rule_url, 'user', minutes=10)
+
+            loop_trips, loop_time = await measure(check_one_by_one, alert_filter, rule_urls, round_trips)
+            many_trips, many_time = await measure(check_many, alert_filter, rule_urls, round_trips)
+            print(
+                f'{name:<10} {batch_size:>6} {loop_trips:>12.0f} {many_trips:>12.0f}',
+                f'{loop_time:>10.0f} {many_time:>10.0f}',
+            )
+            for rule_url in rule_urls[::2]:
+                await alert_filter.wake_up(alert_filter.create_key(CHANNEL, rule_url))
+
+    await redis.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Compares the in-memory, sqlite and redis filter backends.
+
+Reports microseconds per snooze (sequential and 100 concurrent ones), per
+`is_snoozed`, per `is_snoozed_many` of 100 alerts and milliseconds of `get_all`
+for a channel with 1000 snoozes. The redis backend uses fakeredis, set REDIS_URL
+to run it against a real server (keys of the `benchmark-*` channels are deleted afterwards).
+
+Usage: uv run python benchmarks/alert_filter_backends.py
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio import Redis
+
+from alert_manager.services.alert_filter_backend import (
+    BaseAlertFilter,
+    InMemoryAlertFilter,
+    RedisAlertFilter,
+    SqliteAlertFilter,
+)
+
+CHANNELS = 10
+SNOOZES = 10_000
+CHECKS = 10_000
+BATCH_SIZE = 100
+CONCURRENCY = 100
+
+
+def rule_url(i: int) -> str:
+    return f'http://grafana/d/a1b2c3d4/overview?viewPanel={i}'
+
+
+def channel(i: int) -> str:
+    return f'benchmark-{i % CHANNELS}'
+
+
+async def measure(func: Callable[[int], Awaitable[object]], count: int) -> float:
+    """
+    Returns microseconds per call.
+    """
+    started_at = time.perf_counter()
+    for i in range(count):
+        await func(i)
+    return (time.perf_counter() - started_at) / count * 1e6
+
+
+async def measure_concurrent_snoozes(alert_filter: BaseAlertFilter) -> float:
+    started_at = time.perf_counter()
+    for start in range(0, SNOOZES, CONCURRENCY):
+        await asyncio.gather(
+            *(
+                alert_filter.snooze(channel(i), 'title', rule_url(i), 'user', minutes=60)
+                for i in range(start, start + CONCURRENCY)
+            )
+        )
+    return (time.perf_counter() - started_at) / SNOOZES * 1e6
+
+
+async def run(name: str, alert_filter: BaseAlertFilter) -> None:
+    snooze_time = await measure(
+        lambda i: alert_filter.snooze(channel(i), 'title', rule_url(i), 'user', minutes=60), SNOOZES
+    )
+    concurrent_snooze_time = await measure_concurrent_snoozes(alert_filter)
+    # half of the checked alerts are snoozed
+    is_snoozed_time = await measure(
+        lambda i: alert_filter.is_snoozed(channel(i), rule_url(random.randrange(2 * SNOOZES))),  # noqa: S311
+        CHECKS,
+    )
+    is_snoozed_many_time = await measure(
+        lambda i: alert_filter.is_snoozed_many(
+            channel(i),
+            [rule_url(random.randrange(2 * SNOOZES)) for _ in range(BATCH_SIZE)],  # noqa: S311
+        ),
+        CHECKS // BATCH_SIZE,
+    )
+    started_at = time.perf_counter()
+    alerts = await alert_filter.get_all(channel(0))
+    get_all_time = (time.perf_counter() - started_at) * 1000
+    assert len(alerts) == SNOOZES // CHANNELS
+
+    print(
+        f'{name:<10} {snooze_time:>10.0f} {concurrent_snooze_time:>17.0f} {is_snoozed_time:>14.0f} '
+        f'{is_snoozed_many_time:>19.0f} {get_all_time:>12.1f}'
+    )
+
+    for i in range(SNOOZES):
+        await alert_filter.wake_up(alert_filter.create_key(channel(i), rule_url(i)))
+    await alert_filter.close()
+
+
+async def main() -> None:
+    print(
+        f'{"backend":<10} {"snooze, us":>10} {"concurrent, us":>17} {"is_snoozed, us":>14} '
+        f'{"is_snoozed_many, us":>19} {"get_all, ms":>12}'
+    )
+    await run('in_memory', InMemoryAlertFilter())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_alert_filter = SqliteAlertFilter(str(Path(tmp_dir) / 'snoozes.db'))
+        await sqlite_alert_filter.start()
+        await run('sqlite', sqlite_alert_filter)
+
+    redis = Redis.from_url(redis_url) if (redis_url := os.environ.get('REDIS_URL')) else FakeRedis()
+    await run('redis', RedisAlertFilter(redis))
+    await redis.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Compares JSON values of snoozes in redis with values encoded by `encode_alert_metadata`.
+
+Reports the size of values, the time of decoding 100k values by `decode_alert_metadata_batch`
+and the time of `RedisAlertFilter.get_all` for a channel with 100k snoozes, the best of a few runs
+after a garbage collection, so the order of encodings doesn't matter. The redis backend uses
+fakeredis, whose own overhead dominates the time of `get_all`, set REDIS_URL to run
+it against a real server (keys of the `benchmark` channel are deleted afterwards).
+
+Usage: uv run python benchmarks/alert_metadata_codec.py
+"""
+
+import asyncio
+import gc
+import os
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio import Redis
+
+from alert_manager.entities.alert_metadata import AlertMetadata
+from alert_manager.services.alert_filter_backend import RedisAlertFilter
+from alert_manager.services.alert_metadata_codec import decode_alert_metadata_batch, encode_alert_metadata
+
+SNOOZES = 100_000
+CHANNEL = 'benchmark'
+BATCH_SIZE = 1000
+RUNS = 5
+
+
+def create_metadata(i: int) -> AlertMetadata:
+    return AlertMetadata(
+        title=f'[Alerting] High load on the site {i}',
+        rule_url=f'https://grafana.example.com/d/a1b2c3d4/site-overview?orgId=1&viewPanel={i}&editPanel={i}',
+        snoozed_by='user_nick',
+        snoozed_until=(datetime.now() + timedelta(hours=1)).timestamp(),
+        channel=CHANNEL,
+    )
+
+
+async def fill(alert_filter: RedisAlertFilter, values: list[tuple[AlertMetadata, bytes]]) -> None:
+    for start in range(0, len(values), BATCH_SIZE):
+        async with alert_filter.redis.pipeline(transaction=False) as pipe:
+            for metadata, raw in values[start : start + BATCH_SIZE]:
+                key = alert_filter.create_key(metadata.channel, metadata.rule_url)
+                pipe.set(key, raw, ex=3600)
+                pipe.zadd(f'{alert_filter.index_prefix}:{metadata.channel}', {key: metadata.snoozed_until})
+            await pipe.execute()
+
+
+async def clean(alert_filter: RedisAlertFilter, values: list[tuple[AlertMetadata, bytes]]) -> None:
+    for start in range(0, len(values), BATCH_SIZE):
+        batch = values[start : start + BATCH_SIZE]
+        keys = [alert_filter.create_key(metadata.channel, metadata.rule_url) for metadata, _ in batch]
+        await alert_filter.redis.delete(*keys)
+    await alert_filter.redis.delete(f'{alert_filter.index_prefix}:{CHANNEL}')
+
+
+async def measure(func: Callable[[], Awaitable[object]]) -> float:
+    """
+    Returns the best time of `RUNS` calls in seconds.
+    """
+    times = []
+    for _ in range(RUNS):
+        gc.collect()
+        started_at = time.perf_counter()
+        await func()
+        times.append(time.perf_counter() - started_at)
+    return min(times)
+
+
+async def main() -> None:
+    redis = Redis.from_url(redis_url) if (redis_url := os.environ.get('REDIS_URL')) else FakeRedis()
+    alert_filter = RedisAlertFilter(redis)
+    snoozes = [create_metadata(i) for i in range(SNOOZES)]
+    encodings = [
+        ('json', [(metadata, metadata.model_dump_json().encode()) for metadata in snoozes]),
+        ('binary', [(metadata, encode_alert_metadata(metadata)) for metadata in snoozes]),
+    ]
+
+    print(f'{"encoding":<10} {"bytes/value":>12} {"decode, ms":>11} {"get_all, ms":>12}')
+    for name, values in encodings:
+        raw_values = [raw for _, raw in values]
+        rule_urls = [metadata.rule_url for metadata, _ in values]
+
+        async def decode(raw_values: list[bytes] = raw_values, rule_urls: list[str] = rule_urls) -> object:
+            return decode_alert_metadata_batch(raw_values, CHANNEL, rule_urls)
+
+        decode_time = await measure(decode)
+
+        await fill(alert_filter, values)
+        assert len(await alert_filter.get_all(CHANNEL)) == SNOOZES
+        get_all_time = await measure(lambda: alert_filter.get_all(CHANNEL))
+        await clean(alert_filter, values)
+
+        value_size = sum(len(raw) for _, raw in values) / len(values)
+        print(f'{name:<10} {value_size:>12.0f} {decode_time * 1000:>11.0f} {get_all_time * 1000:>12.0f}')
+
+    await redis.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
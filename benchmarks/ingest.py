@@ -0,0 +1,49 @@
+"""
+Compares decoding of grafana webhooks by the pydantic models and by the fast ingest path.
+
+Usage: uv run python benchmarks/ingest.py
+"""
+
+import json
+import timeit
+
+from pydantic import TypeAdapter
+
+from alert_manager.web.entities.grafana import GrafanaAlertRequest
+from alert_manager.web.entities.grafana_fast import grafana_alert_decoder
+
+EVAL_MATCHES_COUNTS = (10, 100, 1000)
+NUMBER = 200
+
+
+def make_payload(eval_matches_count: int) -> bytes:
+    return json.dumps(
+        {
+            'title': '[Alerting] Test notification',
+            'ruleId': 1,
+            'ruleName': 'Test notification',
+            'ruleUrl': 'http://grafana/alerting/1/edit',
+            'state': 'alerting',
+            'message': 'Someone is testing the alert notification within Grafana.',
+            'evalMatches': [
+                {'metric': f'host-{i}', 'value': i * 1.5, 'tags': {'host': f'host-{i}', 'dc': 'eu'}}
+                for i in range(eval_matches_count)
+            ],
+        }
+    ).encode()
+
+
+def main() -> None:
+    # the same steps as aiohttp_deps.Json does: parse json and then validate it
+    adapter = TypeAdapter(GrafanaAlertRequest)
+
+    print(f'{"evalMatches":>12} {"pydantic, us":>14} {"fast, us":>10} {"speedup":>8}')
+    for count in EVAL_MATCHES_COUNTS:
+        body = make_payload(count)
+        pydantic_time = timeit.timeit(lambda: adapter.validate_python(json.loads(body)), number=NUMBER) / NUMBER
+        fast_time = timeit.timeit(lambda: grafana_alert_decoder.decode(body), number=NUMBER) / NUMBER
+        print(f'{count:>12} {pydantic_time * 1e6:>14.1f} {fast_time * 1e6:>10.1f} {pydantic_time / fast_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
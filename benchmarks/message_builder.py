@@ -0,0 +1,76 @@
+"""
+Measures memory allocated by MessageBuilder per message.
+
+Copy-free paths are compared with what they replaced: the snooze select block
+built for every message and a deep copy of the blocks on every snooze click.
+
+Usage: uv run python benchmarks/message_builder.py
+"""
+
+import copy
+import timeit
+import tracemalloc
+import typing as t
+
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.services.slack.message import SNOOZE_TIME_SELECT_BLOCK, MessageBuilder
+from alert_manager.web.entities.grafana import EvalMatch
+
+NUMBER = 1000
+EVAL_MATCHES = [EvalMatch(metric=f'host-{i}', value=i) for i in range(10)]
+ACTION_DATA = {'selected_option': {'text': {'type': 'plain_text', 'text': '15 min'}, 'value': '15'}}
+
+
+def create_message() -> list[dict[str, t.Any]]:
+    _, blocks = MessageBuilder.create_alert_message(
+        state=GrafanaAlertState.alerting,
+        title='[Alerting] High load on the site',
+        rule_url='http://grafana/alerting/1/edit',
+        message='message',
+        eval_matches=EVAL_MATCHES,
+    )
+    return blocks
+
+
+def create_message_with_own_select_block() -> list[dict[str, t.Any]]:
+    blocks = create_message()
+    blocks[-1] = copy.deepcopy(SNOOZE_TIME_SELECT_BLOCK)
+    return blocks
+
+
+def add_status_with_deepcopy(blocks: list[dict[str, t.Any]]) -> list[dict[str, t.Any]]:
+    return MessageBuilder.add_alert_status_to_message(copy.deepcopy(blocks), ACTION_DATA, snoozed_by='user')
+
+
+def add_status(blocks: list[dict[str, t.Any]]) -> list[dict[str, t.Any]]:
+    return MessageBuilder.add_alert_status_to_message(blocks, ACTION_DATA, snoozed_by='user')
+
+
+def allocated_per_call(func: t.Callable[[], t.Any]) -> float:
+    results = []
+    tracemalloc.start()
+    for _ in range(NUMBER):
+        # results are kept alive, so the memory they hold is counted
+        results.append(func())
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / NUMBER
+
+
+def main() -> None:
+    blocks = create_message()
+    cases = [
+        ('create_alert_message, select block per message', create_message_with_own_select_block),
+        ('create_alert_message, shared select block', create_message),
+        ('add_alert_status_to_message, deepcopy', lambda: add_status_with_deepcopy(blocks)),
+        ('add_alert_status_to_message, shallow copy', lambda: add_status(blocks)),
+    ]
+
+    print(f'{"case":<50} {"bytes/call":>11} {"us/call":>8}')
+    for name, func in cases:
+        call_time = timeit.timeit(func, number=NUMBER) / NUMBER
+        print(f'{name:<50} {allocated_per_call(func):>11.0f} {call_time * 1e6:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
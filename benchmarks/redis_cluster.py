@@ -0,0 +1,93 @@
+"""
+Measures how throughput of RedisAlertFilter scales with the number of shards of a redis cluster.
+
+The cluster is a local stand-in: every node is a fakeredis server which serves one
+command or pipeline at a time and spends SERVICE_TIME on it, like a single-threaded
+redis with a network round-trip. Slots are split evenly between nodes. Keys of a
+channel carry the `{channel}` hash tag, so every call of the filter goes to one node.
+With many shards the throughput is bounded by the CPU of the benchmark process,
+which runs all nodes.
+
+Usage: uv run python benchmarks/redis_cluster.py
+"""
+
+import asyncio
+import random
+import time
+import typing as t
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio.connection import AbstractConnection
+from redis.crc import REDIS_CLUSTER_HASH_SLOTS, key_slot
+
+from alert_manager.services.alert_filter_backend import RedisAlertFilter
+
+SHARD_COUNTS = (1, 2, 4, 8)
+SERVICE_TIME = 0.002
+CHANNELS = [f'alerts-{i}' for i in range(64)]
+RULE_URLS = [f'http://grafana/rule/{i}' for i in range(5)]
+CLIENTS = 64
+DURATION = 2
+
+_node_locks: dict[FakeServer, asyncio.Lock] = {}
+_send_packed_command = AbstractConnection.send_packed_command
+
+
+async def serve_one_at_a_time(self: AbstractConnection, *args: t.Any, **kwargs: t.Any) -> None:
+    async with _node_locks[self._server]:  # type: ignore[attr-defined]
+        await asyncio.sleep(SERVICE_TIME)
+        await _send_packed_command(self, *args, **kwargs)
+
+
+AbstractConnection.send_packed_command = serve_one_at_a_time  # type: ignore[method-assign]
+
+
+class StandInCluster:
+    def __init__(self, shard_count: int) -> None:
+        self.filters = []
+        for _ in range(shard_count):
+            server = FakeServer()
+            _node_locks[server] = asyncio.Lock()
+            self.filters.append(RedisAlertFilter(FakeRedis(server=server), hash_tags=True))
+
+    def get_filter(self, channel: str) -> RedisAlertFilter:
+        # the same slot as of `{channel};rule_url` keys
+        slot = key_slot(channel.encode())
+        return self.filters[slot * len(self.filters) // REDIS_CLUSTER_HASH_SLOTS]
+
+
+async def run_client(cluster: StandInCluster, deadline: float) -> int:
+    operations = 0
+    while time.perf_counter() < deadline:
+        channel = random.choice(CHANNELS)  # noqa: S311
+        alert_filter = cluster.get_filter(channel)
+        if operations % 10:
+            await alert_filter.is_snoozed_many(channel, RULE_URLS)
+        else:
+            await alert_filter.snooze(channel, 'title', random.choice(RULE_URLS), 'user', minutes=10)  # noqa: S311
+        operations += 1
+    return operations
+
+
+async def measure(shard_count: int) -> float:
+    """
+    Returns operations per second.
+    """
+    cluster = StandInCluster(shard_count)
+    deadline = time.perf_counter() + DURATION
+    operations = await asyncio.gather(*(run_client(cluster, deadline) for _ in range(CLIENTS)))
+    return sum(operations) / DURATION
+
+
+async def main() -> None:
+    print(f'{"shards":>6} {"ops/s":>8} {"speedup":>8}')
+    base_throughput = None
+    for shard_count in SHARD_COUNTS:
+        throughput = await measure(shard_count)
+        base_throughput = base_throughput or throughput
+        print(f'{shard_count:>6} {throughput:>8.0f} {throughput / base_throughput:>7.1f}x')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
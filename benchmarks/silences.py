@@ -0,0 +1,54 @@
+"""
+Measures checking the labels of an eval match in `SilenceIndex` depending on the number of active silences.
+
+Silences are looked up by the labels of the eval match, so only the silences of
+its label values are checked. A linear scan of all silences is shown for comparison.
+
+Usage: uv run python benchmarks/silences.py
+"""
+
+import time
+import typing as t
+
+from alert_manager.entities.silence import Silence
+from alert_manager.services.silences import SilenceIndex, _Matcher, get_series_labels, parse_matchers
+
+SILENCE_COUNTS = (1, 10, 100, 1000, 10000)
+LOOKUPS = 1000
+NOW = 1000.0
+LABELS = get_series_labels(
+    'High load on the site',
+    {'__name__': 'my_app_open_page_total', 'instance': 'app:8000', 'job': 'my_app', 'name': 'index'},
+)
+
+
+def measure(func: t.Callable[..., object], *args: t.Any) -> float:
+    """
+    Returns microseconds per lookup.
+    """
+    func(*args)
+    started_at = time.perf_counter()
+    for _ in range(LOOKUPS):
+        func(*args)
+    return (time.perf_counter() - started_at) / LOOKUPS * 1e6
+
+
+def linear_scan(silences: list[list[_Matcher]], labels: dict[str, str]) -> bool:
+    return any(all(matcher.matches(labels.get(matcher.name, '')) for matcher in matchers) for matchers in silences)
+
+
+def main() -> None:
+    print(f'{"silences":>8} {"index, us":>10} {"linear scan, us":>16}')
+    for count in SILENCE_COUNTS:
+        index = SilenceIndex()
+        silences = []
+        for i in range(count):
+            matchers = parse_matchers(f'job="job-{i % 100}", instance=~"db-{i}.*"')
+            index.add(Silence(id=str(i), channel='alerts', matchers=matchers, created_by='user', ends_at=NOW + 60))
+            silences.append([_Matcher.compile(matcher) for matcher in matchers])
+
+        print(f'{count:>8} {measure(index.match, LABELS, NOW):>10.2f} {measure(linear_scan, silences, LABELS):>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures the cost of SnoozeJournal for InMemoryAlertFilter with 100k snoozes.
+
+Reports the time of a snooze with and without the journal, the time of writing a
+snapshot (in a thread, off the event loop) and the time of a restart from the
+snapshot and from the log.
+
+Usage: uv run python benchmarks/snooze_journal.py
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from alert_manager.services.alert_filter_backend import InMemoryAlertFilter
+from alert_manager.services.snooze_journal import SnoozeJournal
+
+SNOOZES = 100_000
+
+
+async def snooze_all(alert_filter: InMemoryAlertFilter) -> float:
+    """
+    Returns microseconds per snooze.
+    """
+    started_at = time.perf_counter()
+    for i in range(SNOOZES):
+        await alert_filter.snooze(
+            f'alerts-{i % 100}', f'[Alerting] High load {i}', f'http://grafana/d/{i}?viewPanel=1', 'user', minutes=60
+        )
+    return (time.perf_counter() - started_at) / SNOOZES * 1e6
+
+
+def restart(path: str) -> float:
+    """
+    Returns milliseconds of restoring the snoozes.
+    """
+    started_at = time.perf_counter()
+    alert_filter = InMemoryAlertFilter(max_size=SNOOZES, journal=SnoozeJournal(path))
+    restart_time = (time.perf_counter() - started_at) * 1000
+    assert len(alert_filter._snoozed_alerts) == SNOOZES
+    alert_filter._periodic_clean_task.cancel()
+    return restart_time
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / 'snoozes.log')
+
+        snooze_time = await snooze_all(InMemoryAlertFilter(max_size=SNOOZES))
+        journal = SnoozeJournal(path, snapshot_interval=3600)
+        alert_filter = InMemoryAlertFilter(max_size=SNOOZES, journal=journal)
+        journal_snooze_time = await snooze_all(alert_filter)
+        print(f'snooze, us:              {snooze_time:.1f} without journal, {journal_snooze_time:.1f} with journal')
+
+        await journal._flush()
+        print(f'restart from log, ms:    {restart(path):.0f}')
+
+        journal.snapshot_interval = 0
+        started_at = time.perf_counter()
+        await journal._flush()
+        print(f'snapshot, ms:            {(time.perf_counter() - started_at) * 1000:.0f}')
+        print(f'restart from snapshot, ms: {restart(path):.0f}')
+        await alert_filter.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Measures a lookup in `SnoozePatternIndex` depending on the number of active pattern snoozes.
+
+Prefix patterns (`https://grafana/d/<uid>/*`) are looked up in a trie by the prefix,
+glob patterns (`https://grafana/d/*?viewPanel=<id>`) by the suffix. A linear scan of
+the prefixes is shown for comparison.
+
+Usage: uv run python benchmarks/snooze_patterns.py
+"""
+
+import time
+import typing as t
+
+from alert_manager.services.snooze_patterns import SnoozePatternIndex
+
+PATTERN_COUNTS = (1, 10, 100, 1000, 10000)
+LOOKUPS = 10_000
+NOW = 1000.0
+RULE_URL = 'https://grafana.example.com/d/not-snoozed/site-overview?orgId=1&viewPanel=0'
+
+
+def measure(func: t.Callable[..., object], *args: t.Any) -> float:
+    """
+    Returns microseconds per lookup.
+    """
+    func(*args)
+    started_at = time.perf_counter()
+    for _ in range(LOOKUPS):
+        func(*args)
+    return (time.perf_counter() - started_at) / LOOKUPS * 1e6
+
+
+def linear_scan(prefixes: list[str], rule_url: str) -> bool:
+    return any(rule_url.startswith(prefix) for prefix in prefixes)
+
+
+def main() -> None:
+    print(f'{"patterns":>8} {"prefix, us":>11} {"glob, us":>9} {"linear scan, us":>16}')
+    for count in PATTERN_COUNTS:
+        prefix_index = SnoozePatternIndex()
+        glob_index = SnoozePatternIndex()
+        for i in range(count):
+            prefix_index.add(f'https://grafana.example.com/d/{i:08x}/*', NOW + 60)
+            glob_index.add(f'https://grafana.example.com/d/*?orgId=1&viewPanel={i + 1}', NOW + 60)
+        prefixes = [f'https://grafana.example.com/d/{i:08x}/' for i in range(count)]
+
+        print(
+            f'{count:>8} {measure(prefix_index.match, RULE_URL, NOW):>11.2f} '
+            f'{measure(glob_index.match, RULE_URL, NOW):>9.2f} {measure(linear_scan, prefixes, RULE_URL):>16.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,32 @@
+import aiohttp
 from slack_sdk.socket_mode.aiohttp import SocketModeClient
 from slack_sdk.web.async_client import AsyncWebClient
 
 from alert_manager.bot.handlers import Dispatcher
 from alert_manager.services.alert_filter_backend import BaseAlertFilter
+from alert_manager.services.silence_backend import BaseSilenceBackend
+from alert_manager.services.slack.sender import SlackSender
 
 
 async def create_client(
     slack_client: AsyncWebClient,
+    slack_sender: SlackSender,
     slack_socket_mode_token: str,
     alert_filter: BaseAlertFilter,
+    silence_backend: BaseSilenceBackend,
     use_channel_id: bool,
+    session: aiohttp.ClientSession | None = None,
 ) -> SocketModeClient:
     slack_socket_client = SocketModeClient(
         app_token=slack_socket_mode_token,
         web_client=slack_client,
     )
+    if session is not None:
+        # the client always creates its own session, it is replaced by the shared one
+        await slack_socket_client.aiohttp_client_session.close()
+        slack_socket_client.aiohttp_client_session = session
 
-    dispatcher = Dispatcher(slack_client, alert_filter, use_channel_id=use_channel_id)
+    dispatcher = Dispatcher(slack_sender, alert_filter, silence_backend, use_channel_id=use_channel_id)
     slack_socket_client.socket_mode_request_listeners.append(dispatcher)  # type: ignore[arg-type]
     await slack_socket_client.connect()  # type: ignore[no-untyped-call]
     return slack_socket_client
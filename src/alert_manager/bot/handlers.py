@@ -1,15 +1,21 @@
 import logging
 import typing as t
+import uuid
+from datetime import datetime, timedelta
 from functools import wraps
 
 from slack_sdk.socket_mode.aiohttp import SocketModeClient
 from slack_sdk.socket_mode.request import SocketModeRequest
 from slack_sdk.socket_mode.response import SocketModeResponse
-from slack_sdk.web.async_client import AsyncWebClient
 
+from alert_manager.entities.silence import Silence
 from alert_manager.services.alert_filter_backend import BaseAlertFilter
+from alert_manager.services.silence_backend import BaseSilenceBackend
+from alert_manager.services.silences import parse_matchers
 from alert_manager.services.slack.exceptions import RuleUrlExtractError
 from alert_manager.services.slack.message import MessageBuilder, get_rule_url
+from alert_manager.services.slack.sender import SlackSender
+from alert_manager.services.snooze_patterns import WILDCARD, is_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +34,14 @@ def auto_ack[T, **P](func: t.Callable[P, t.Awaitable[T]]) -> t.Callable[P, t.Awa
 class Dispatcher:
     def __init__(
         self,
-        slack_client: AsyncWebClient,
+        slack_sender: SlackSender,
         alert_filter: BaseAlertFilter,
+        silence_backend: BaseSilenceBackend,
         use_channel_id: bool,
     ) -> None:
-        self.slack_client = slack_client
+        self.slack_sender = slack_sender
         self.alert_filter: BaseAlertFilter = alert_filter
+        self.silence_backend = silence_backend
         self.use_channel_id = use_channel_id
 
     async def __call__(self, client: SocketModeClient, request: SocketModeRequest) -> None:
@@ -52,10 +60,18 @@ class Dispatcher:
             await self.snooze_handler(client=client, request=request, action=actions_by_ids['snooze-for'])
         if 'wake-up' in actions_by_ids:
             await self.wake_up_handler(client=client, request=request, action=actions_by_ids['wake-up'])
+        if 'expire-silence' in actions_by_ids:
+            await self.expire_silence_handler(client=client, request=request, action=actions_by_ids['expire-silence'])
 
     async def _dispatch_commands(self, *, client: SocketModeClient, request: SocketModeRequest) -> None:
         if request.payload['command'] == '/get-snoozed-alerts':
             await self.get_snoozed_alerts_handler(client=client, request=request)
+        if request.payload['command'] == '/snooze-pattern':
+            await self.snooze_pattern_handler(client=client, request=request)
+        if request.payload['command'] == '/silence':
+            await self.silence_handler(client=client, request=request)
+        if request.payload['command'] == '/get-silences':
+            await self.get_silences_handler(client=client, request=request)
 
     @auto_ack
     async def snooze_handler(
@@ -97,11 +113,12 @@ class Dispatcher:
             minutes=int(minutes),
         )
 
-        await self.slack_client.chat_update(
+        await self.slack_sender.update_message(
             channel=channel_id,
             ts=request.payload['message']['ts'],
             blocks=blocks,
             text=title,
+            interactive=True,
         )
 
     @auto_ack
@@ -115,25 +132,124 @@ class Dispatcher:
         blocks = MessageBuilder.remove_woke_alert(
             message_blocks=request.payload['message']['blocks'], alert_key=alert_key
         )
-        await self.slack_client.chat_update(
+        await self.slack_sender.update_message(
             channel=request.payload['channel']['id'],
             ts=request.payload['message']['ts'],
             blocks=blocks,
             text=text,
+            interactive=True,
         )
 
     @auto_ack
     async def get_snoozed_alerts_handler(self, *, client: SocketModeClient, request: SocketModeRequest) -> None:
-        if self.use_channel_id:
-            channel = request.payload['channel_id']
-        else:
-            channel = request.payload['channel_name']
-
+        channel = self._get_command_channel(request)
         snoozed_alerts = await self.alert_filter.get_all(channel)
         text, blocks = MessageBuilder.create_list_snoozed_alerts(snoozed_alerts)
-        await self.slack_client.chat_postMessage(
+        await self.slack_sender.post_message(
+            channel=request.payload['channel_id'],
+            user=request.payload['user_id'],
+            blocks=blocks,
+            text=text,
+            interactive=True,
+        )
+
+    @auto_ack
+    async def snooze_pattern_handler(self, *, client: SocketModeClient, request: SocketModeRequest) -> None:
+        """
+        Snoozes all alerts whose rule url matches a pattern: `/snooze-pattern <minutes> <pattern>`.
+        """
+        minutes, _, pattern = request.payload['text'].strip().partition(' ')
+        # slack wraps urls in angle brackets
+        pattern = pattern.strip().strip('<>')
+        if not minutes.isdigit() or not is_pattern(pattern):
+            text = (
+                f'Usage: /snooze-pattern <minutes> <pattern>, `{WILDCARD}` in the pattern matches any characters, '
+                f'e.g. /snooze-pattern 60 https://grafana.example.com/d/a1b2c3d4/{WILDCARD}'
+            )
+        else:
+            await self.alert_filter.snooze(
+                channel=self._get_command_channel(request),
+                title=f'Alerts matching {pattern}',
+                rule_url=pattern,
+                snoozed_by=request.payload['user_name'],
+                minutes=int(minutes),
+            )
+            text = (
+                f'Alerts matching {pattern} are snoozed for {minutes} minutes'
+                if int(minutes)
+                else f'Alerts matching {pattern} are woken up'
+            )
+
+        await self.slack_sender.post_message(
+            channel=request.payload['channel_id'],
+            user=request.payload['user_id'],
+            text=text,
+            interactive=True,
+        )
+
+    @auto_ack
+    async def silence_handler(self, *, client: SocketModeClient, request: SocketModeRequest) -> None:
+        """
+        Silences alerts by labels of eval matches: `/silence <minutes> <matchers>`.
+        """
+        minutes, _, matchers_text = request.payload['text'].strip().partition(' ')
+        try:
+            if not minutes.isdigit() or int(minutes) == 0:
+                raise ValueError('The number of minutes must be a positive integer')
+            matchers = parse_matchers(matchers_text)
+        except ValueError as err:
+            text = f'{err}. Usage: /silence <minutes> <matchers>, e.g. /silence 60 instance=~"db-.*", job="api"'
+        else:
+            silence = Silence(
+                id=uuid.uuid4().hex,
+                channel=self._get_command_channel(request),
+                matchers=matchers,
+                created_by=request.payload['user_name'],
+                ends_at=(datetime.now() + timedelta(minutes=int(minutes))).timestamp(),
+            )
+            await self.silence_backend.add(silence)
+            text = f'Alerts matching `{", ".join(map(str, matchers))}` are silenced for {minutes} minutes'
+
+        await self.slack_sender.post_message(
+            channel=request.payload['channel_id'],
+            user=request.payload['user_id'],
+            text=text,
+            interactive=True,
+        )
+
+    @auto_ack
+    async def get_silences_handler(self, *, client: SocketModeClient, request: SocketModeRequest) -> None:
+        silence_index = await self.silence_backend.get_index(self._get_command_channel(request))
+        silences = silence_index.get_all(datetime.now().timestamp()) if silence_index is not None else []
+        text, blocks = MessageBuilder.create_list_silences(silences)
+        await self.slack_sender.post_message(
             channel=request.payload['channel_id'],
             user=request.payload['user_id'],
             blocks=blocks,
             text=text,
+            interactive=True,
+        )
+
+    @auto_ack
+    async def expire_silence_handler(
+        self, *, client: SocketModeClient, request: SocketModeRequest, action: dict[str, t.Any]
+    ) -> None:
+        silence_key = action['value']
+        channel, silence_id = silence_key.split(';', 1)
+        await self.silence_backend.expire(channel, silence_id)
+
+        blocks = MessageBuilder.remove_expired_silence(
+            message_blocks=request.payload['message']['blocks'], silence_key=silence_key
         )
+        await self.slack_sender.update_message(
+            channel=request.payload['channel']['id'],
+            ts=request.payload['message']['ts'],
+            blocks=blocks,
+            text=request.payload['message']['text'],
+            interactive=True,
+        )
+
+    def _get_command_channel(self, request: SocketModeRequest) -> str:
+        if self.use_channel_id:
+            return t.cast(str, request.payload['channel_id'])
+        return t.cast(str, request.payload['channel_name'])
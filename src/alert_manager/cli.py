@@ -1,6 +1,11 @@
+import asyncio
+
 import click
 from aiohttp import web
 
+from alert_manager.config import RedisMode, get_config
+from alert_manager.main import create_redis
+from alert_manager.services.alert_filter_backend import RedisAlertFilter
 from alert_manager.wsgi import app
 
 
@@ -16,5 +21,23 @@ def serve(host: str, port: int) -> None:
     web.run_app(app=app, host=host, port=port)
 
 
+@cli.command()
+def migrate_snooze_index() -> None:
+    """
+    Indexes snoozes stored in redis by a version without the per-channel snooze index.
+    """
+    indexed = asyncio.run(_migrate_snooze_index())
+    click.echo(f'Indexed {indexed} snoozed alerts')
+
+
+async def _migrate_snooze_index() -> int:
+    config = get_config()
+    redis = create_redis(config)
+    try:
+        return await RedisAlertFilter(redis, hash_tags=config.redis_mode == RedisMode.cluster).migrate_index()
+    finally:
+        await redis.aclose()
+
+
 if __name__ == '__main__':
     cli()
@@ -42,6 +42,24 @@ class LogTimestampFmt(Enum):
 class FilterBackend(Enum):
     in_memory = 'in_memory'
     redis = 'redis'
+    sqlite = 'sqlite'
+
+
+class RedisMode(Enum):
+    standalone = 'standalone'
+    cluster = 'cluster'
+    sentinel = 'sentinel'
+
+
+class SlackDeliveryMode(Enum):
+    sync = 'sync'
+    queue = 'queue'
+
+
+class DeliveryOverflowPolicy(Enum):
+    reject = 'reject'
+    drop_oldest = 'drop_oldest'
+    block = 'block'
 
 
 VAULT_ADDR = os.environ.get('VAULT_ADDR')
@@ -55,7 +73,23 @@ class Config(BaseSettings):
     log_timestamp_format: LogTimestampFmt = LogTimestampFmt.iso
     log_health_check_is_enable: bool = True
     filter_backend: FilterBackend = Field(default=FilterBackend.in_memory)
+    in_memory_filter_max_size: int = Field(default=100000, gt=0)
+    in_memory_filter_journal_path: str | None = Field(default=None)
+    in_memory_filter_journal_flush_interval: float = Field(default=1, gt=0)
+    in_memory_filter_snapshot_interval: float = Field(default=300, gt=0)
+    sqlite_filter_path: str = 'snoozes.db'
     router_prefix: str = ''
+    bulk_max_alerts: int = Field(default=1000, gt=0)
+    bulk_max_alert_size: int = Field(default=64 * 1024, gt=0)
+    bulk_delivery_concurrency: int = Field(default=10, gt=0)
+    bulk_delivery_timeout: float = Field(default=10, gt=0)
+    fast_ingest: bool = Field(default=False)
+    webhook_max_in_flight: int = Field(default=1000, ge=0)
+    webhook_max_body_size: int = Field(default=1024 * 1024, gt=0)
+    webhook_rate_limit: float = Field(default=0, ge=0)
+    webhook_rate_limit_burst: int = Field(default=100, gt=0)
+    webhook_dedupe_ttl: int = Field(default=0, ge=0)
+    webhook_dedupe_max_size: int = Field(default=10000, gt=0)
     use_channel_id: bool = Field(default=False)
     accounts: Json[dict[str, str]] | None = Field(
         default=None,
@@ -79,6 +113,31 @@ class Config(BaseSettings):
             'vault_secret_key': 'slack_socket_mode_token',
         }
     )
+    slack_rate_limit: float = Field(default=1, gt=0)
+    slack_rate_limit_burst: int = Field(default=3, gt=0)
+    slack_rate_limit_max_retries: int = Field(default=3, ge=0)
+    slack_raw_client: bool = Field(default=False)
+    slack_http_pool_size: int = Field(default=100, ge=0)
+    slack_http_pool_size_per_host: int = Field(default=0, ge=0)
+    slack_http_keepalive_timeout: float = Field(default=30, gt=0)
+    slack_http_dns_cache_ttl: int = Field(default=300, ge=0)
+    slack_coalesce_window: int = Field(default=0, ge=0)
+    slack_digest_channels: Json[dict[str, int]] | None = Field(default=None)
+    slack_thread_repeats: bool = Field(default=False)
+    slack_resolve_in_place: bool = Field(default=False)
+    message_index_max_size: int = Field(default=10000, gt=0)
+    message_index_ttl: int = Field(default=7 * 24 * 60 * 60, gt=0)
+    slack_delivery_mode: SlackDeliveryMode = SlackDeliveryMode.sync
+    slack_delivery_queue_size: int = Field(default=1000, gt=0)
+    slack_delivery_workers: int = Field(default=4, gt=0)
+    slack_delivery_overflow_policy: DeliveryOverflowPolicy = DeliveryOverflowPolicy.reject
+    slack_delivery_shutdown_timeout: float = Field(default=10, ge=0)
+    slack_outbox: bool = Field(default=False)
+    slack_outbox_path: str = 'slack-outbox.log'
+    slack_outbox_max_len: int = Field(default=100000, gt=0)
+    slack_outbox_batch_size: int = Field(default=50, gt=0)
+    slack_outbox_min_backoff: float = Field(default=1, gt=0)
+    slack_outbox_max_backoff: float = Field(default=60, gt=0)
 
     # redis
     redis_url: str | None = Field(
@@ -110,6 +169,16 @@ class Config(BaseSettings):
         },
     )
     redis_ssl_check_hostname: bool = True
+    redis_mode: RedisMode = RedisMode.standalone
+    redis_sentinel_nodes: Json[list[str]] | None = Field(default=None)
+    redis_sentinel_master: str = 'mymaster'
+    redis_max_connections: int = Field(default=50, gt=0)
+    redis_socket_timeout: float = Field(default=5, gt=0)
+    redis_socket_connect_timeout: float = Field(default=5, gt=0)
+    redis_health_check_interval: int = Field(default=30, ge=0)
+    redis_near_cache: bool = Field(default=False)
+    redis_near_cache_max_size: int = Field(default=10000, gt=0)
+    redis_near_cache_ttl: float = Field(default=60, gt=0)
 
     model_config: t.ClassVar[SettingsConfigDict] = SettingsConfigDict(env_file=project_dir / '.env', extra='ignore')
 
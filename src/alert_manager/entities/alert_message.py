@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Any
+
+from alert_manager.enums.grafana import GrafanaAlertState
+
+
+@dataclass(slots=True)
+class AlertMessage:
+    """
+    Alert rendered by MessageBuilder and ready to be delivered to Slack.
+    """
+
+    key: str
+    webhook_channel: str
+    channel: str
+    rule_url: str
+    state: GrafanaAlertState
+    text: str
+    blocks: list[dict[str, Any]]
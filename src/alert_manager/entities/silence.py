@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+from alert_manager.enums.silence import MatchOperator
+
+
+class LabelMatcher(BaseModel):
+    name: str
+    operator: MatchOperator
+    value: str
+
+    def __str__(self) -> str:
+        return f'{self.name}{self.operator.value}"{self.value}"'
+
+
+class Silence(BaseModel):
+    id: str
+    channel: str
+    matchers: list[LabelMatcher]
+    created_by: str
+    ends_at: float
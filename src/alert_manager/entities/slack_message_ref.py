@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class SlackMessageRef(BaseModel):
+    channel: str
+    ts: str
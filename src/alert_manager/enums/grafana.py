@@ -7,3 +7,8 @@ class GrafanaAlertState(Enum):
     no_data = 'no_data'
     pending = 'pending'
     alerting = 'alerting'
+
+
+class GrafanaUnifiedAlertStatus(Enum):
+    firing = 'firing'
+    resolved = 'resolved'
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class MatchOperator(Enum):
+    equal = '='
+    not_equal = '!='
+    regex = '=~'
+    not_regex = '!~'
@@ -0,0 +1,73 @@
+import math
+from collections import Counter
+
+from aiohttp import BasicAuth, hdrs, web
+
+from alert_manager.libs.rate_limit import TokenBucket
+
+
+class AdmissionControl:
+    """
+    Sheds webhook requests before they are handled, so a flood of alerts can't starve the event loop.
+
+    Requests are rejected when too many requests are already in flight (503),
+    when the declared body is too large (413) or when the authenticated account
+    has exhausted its token bucket (429). Rejections are cheap: the body is never read.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str,
+        max_in_flight: int,
+        max_body_size: int,
+        rate: float,
+        burst: int,
+        accounts: dict[str, str] | None,
+    ) -> None:
+        self.path_prefix = path_prefix
+        self.max_in_flight = max_in_flight
+        self.max_body_size = max_body_size
+        self.rate = rate
+        self.accounts = accounts or {}
+        self.in_flight = 0
+        self.stats: Counter[str] = Counter()
+        self._buckets: dict[str, TokenBucket] = (
+            {login: TokenBucket(rate=rate, capacity=burst) for login in self.accounts} if rate else {}
+        )
+
+    def applies_to(self, request: web.Request) -> bool:
+        return request.path.startswith(self.path_prefix)
+
+    def check(self, request: web.Request) -> web.Response | None:
+        """
+        Returns the response to reject the request with or None if the request is admitted.
+        """
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            self.stats['shed'] += 1
+            return web.Response(status=503, text='Too many requests in flight', headers={hdrs.RETRY_AFTER: '1'})
+
+        if request.content_length is not None and request.content_length > self.max_body_size:
+            self.stats['too_large'] += 1
+            return web.Response(status=413, text=f'Request body is too large, max size is {self.max_body_size} bytes')
+
+        if (bucket := self._get_bucket(request)) is not None and not bucket.try_acquire():
+            self.stats['throttled'] += 1
+            retry_after = str(math.ceil(1 / self.rate))
+            return web.Response(status=429, text='Rate limit exceeded', headers={hdrs.RETRY_AFTER: retry_after})
+
+        return None
+
+    def _get_bucket(self, request: web.Request) -> TokenBucket | None:
+        """
+        Returns the bucket of the authenticated account. Unauthenticated requests
+        are not throttled here, they are rejected by `require_user` later.
+        """
+        if not self._buckets or not (auth_header := request.headers.get(hdrs.AUTHORIZATION)):
+            return None
+        try:
+            basic_auth = BasicAuth.decode(auth_header=auth_header)
+        except ValueError:
+            return None
+        if self.accounts.get(basic_auth.login) != basic_auth.password:
+            return None
+        return self._buckets[basic_auth.login]
@@ -0,0 +1,18 @@
+import gc
+import typing as t
+from contextlib import contextmanager
+
+
+@contextmanager
+def paused_gc() -> t.Iterator[None]:
+    """
+    Pauses the garbage collector while many objects without reference cycles are created,
+    e.g. models of all snoozes. Otherwise they trigger full collections which scan the whole heap.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
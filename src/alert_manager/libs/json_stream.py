@@ -0,0 +1,152 @@
+import re
+import typing as t
+
+# characters which change the nesting of a json value, `"` starts a string
+_STRUCTURAL_RE = re.compile(rb'["\[\]{},]')
+_STRING_END_RE = re.compile(rb'["\\]')
+
+
+class ItemSplitter(t.Protocol):
+    @property
+    def pending_size(self) -> int:
+        """
+        Size of the incomplete item which is buffered until the rest of it arrives.
+        """
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """
+        Returns items completed by the chunk, raises ValueError if the data is malformed.
+        """
+
+    def close(self) -> list[bytes]:
+        """
+        Returns the last item, raises ValueError if the data is truncated.
+        """
+
+
+class NdjsonSplitter:
+    """
+    Splits ndjson into raw lines as chunks of it arrive, empty lines are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = b''
+
+    @property
+    def pending_size(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        *lines, self._buffer = (self._buffer + chunk).split(b'\n')
+        return [line for line in map(bytes.strip, lines) if line]
+
+    def close(self) -> list[bytes]:
+        line, self._buffer = self._buffer.strip(), b''
+        return [line] if line else []
+
+
+class JsonArraySplitter:
+    """
+    Splits a json array into raw elements as chunks of it arrive.
+
+    Only strings and brackets are tracked to find the commas between elements,
+    the elements themselves are not validated.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        # where to continue scanning the buffer from
+        self._position = 0
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._depth = 0
+        self._count = 0
+
+    @property
+    def pending_size(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        self._buffer += chunk
+        items: list[bytes] = []
+        while self._step(items):
+            pass
+        return items
+
+    def close(self) -> list[bytes]:
+        if not self._finished:
+            raise ValueError('Json array is not complete')
+        return []
+
+    def _step(self, items: list[bytes]) -> bool:
+        """
+        Scans the buffer up to the next structural character, returns False if more data is needed.
+        """
+        if self._finished:
+            return self._skip_trailing_whitespace()
+        if not self._started:
+            return self._start()
+        if self._in_string:
+            return self._skip_string()
+
+        if (match := _STRUCTURAL_RE.search(self._buffer, self._position)) is None:
+            self._position = len(self._buffer)
+            return False
+        char = match[0]
+        self._position = match.end()
+        if char == b'"':
+            self._in_string = True
+        elif char in (b'[', b'{'):
+            self._depth += 1
+        elif self._depth:
+            if char != b',':
+                self._depth -= 1
+        elif char == b'}':
+            raise ValueError('Invalid json array')
+        else:
+            self._end_item(match.start(), char, items)
+            self._finished = char == b']'
+        return True
+
+    def _start(self) -> bool:
+        if not (data := self._buffer.lstrip()):
+            self._buffer.clear()
+            return False
+        if not data.startswith(b'['):
+            raise ValueError('Body must be a json array or ndjson')
+        self._buffer = data[1:]
+        self._started = True
+        return True
+
+    def _skip_trailing_whitespace(self) -> bool:
+        if self._buffer.strip():
+            raise ValueError('Unexpected data after the json array')
+        self._buffer.clear()
+        return False
+
+    def _skip_string(self) -> bool:
+        if (match := _STRING_END_RE.search(self._buffer, self._position)) is None:
+            self._position = len(self._buffer)
+            return False
+        if match[0] == b'"':
+            self._position = match.end()
+            self._in_string = False
+            return True
+        if match.end() == len(self._buffer):
+            # the escaped character is in the next chunk
+            self._position = match.start()
+            return False
+        self._position = match.end() + 1
+        return True
+
+    def _end_item(self, end: int, separator: bytes, items: list[bytes]) -> None:
+        item = bytes(self._buffer[:end].strip())
+        del self._buffer[: self._position]
+        self._position = 0
+        if item:
+            items.append(item)
+            self._count += 1
+        elif separator == b',' or self._count:
+            # `[,` or `,,` or `,]`, only `[]` may have no item
+            raise ValueError('Invalid json array')
@@ -0,0 +1,40 @@
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket which hands out reservations instead of rejecting calls.
+
+    `reserve` always takes a token and returns how long the caller must wait
+    before using it, so bursts are spread out instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        self._refill()
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """
+        Empties the bucket so that the next token becomes available in `seconds`.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
@@ -1,27 +1,53 @@
+import asyncio
+import typing as t
 from collections.abc import Awaitable, Callable
 from functools import partial
+from pathlib import Path
 
+import aiohttp
 import sentry_sdk
 from aiohttp import web
 from aiohttp.web_exceptions import HTTPError
 from aiohttp_deps import VALUES_OVERRIDES_KEY, Router, setup_swagger
 from aiohttp_deps import init as deps_init
 from redis.asyncio.client import Redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
 from redis.connection import parse_url as parse_redis_url
 from sentry_sdk.integrations.aiohttp import AioHttpIntegration
 from sentry_sdk.integrations.asyncio import AsyncioIntegration
+from slack_sdk.errors import SlackApiError
 from slack_sdk.web.async_client import AsyncWebClient
 from structlog import getLogger
 
 from alert_manager.bot.app import create_client as create_slack_socket_client
-from alert_manager.config import Config, FilterBackend
+from alert_manager.config import Config, FilterBackend, RedisMode, SlackDeliveryMode
+from alert_manager.libs.admission import AdmissionControl
 from alert_manager.libs.security import accounts_dep
 from alert_manager.libs.sentry import capture_message
 from alert_manager.logger import init_logger
 from alert_manager.services.alert_filter_backend import (
     InMemoryAlertFilter,
     RedisAlertFilter,
+    SqliteAlertFilter,
 )
+from alert_manager.services.dedupe_backend import BaseDedupeCache, InMemoryDedupeCache, RedisDedupeCache
+from alert_manager.services.message_index_backend import (
+    BaseMessageIndex,
+    InMemoryMessageIndex,
+    RedisMessageIndex,
+)
+from alert_manager.services.outbox_backend import BaseOutbox, FileOutbox, RedisOutbox
+from alert_manager.services.silence_backend import BaseSilenceBackend, InMemorySilenceBackend, RedisSilenceBackend
+from alert_manager.services.slack.coalescer import AlertCoalescer
+from alert_manager.services.slack.delivery import DeliveryQueue
+from alert_manager.services.slack.digest import AlertDigest
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.outbox import SlackOutbox
+from alert_manager.services.slack.raw_client import SlackRawClient
+from alert_manager.services.slack.sender import SlackSender
+from alert_manager.services.snooze_cache import SnoozeNearCache
+from alert_manager.services.snooze_journal import SnoozeJournal
 from alert_manager.web.views import router
 
 logger = getLogger(__name__)
@@ -53,38 +79,253 @@ async def error_logging_middleware(
     return response
 
 
+@web.middleware
+async def admission_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    admission_control: AdmissionControl = request.app['admission_control']
+    if not admission_control.applies_to(request):
+        return await handler(request)
+
+    if (response := admission_control.check(request)) is not None:
+        return response
+
+    admission_control.in_flight += 1
+    try:
+        return await handler(request)
+    finally:
+        admission_control.in_flight -= 1
+
+
 async def startup_handler(app: web.Application, config: Config) -> None:
     if config.filter_backend == FilterBackend.redis:
-        if config.redis_url is None:
-            raise ValueError('Redis url is not set')
-        redis_params = {
-            **parse_redis_url(config.redis_url),  # type: ignore[no-untyped-call]
-            'ssl': bool(config.redis_ssl_ca_certs_path),
-            'ssl_ca_certs': config.redis_ssl_ca_certs_path,
-            'ssl_certfile': config.redis_ssl_client_cert_path,
-            'ssl_keyfile': config.redis_ssl_client_key_path,
-            'ssl_check_hostname': config.redis_ssl_check_hostname,
-        }
-        app['redis'] = Redis(**redis_params)
-        app['alert_filter'] = RedisAlertFilter(app['redis'])
+        if config.redis_near_cache and config.redis_mode == RedisMode.cluster:
+            raise ValueError('Redis near-cache is not supported in cluster mode')
+        app['redis'] = create_redis(config)
         await app['redis'].ping()
+        if config.redis_near_cache:
+            app['snooze_near_cache'] = SnoozeNearCache(
+                app['redis'],
+                max_size=config.redis_near_cache_max_size,
+                ttl=config.redis_near_cache_ttl,
+                poll_interval=min(1, config.redis_socket_timeout / 2),
+            )
+            app['snooze_near_cache'].start()
+            app['stats']['snooze_near_cache'] = app['snooze_near_cache'].stats
+        app['alert_filter'] = RedisAlertFilter(
+            app['redis'],
+            near_cache=app.get('snooze_near_cache'),
+            hash_tags=config.redis_mode == RedisMode.cluster,
+        )
+    elif config.filter_backend == FilterBackend.sqlite:
+        app['alert_filter'] = SqliteAlertFilter(config.sqlite_filter_path)
+        await app['alert_filter'].start()
     else:
-        app['alert_filter'] = InMemoryAlertFilter()
+        journal = (
+            SnoozeJournal(
+                config.in_memory_filter_journal_path,
+                flush_interval=config.in_memory_filter_journal_flush_interval,
+                snapshot_interval=config.in_memory_filter_snapshot_interval,
+            )
+            if config.in_memory_filter_journal_path
+            else None
+        )
+        app['alert_filter'] = InMemoryAlertFilter(max_size=config.in_memory_filter_max_size, journal=journal)
+    if config.webhook_dedupe_ttl:
+        app['dedupe_cache'] = create_dedupe_cache(app, config)
+    app['silence_backend'] = create_silence_backend(app, config)
 
-    app['slack_client'] = AsyncWebClient(token=config.slack_token)
+    app['slack_session'] = create_slack_session(config)
+    app['slack_client'] = AsyncWebClient(token=config.slack_token, session=app['slack_session'])
+    await warm_up_slack_client(app['slack_client'])
+    if config.slack_raw_client:
+        app['slack_raw_client'] = SlackRawClient(app['slack_client'])
+    app['slack_sender'] = SlackSender(
+        app['slack_client'],
+        rate=config.slack_rate_limit,
+        burst=config.slack_rate_limit_burst,
+        max_retries=config.slack_rate_limit_max_retries,
+        raw_client=app.get('slack_raw_client'),
+    )
+    app['stats']['slack_sender'] = app['slack_sender'].stats
+    coalescer = AlertCoalescer(config.slack_coalesce_window) if config.slack_coalesce_window else None
+    digest = AlertDigest(app['slack_sender'], config.slack_digest_channels) if config.slack_digest_channels else None
+    app['alert_notifier'] = AlertNotifier(
+        app['slack_sender'],
+        coalescer=coalescer,
+        digest=digest,
+        thread_index=create_message_index(app, config, prefix='thread') if config.slack_thread_repeats else None,
+        open_alerts=create_message_index(app, config, prefix='open') if config.slack_resolve_in_place else None,
+    )
+    app['stats']['alert_notifier'] = app['alert_notifier'].stats
+    if config.slack_outbox:
+        app['slack_outbox'] = SlackOutbox(
+            create_outbox(app, config),
+            app['alert_notifier'],
+            batch_size=config.slack_outbox_batch_size,
+            min_backoff=config.slack_outbox_min_backoff,
+            max_backoff=config.slack_outbox_max_backoff,
+        )
+        app['slack_outbox'].start()
+        app['stats']['slack_outbox'] = app['slack_outbox'].stats
+    if config.slack_delivery_mode == SlackDeliveryMode.queue:
+        app['delivery_queue'] = DeliveryQueue(
+            app['alert_notifier'],
+            max_size=config.slack_delivery_queue_size,
+            workers=config.slack_delivery_workers,
+            overflow_policy=config.slack_delivery_overflow_policy,
+            outbox=app.get('slack_outbox'),
+        )
+        app['delivery_queue'].start()
     app['slack_socket_client'] = await create_slack_socket_client(
         app['slack_client'],
+        app['slack_sender'],
         config.slack_socket_mode_token,
         app['alert_filter'],
+        app['silence_backend'],
         use_channel_id=config.use_channel_id,
+        session=app['slack_session'],
     )
     app['use_channel_id'] = config.use_channel_id
 
 
-async def shutdown_handler(app: web.Application) -> None:
+class RedisConnectionParams(t.TypedDict):
+    ssl: bool
+    ssl_ca_certs: Path | None
+    ssl_certfile: Path | None
+    ssl_keyfile: Path | None
+    ssl_check_hostname: bool
+    socket_timeout: float
+    socket_connect_timeout: float
+    health_check_interval: int
+    max_connections: int
+
+
+def create_redis(config: Config) -> Redis | RedisCluster:
+    if config.redis_url is None:
+        raise ValueError('Redis url is not set')
+    connection_params = RedisConnectionParams(
+        ssl=bool(config.redis_ssl_ca_certs_path),
+        ssl_ca_certs=config.redis_ssl_ca_certs_path,
+        ssl_certfile=config.redis_ssl_client_cert_path,
+        ssl_keyfile=config.redis_ssl_client_key_path,
+        ssl_check_hostname=config.redis_ssl_check_hostname,
+        socket_timeout=config.redis_socket_timeout,
+        socket_connect_timeout=config.redis_socket_connect_timeout,
+        health_check_interval=config.redis_health_check_interval,
+        max_connections=config.redis_max_connections,
+    )
+
+    if config.redis_mode == RedisMode.cluster:
+        # the url is one of the startup nodes, the rest of the cluster is discovered
+        return RedisCluster.from_url(config.redis_url, **connection_params)
+
+    redis_params = parse_redis_url(config.redis_url)  # type: ignore[no-untyped-call]
+    if config.redis_mode == RedisMode.sentinel:
+        if not config.redis_sentinel_nodes:
+            raise ValueError('Redis sentinel nodes are not set')
+        sentinel = Sentinel(  # type: ignore[no-untyped-call]
+            [(host, int(port)) for host, port in (node.rsplit(':', 1) for node in config.redis_sentinel_nodes)],
+            sentinel_kwargs={
+                'socket_timeout': config.redis_socket_timeout,
+                'socket_connect_timeout': config.redis_socket_connect_timeout,
+            },
+        )
+        # the host of the url is ignored, the address of the master is asked from sentinels
+        master: Redis = sentinel.master_for(
+            config.redis_sentinel_master,
+            username=redis_params.get('username'),
+            password=redis_params.get('password'),
+            db=redis_params.get('db', 0),
+            **connection_params,
+        )
+        return master
+
+    # options from the query string of the url take precedence
+    return Redis(**{**connection_params, **redis_params})
+
+
+def create_slack_session(config: Config) -> aiohttp.ClientSession:
+    """
+    Creates the http session shared by all Slack clients, so connections to Slack are kept alive and reused.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=config.slack_http_pool_size,
+        limit_per_host=config.slack_http_pool_size_per_host,
+        keepalive_timeout=config.slack_http_keepalive_timeout,
+        ttl_dns_cache=config.slack_http_dns_cache_ttl or None,
+        use_dns_cache=bool(config.slack_http_dns_cache_ttl),
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def warm_up_slack_client(slack_client: AsyncWebClient) -> None:
+    """
+    Opens a connection to Slack before the first alert is received.
+    """
+    try:
+        await slack_client.auth_test()
+    except (SlackApiError, aiohttp.ClientError, TimeoutError) as err:
+        logger.warning('Failed to warm up Slack client', error=str(err))
+
+
+def create_message_index(app: web.Application, config: Config, prefix: str) -> BaseMessageIndex:
+    if config.filter_backend == FilterBackend.redis:
+        return RedisMessageIndex(app['redis'], ttl=config.message_index_ttl, prefix=prefix)
+    return InMemoryMessageIndex(max_size=config.message_index_max_size, ttl=config.message_index_ttl)
+
+
+def create_dedupe_cache(app: web.Application, config: Config) -> BaseDedupeCache:
+    if config.filter_backend == FilterBackend.redis:
+        return RedisDedupeCache(app['redis'], ttl=config.webhook_dedupe_ttl)
+    return InMemoryDedupeCache(max_size=config.webhook_dedupe_max_size, ttl=config.webhook_dedupe_ttl)
+
+
+def create_silence_backend(app: web.Application, config: Config) -> BaseSilenceBackend:
+    if config.filter_backend == FilterBackend.redis:
+        return RedisSilenceBackend(app['redis'])
+    return InMemorySilenceBackend()
+
+
+def create_outbox(app: web.Application, config: Config) -> BaseOutbox:
+    if config.filter_backend == FilterBackend.redis:
+        return RedisOutbox(app['redis'], max_len=config.slack_outbox_max_len)
+    return FileOutbox(config.slack_outbox_path, max_len=config.slack_outbox_max_len)
+
+
+async def shutdown_handler(app: web.Application, config: Config) -> None:
+    await wait_bulk_deliveries(app['bulk_delivery_tasks'], timeout=config.slack_delivery_shutdown_timeout)
+    if delivery_queue := app.get('delivery_queue'):
+        await delivery_queue.stop(timeout=config.slack_delivery_shutdown_timeout)
+    if slack_outbox := app.get('slack_outbox'):
+        await slack_outbox.stop()
+    if (notifier := app.get('alert_notifier')) and notifier.digest:
+        await notifier.digest.close()
+    if raw_client := app.get('slack_raw_client'):
+        await raw_client.close()
+    if alert_filter := app.get('alert_filter'):
+        await alert_filter.close()
+    if snooze_near_cache := app.get('snooze_near_cache'):
+        await snooze_near_cache.close()
     if redis := app.get('redis'):
         await redis.aclose()
     await app['slack_socket_client'].close()
+    if slack_session := app.get('slack_session'):
+        await slack_session.close()
+
+
+async def wait_bulk_deliveries(tasks: set[asyncio.Task[None]], timeout: float) -> None:
+    """
+    Waits for alerts of bulk requests which were answered with `queued` but are still being sent.
+    """
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning('Bulk alerts delivery is interrupted by shutdown, alerts are lost', rules=len(pending))
 
 
 def app_factory(config: Config) -> web.Application:
@@ -106,11 +347,32 @@ def app_factory(config: Config) -> web.Application:
     main_router = Router()
     main_router.add_routes(router, prefix=config.router_prefix)
 
-    app = web.Application(middlewares=[error_logging_middleware])
+    # rejected requests are not logged, otherwise the logging would read their bodies
+    app = web.Application(
+        middlewares=[admission_middleware, error_logging_middleware],
+        client_max_size=config.webhook_max_body_size,
+    )
     app.on_startup.extend((deps_init, setup_swagger(), partial(startup_handler, config=config)))
-    app.on_shutdown.append(shutdown_handler)
+    app.on_shutdown.append(partial(shutdown_handler, config=config))
     app.add_routes(main_router)
 
     app[VALUES_OVERRIDES_KEY] = {accounts_dep: config.accounts}
+    app['stats'] = {}
+    app['bulk_max_alerts'] = config.bulk_max_alerts
+    app['bulk_max_alert_size'] = config.bulk_max_alert_size
+    app['bulk_delivery_concurrency'] = config.bulk_delivery_concurrency
+    app['bulk_delivery_timeout'] = config.bulk_delivery_timeout
+    app['bulk_delivery_tasks'] = set()
+    app['webhook_max_body_size'] = config.webhook_max_body_size
+    app['admission_control'] = AdmissionControl(
+        path_prefix=f'{config.router_prefix}/webhook/',
+        max_in_flight=config.webhook_max_in_flight,
+        max_body_size=config.webhook_max_body_size,
+        rate=config.webhook_rate_limit,
+        burst=config.webhook_rate_limit_burst,
+        accounts=config.accounts,
+    )
+    app['stats']['admission'] = app['admission_control'].stats
+    app['fast_ingest'] = config.fast_ingest
 
     return app
@@ -1,10 +1,31 @@
+import asyncio
+import heapq
+import sqlite3
+import typing as t
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+import msgspec
+from pydantic import ValidationError
 from redis.asyncio import Redis
+from redis.asyncio.cluster import RedisCluster
+from structlog import getLogger
 
 from alert_manager.entities.alert_metadata import AlertMetadata
 from alert_manager.libs.asyncio_utils import periodic_task
+from alert_manager.libs.gc_utils import paused_gc
+from alert_manager.services.alert_metadata_codec import (
+    decode_alert_metadata,
+    decode_alert_metadata_batch,
+    encode_alert_metadata,
+)
+from alert_manager.services.snooze_cache import SnoozeNearCache
+from alert_manager.services.snooze_journal import SnoozeJournal
+from alert_manager.services.snooze_patterns import SnoozePatternIndex, SnoozePatterns, is_pattern
+
+logger = getLogger(__name__)
 
 
 class BaseAlertFilter(ABC):
@@ -22,14 +43,46 @@ class BaseAlertFilter(ABC):
     async def is_snoozed(self, channel: str, rule_url: str) -> bool:
         raise NotImplementedError  # pragma: no cover
 
+    @abstractmethod
+    async def is_snoozed_many(self, channel: str, rule_urls: Iterable[str]) -> dict[str, bool]:
+        """
+        Checks all alerts in one round-trip to the storage, duplicated rule urls are checked once.
+        """
+        raise NotImplementedError  # pragma: no cover
+
     @abstractmethod
     async def get_all(self, channel: str) -> dict[str, AlertMetadata]:
         raise NotImplementedError  # pragma: no cover
 
+    async def close(self) -> None:
+        pass
+
 
 class InMemoryAlertFilter(BaseAlertFilter):
-    def __init__(self) -> None:
+    """
+    Keeps snoozes in memory. Expired snoozes are removed incrementally in order
+    of `snoozed_until` using a min-heap, `get_all` reads a channel -> keys index.
+
+    At most `max_size` snoozes are kept, when another alert is snoozed
+    the snooze which ends first is dropped.
+
+    With a `journal`, snoozes are restored after a restart.
+
+    A snooze of a rule url with `*` is a pattern snooze, see `SnoozePatternIndex`.
+    """
+
+    def __init__(self, max_size: int = 100000, journal: SnoozeJournal | None = None) -> None:
+        self.max_size = max_size
+        self.journal = journal
         self._snoozed_alerts: dict[str, AlertMetadata] = {}
+        self._channel_keys: dict[str, set[str]] = {}
+        # entries of removed or re-snoozed alerts stay in the heap until they are popped
+        self._expirations: list[tuple[float, str]] = []
+        self._patterns = SnoozePatterns()
+        if self.journal is not None:
+            with paused_gc():
+                self._restore(self.journal.load())
+            self.journal.start(self._snoozed_alerts.items)
         self._periodic_clean_task = periodic_task(self._clean_alerts, 120)
 
     async def snooze(self, channel: str, title: str, rule_url: str, snoozed_by: str, minutes: int) -> None:
@@ -37,45 +90,340 @@ class InMemoryAlertFilter(BaseAlertFilter):
         if minutes == 0:
             await self.wake_up(key)
         else:
-            self._snoozed_alerts[key] = AlertMetadata(
+            metadata = AlertMetadata(
                 title=title,
                 rule_url=rule_url,
                 snoozed_by=snoozed_by,
                 snoozed_until=(datetime.now() + timedelta(minutes=minutes)).timestamp(),
                 channel=channel,
             )
+            self._add(key, metadata)
+            if self.journal is not None:
+                self.journal.snooze(key, metadata)
 
     async def wake_up(self, key: str) -> None:
-        self._snoozed_alerts.pop(key, '')
+        self._remove(key)
+        if self.journal is not None:
+            self.journal.wake_up(key)
 
     async def is_snoozed(self, channel: str, rule_url: str) -> bool:
         key = self.create_key(channel, rule_url)
 
-        if key not in self._snoozed_alerts:
-            return False
+        current_timestamp = datetime.now().timestamp()
+
+        if (metadata := self._snoozed_alerts.get(key)) is not None:
+            if metadata.snoozed_until > current_timestamp:
+                return True
+            self._remove(key)
 
-        if self._snoozed_alerts[key].snoozed_until > datetime.now().timestamp():
-            return True
-        else:
-            del self._snoozed_alerts[key]
+        return self._patterns.match(channel, rule_url, current_timestamp)
 
-        return False
+    async def is_snoozed_many(self, channel: str, rule_urls: Iterable[str]) -> dict[str, bool]:
+        current_timestamp = datetime.now().timestamp()
+        result = {}
+        for rule_url in rule_urls:
+            if rule_url in result:
+                continue
+            key = self.create_key(channel, rule_url)
+            if (metadata := self._snoozed_alerts.get(key)) is not None:
+                if metadata.snoozed_until > current_timestamp:
+                    result[rule_url] = True
+                    continue
+                self._remove(key)
+            result[rule_url] = self._patterns.match(channel, rule_url, current_timestamp)
+        return result
 
     async def _clean_alerts(self) -> None:
         current_timestamp = datetime.now().timestamp()
-        self._snoozed_alerts = {
+        while self._expirations and self._expirations[0][0] <= current_timestamp:
+            snoozed_until, key = heapq.heappop(self._expirations)
+            if self._is_current_expiration(snoozed_until, key):
+                self._remove(key)
+
+    async def get_all(self, channel: str) -> dict[str, AlertMetadata]:
+        current_timestamp = datetime.now().timestamp()
+        return {
             key: metadata
-            for key, metadata in self._snoozed_alerts.items()
-            if metadata.snoozed_until > current_timestamp
+            for key in self._channel_keys.get(channel, ())
+            if (metadata := self._snoozed_alerts[key]).snoozed_until > current_timestamp
         }
 
+    async def close(self) -> None:
+        self._periodic_clean_task.cancel()
+        if self.journal is not None:
+            await self.journal.close()
+
+    def _add(self, key: str, metadata: AlertMetadata) -> None:
+        if key not in self._snoozed_alerts and len(self._snoozed_alerts) >= self.max_size:
+            self._evict()
+
+        self._snoozed_alerts[key] = metadata
+        self._channel_keys.setdefault(metadata.channel, set()).add(key)
+        if is_pattern(metadata.rule_url):
+            self._patterns.add(metadata.channel, metadata.rule_url, metadata.snoozed_until)
+        heapq.heappush(self._expirations, (metadata.snoozed_until, key))
+        if len(self._expirations) > 2 * len(self._snoozed_alerts):
+            # too many outdated entries, e.g. alerts are woken up or re-snoozed often
+            self._expirations = [(metadata.snoozed_until, key) for key, metadata in self._snoozed_alerts.items()]
+            heapq.heapify(self._expirations)
+
+    def _restore(self, snoozes: dict[str, AlertMetadata]) -> None:
+        if len(snoozes) > self.max_size:
+            # the same as dropping the snoozes which end first one by one
+            kept_snoozes = dict(heapq.nlargest(self.max_size, snoozes.items(), key=lambda item: item[1].snoozed_until))
+            if self.journal is not None:
+                for key in snoozes.keys() - kept_snoozes.keys():
+                    self.journal.wake_up(key)
+            snoozes = kept_snoozes
+
+        self._snoozed_alerts.update(snoozes)
+        for key, metadata in snoozes.items():
+            self._channel_keys.setdefault(metadata.channel, set()).add(key)
+            if is_pattern(metadata.rule_url):
+                self._patterns.add(metadata.channel, metadata.rule_url, metadata.snoozed_until)
+        self._expirations = [(metadata.snoozed_until, key) for key, metadata in snoozes.items()]
+        heapq.heapify(self._expirations)
+
+    def _remove(self, key: str) -> None:
+        if (metadata := self._snoozed_alerts.pop(key, None)) is None:
+            return
+        channel_keys = self._channel_keys[metadata.channel]
+        channel_keys.discard(key)
+        if not channel_keys:
+            del self._channel_keys[metadata.channel]
+        if is_pattern(metadata.rule_url):
+            self._patterns.remove(metadata.channel, metadata.rule_url)
+
+    def _evict(self) -> None:
+        while self._expirations:
+            snoozed_until, key = heapq.heappop(self._expirations)
+            if self._is_current_expiration(snoozed_until, key):
+                self._remove(key)
+                # otherwise the dropped snooze is restored after a restart
+                if self.journal is not None:
+                    self.journal.wake_up(key)
+                logger.warning('Too many snoozed alerts, the snooze which ends first is dropped', key=key)
+                return
+
+    def _is_current_expiration(self, snoozed_until: float, key: str) -> bool:
+        return (metadata := self._snoozed_alerts.get(key)) is not None and metadata.snoozed_until == snoozed_until
+
+
+class SqliteAlertFilter(BaseAlertFilter):
+    """
+    Keeps snoozes in a SQLite database in WAL mode, so they survive a restart
+    without an extra service.
+
+    All queries run in a dedicated thread, the event loop is never blocked by disk I/O.
+    Writes made while the previous batch is being committed are committed together
+    in one transaction. Expired snoozes are skipped by queries and deleted every
+    `sweep_interval` seconds using the index on `snoozed_until`.
+
+    Pattern snoozes are loaded into memory on start, so the database must not be
+    shared by several instances of the application.
+    """
+
+    # SQLITE_MAX_VARIABLE_NUMBER is 999 in SQLite before 3.32
+    max_query_params = 900
+
+    def __init__(self, path: str, sweep_interval: float = 120) -> None:
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite-alert-filter')
+        # set by `start`
+        self._connection: sqlite3.Connection
+        self._patterns = SnoozePatterns()
+        self._pending_writes: list[tuple[str, Sequence[str | float]]] = []
+        self._write_task: asyncio.Task[None] | None = None
+        self._periodic_sweep_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """
+        Opens the database and loads pattern snoozes, must be awaited before the filter is used.
+        """
+        self._connection = await self._run(self._connect)
+        for channel, pattern, snoozed_until in await self._run(self._select_patterns, datetime.now().timestamp()):
+            self._patterns.add(channel, pattern, snoozed_until)
+        self._periodic_sweep_task = periodic_task(self._sweep_expired, self.sweep_interval)
+
+    async def snooze(self, channel: str, title: str, rule_url: str, snoozed_by: str, minutes: int) -> None:
+        if minutes == 0:
+            await self.wake_up(self.create_key(channel, rule_url))
+        else:
+            snoozed_until = (datetime.now() + timedelta(minutes=minutes)).timestamp()
+            await self._write(
+                'INSERT OR REPLACE INTO snoozed_alerts (channel, rule_url, title, snoozed_by, snoozed_until) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (channel, rule_url, title, snoozed_by, snoozed_until),
+            )
+            if is_pattern(rule_url):
+                self._patterns.add(channel, rule_url, snoozed_until)
+
+    async def wake_up(self, key: str) -> None:
+        channel, rule_url = key.split(';', 1)
+        await self._write('DELETE FROM snoozed_alerts WHERE channel = ? AND rule_url = ?', (channel, rule_url))
+        if is_pattern(rule_url):
+            self._patterns.remove(channel, rule_url)
+
+    async def is_snoozed(self, channel: str, rule_url: str) -> bool:
+        current_timestamp = datetime.now().timestamp()
+        if self._patterns.match(channel, rule_url, current_timestamp):
+            return True
+        rows = await self._read(
+            'SELECT 1 FROM snoozed_alerts WHERE channel = ? AND rule_url = ? AND snoozed_until > ?',
+            (channel, rule_url, current_timestamp),
+        )
+        return bool(rows)
+
+    async def is_snoozed_many(self, channel: str, rule_urls: Iterable[str]) -> dict[str, bool]:
+        current_timestamp = datetime.now().timestamp()
+        result = {rule_url: self._patterns.match(channel, rule_url, current_timestamp) for rule_url in set(rule_urls)}
+        if missed_rule_urls := [rule_url for rule_url, snoozed in result.items() if not snoozed]:
+            snoozed_rule_urls = await self._run(
+                self._select_snoozed_rule_urls, channel, missed_rule_urls, current_timestamp
+            )
+            result.update(dict.fromkeys(snoozed_rule_urls, True))
+        return result
+
     async def get_all(self, channel: str) -> dict[str, AlertMetadata]:
-        return {key: metadata for key, metadata in self._snoozed_alerts.items() if metadata.channel == channel}
+        rows = await self._read(
+            'SELECT rule_url, title, snoozed_by, snoozed_until FROM snoozed_alerts '
+            'WHERE channel = ? AND snoozed_until > ?',
+            (channel, datetime.now().timestamp()),
+        )
+        return {
+            self.create_key(channel, rule_url): AlertMetadata(
+                title=title, rule_url=rule_url, snoozed_by=snoozed_by, snoozed_until=snoozed_until, channel=channel
+            )
+            for rule_url, title, snoozed_by, snoozed_until in rows
+        }
+
+    async def close(self) -> None:
+        if self._periodic_sweep_task is not None:
+            self._periodic_sweep_task.cancel()
+            self._periodic_sweep_task = None
+        if self._write_task is not None:
+            await asyncio.gather(self._write_task, return_exceptions=True)
+        if hasattr(self, '_connection'):
+            await self._run(self._connection.close)
+        self._executor.shutdown()
+
+    async def _sweep_expired(self) -> None:
+        # the periodic task stops on the first exception, so a failed sweep is retried with the next one
+        try:
+            await self._write('DELETE FROM snoozed_alerts WHERE snoozed_until <= ?', (datetime.now().timestamp(),))
+        except sqlite3.Error:
+            logger.exception('Failed to sweep expired snoozes')
+
+    async def _write(self, query: str, params: Sequence[str | float]) -> None:
+        self._pending_writes.append((query, params))
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.create_task(self._commit_pending_writes())
+        # a cancelled caller must not cancel the commit of writes of other callers
+        await asyncio.shield(self._write_task)
+
+    async def _commit_pending_writes(self) -> None:
+        # writes added while a batch is committed go to the next batch of the same task
+        while self._pending_writes:
+            batch, self._pending_writes = self._pending_writes, []
+            await self._run(self._execute_batch, batch)
+
+    async def _read(self, query: str, params: Sequence[str | float]) -> list[tuple[t.Any, ...]]:
+        rows: list[tuple[t.Any, ...]] = await self._run(self._fetch_all, query, params)
+        return rows
+
+    async def _run(self, func: Callable[..., t.Any], *args: t.Any) -> t.Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # the methods below run in the thread of the executor
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit mode, transactions are opened explicitly by `_execute_batch`
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        connection.execute('PRAGMA journal_mode = WAL')
+        # in WAL mode a commit is durable after a checkpoint, a crash of the OS may lose the last commits only
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS snoozed_alerts ('
+            'channel TEXT NOT NULL, '
+            'rule_url TEXT NOT NULL, '
+            'title TEXT NOT NULL, '
+            'snoozed_by TEXT NOT NULL, '
+            'snoozed_until REAL NOT NULL, '
+            'PRIMARY KEY (channel, rule_url)'
+            ') WITHOUT ROWID'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS snoozed_alerts_snoozed_until_idx ON snoozed_alerts (snoozed_until)'
+        )
+        return connection
+
+    def _execute_batch(self, batch: list[tuple[str, Sequence[str | float]]]) -> None:
+        self._connection.execute('BEGIN')
+        try:
+            for query, params in batch:
+                self._connection.execute(query, params)
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+
+    def _fetch_all(self, query: str, params: Sequence[str | float]) -> list[tuple[t.Any, ...]]:
+        return self._connection.execute(query, params).fetchall()
+
+    def _select_patterns(self, current_timestamp: float) -> list[tuple[str, str, float]]:
+        return self._connection.execute(
+            'SELECT channel, rule_url, snoozed_until FROM snoozed_alerts '
+            "WHERE rule_url LIKE '%*%' AND snoozed_until > ?",
+            (current_timestamp,),
+        ).fetchall()
+
+    def _select_snoozed_rule_urls(self, channel: str, rule_urls: list[str], current_timestamp: float) -> list[str]:
+        snoozed_rule_urls: list[str] = []
+        for start in range(0, len(rule_urls), self.max_query_params):
+            rule_urls_batch = rule_urls[start : start + self.max_query_params]
+            placeholders = ', '.join('?' * len(rule_urls_batch))
+            rows = self._connection.execute(
+                f'SELECT rule_url FROM snoozed_alerts '  # noqa: S608
+                f'WHERE channel = ? AND snoozed_until > ? AND rule_url IN ({placeholders})',
+                (channel, current_timestamp, *rule_urls_batch),
+            )
+            snoozed_rule_urls.extend(rule_url for (rule_url,) in rows)
+        return snoozed_rule_urls
 
 
 class RedisAlertFilter(BaseAlertFilter):
-    def __init__(self, redis: Redis) -> None:
+    """
+    Keeps a snooze as a `channel;rule_url` key expiring with the snooze and indexes
+    the snoozes of a channel in a sorted set scored by `snoozed_until`, so listing
+    them doesn't scan the whole keyspace.
+
+    With a `near_cache`, `is_snoozed` results are cached in-process and every
+    change of a snooze is published to invalidate them on all replicas.
+
+    With `hash_tags`, the channel of redis keys is a hash tag (`{channel};rule_url`),
+    so all keys of a channel are in one slot of a redis cluster and can be
+    changed in one transaction. Keys outside of redis, e.g. returned by `get_all`,
+    stay untagged.
+
+    Pattern snoozes (see `SnoozePatternIndex`) are also kept in a sorted set of
+    the channel. Their compiled index is cached in-process and reloaded when
+    a version counter, read along with every check, changes.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | RedisCluster,
+        index_prefix: str = 'snoozed',
+        near_cache: SnoozeNearCache | None = None,
+        hash_tags: bool = False,
+    ) -> None:
         self.redis = redis
+        self.index_prefix = index_prefix
+        self.near_cache = near_cache
+        self.hash_tags = hash_tags
+        # channel -> (the version of pattern snoozes, their index)
+        self._pattern_indexes: dict[str, tuple[bytes, SnoozePatternIndex]] = {}
 
     async def snooze(self, channel: str, title: str, rule_url: str, snoozed_by: str, minutes: int) -> None:
         key = self.create_key(channel, rule_url)
@@ -89,19 +437,188 @@ class RedisAlertFilter(BaseAlertFilter):
                 snoozed_until=(datetime.now() + timedelta(minutes=minutes)).timestamp(),
                 channel=channel,
             )
-            await self.redis.set(key, metadata.model_dump_json(), ex=int(timedelta(minutes=minutes).total_seconds()))
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.set(
+                    self._create_redis_key(channel, rule_url),
+                    encode_alert_metadata(metadata),
+                    ex=int(timedelta(minutes=minutes).total_seconds()),
+                )
+                pipe.zadd(self._create_index_key(channel), {key: metadata.snoozed_until})
+                if is_pattern(rule_url):
+                    patterns_key = self._create_index_key(channel, 'patterns')
+                    pipe.zremrangebyscore(patterns_key, '-inf', datetime.now().timestamp())
+                    pipe.zadd(patterns_key, {rule_url: metadata.snoozed_until})
+                    pipe.incr(self._create_index_key(channel, 'patterns-version'))
+                await pipe.execute()
+            await self._invalidate(key)
 
     async def wake_up(self, key: str) -> None:
-        await self.redis.delete(key)
+        channel, rule_url = key.split(';', 1)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._create_redis_key(channel, rule_url))
+            pipe.zrem(self._create_index_key(channel), key)
+            if is_pattern(rule_url):
+                pipe.zrem(self._create_index_key(channel, 'patterns'), rule_url)
+                pipe.incr(self._create_index_key(channel, 'patterns-version'))
+            await pipe.execute()
+        await self._invalidate(key)
 
     async def is_snoozed(self, channel: str, rule_url: str) -> bool:
         key = self.create_key(channel, rule_url)
-        return bool(await self.redis.exists(key))
+        if self.near_cache is not None and (snoozed := self.near_cache.get(key)) is not None:
+            return snoozed
+
+        generation = self.near_cache.generation if self.near_cache is not None else 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.pttl(self._create_redis_key(channel, rule_url))
+            pipe.get(self._create_index_key(channel, 'patterns-version'))
+            pttl, patterns_version = await pipe.execute()
+        pattern_index = await self._get_pattern_index(channel, patterns_version)
+        snoozed_for = self._get_snoozed_for(rule_url, pttl, pattern_index)
+        if self.near_cache is not None:
+            self.near_cache.put(key, snoozed_for, generation)
+        return snoozed_for is not None
+
+    async def is_snoozed_many(self, channel: str, rule_urls: Iterable[str]) -> dict[str, bool]:
+        keys = {rule_url: self.create_key(channel, rule_url) for rule_url in set(rule_urls)}
+        result = {}
+        if self.near_cache is not None:
+            for rule_url, key in keys.items():
+                if (snoozed := self.near_cache.get(key)) is not None:
+                    result[rule_url] = snoozed
+        missed_rule_urls = [rule_url for rule_url in keys if rule_url not in result]
+        if not missed_rule_urls:
+            return result
+
+        generation = self.near_cache.generation if self.near_cache is not None else 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for rule_url in missed_rule_urls:
+                pipe.pttl(self._create_redis_key(channel, rule_url))
+            pipe.get(self._create_index_key(channel, 'patterns-version'))
+            *results, patterns_version = await pipe.execute()
+        pattern_index = await self._get_pattern_index(channel, patterns_version)
+        for rule_url, pttl in zip(missed_rule_urls, results, strict=True):
+            snoozed_for = self._get_snoozed_for(rule_url, pttl, pattern_index)
+            if self.near_cache is not None:
+                self.near_cache.put(keys[rule_url], snoozed_for, generation)
+            result[rule_url] = snoozed_for is not None
+        return result
 
     async def get_all(self, channel: str) -> dict[str, AlertMetadata]:
-        keys = [i.decode() for i in await self.redis.keys(f'{channel};*')]
-        return {
-            key: AlertMetadata.model_validate_json(raw_metadata)
-            for key, raw_metadata in zip(keys, await self.redis.mget(keys), strict=True)
+        index_key = self._create_index_key(channel)
+        now = datetime.now().timestamp()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # expired snoozes are removed from the index lazily, their keys are already expired by redis
+            pipe.zremrangebyscore(index_key, '-inf', now)
+            pipe.zrangebyscore(index_key, f'({now}', '+inf')
+            _, keys = await pipe.execute()
+        if not keys:
+            return {}
+
+        rule_urls = [key.decode().split(';', 1)[1] for key in keys]
+        raw_values = await self.redis.mget([self._create_redis_key(channel, rule_url) for rule_url in rule_urls])
+        # keys expired after the index was read have no values
+        found = [
+            (rule_url, raw_metadata)
+            for rule_url, raw_metadata in zip(rule_urls, raw_values, strict=True)
             if raw_metadata
+        ]
+        snoozes = decode_alert_metadata_batch([raw for _, raw in found], channel, [rule_url for rule_url, _ in found])
+        return {
+            self.create_key(channel, rule_url): metadata for (rule_url, _), metadata in zip(found, snoozes, strict=True)
         }
+
+    async def migrate_index(self, batch_size: int = 1000) -> int:
+        """
+        Adds snoozes created before the index was introduced to the index. Returns the number of indexed snoozes.
+        """
+        indexed = 0
+        batch: list[bytes] = []
+        async for key in self.redis.scan_iter(match='*;*', count=batch_size):
+            # other keys of the app are `<prefix>:<key>` and may contain `;` too, e.g. `thread:<channel>;<rule_url>`
+            # of the message index, but a channel name or id never contains `:`
+            if b':' in key.partition(b';')[0]:
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                indexed += await self._index_keys(batch)
+                batch = []
+        if batch:
+            indexed += await self._index_keys(batch)
+        return indexed
+
+    async def _index_keys(self, redis_keys: list[bytes]) -> int:
+        # keys of a batch may be in different slots of a redis cluster, so they are read by a pipeline instead of MGET
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for redis_key in redis_keys:
+                pipe.get(redis_key)
+            raw_values = await pipe.execute()
+
+        indexed = 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for redis_key, raw_metadata in zip(redis_keys, raw_values, strict=True):
+                if not raw_metadata:
+                    continue
+                channel, rule_url = redis_key.decode().split(';', 1)
+                try:
+                    # braces of a hash tag are not a part of the channel name
+                    metadata = decode_alert_metadata(raw_metadata, channel.strip('{}'), rule_url)
+                except (ValidationError, msgspec.DecodeError):
+                    logger.warning('Invalid snooze is skipped', redis_key=redis_key.decode())
+                    continue
+                key = self.create_key(metadata.channel, metadata.rule_url)
+                pipe.zadd(self._create_index_key(metadata.channel), {key: metadata.snoozed_until})
+                indexed += 1
+            await pipe.execute()
+        return indexed
+
+    async def _get_pattern_index(self, channel: str, version: bytes | None) -> SnoozePatternIndex | None:
+        if version is None:
+            # no pattern snoozes were ever created in the channel
+            return None
+        if (cached := self._pattern_indexes.get(channel)) is not None and cached[0] == version:
+            return cached[1]
+
+        # if the patterns change after the version is read, they are reloaded once more on the next check
+        patterns = await self.redis.zrangebyscore(
+            self._create_index_key(channel, 'patterns'), f'({datetime.now().timestamp()}', '+inf', withscores=True
+        )
+        pattern_index = SnoozePatternIndex()
+        for pattern, snoozed_until in patterns:
+            pattern_index.add(pattern.decode(), snoozed_until)
+        self._pattern_indexes[channel] = (version, pattern_index)
+        return pattern_index
+
+    def _get_snoozed_for(self, rule_url: str, pttl: int, pattern_index: SnoozePatternIndex | None) -> float | None:
+        """
+        Returns the number of seconds until the alert is woken up or None if the alert is not snoozed.
+        """
+        if (snoozed_for := self._parse_pttl(pttl)) is not None or pattern_index is None:
+            return snoozed_for
+        current_timestamp = datetime.now().timestamp()
+        if (snoozed_until := pattern_index.match(rule_url, current_timestamp)) is None:
+            return None
+        return snoozed_until - current_timestamp
+
+    async def _invalidate(self, key: str) -> None:
+        # published by the client of the near cache after the change, a cluster pipeline has no pub/sub commands
+        if self.near_cache is not None:
+            await self.near_cache.publish_invalidation(key)
+
+    @staticmethod
+    def _parse_pttl(pttl: int) -> float | None:
+        """
+        Returns the number of seconds until the snooze ends or None if the alert is not snoozed.
+        """
+        if pttl == -2:
+            return None
+        # a key without expiration is never created by `snooze`, but it is still a snooze
+        return float('inf') if pttl == -1 else pttl / 1000
+
+    def _create_redis_key(self, channel: str, rule_url: str) -> str:
+        return f'{{{channel}}};{rule_url}' if self.hash_tags else self.create_key(channel, rule_url)
+
+    def _create_index_key(self, channel: str, kind: str = '') -> str:
+        # index keys have no `;`, so the migration never takes them for snoozes
+        prefix = f'{self.index_prefix}-{kind}' if kind else self.index_prefix
+        return f'{prefix}:{{{channel}}}' if self.hash_tags else f'{prefix}:{channel}'
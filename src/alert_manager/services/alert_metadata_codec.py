@@ -0,0 +1,100 @@
+import typing as t
+import zlib
+from collections.abc import Sequence
+
+import msgspec
+from pydantic import TypeAdapter
+
+from alert_manager.entities.alert_metadata import AlertMetadata
+from alert_manager.libs.gc_utils import paused_gc
+
+# the first byte of a value, legacy values are JSON objects and start with `{`
+VERSION_MSGPACK: t.Final = b'\x01'
+VERSION_MSGPACK_ZLIB: t.Final = b'\x02'
+# shorter values don't get smaller after compression
+COMPRESSION_THRESHOLD: t.Final = 128
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder(tuple[str, str, int | float])
+_batch_decoder = msgspec.msgpack.Decoder(list[tuple[str, str, int | float]])
+_batch_adapter = TypeAdapter(list[AlertMetadata])
+# msgpack array 32 header, the values of a batch are joined into one array after it
+_ARRAY_HEADER: t.Final = b'\xdd'
+
+
+def encode_alert_metadata(metadata: AlertMetadata) -> bytes:
+    """
+    Encodes the metadata of a snooze to be stored under its `channel;rule_url` key.
+
+    The channel and the rule url are taken from the key on decoding, so they are not
+    repeated in the value. The rest is a msgpack array, compressed if it is long.
+    """
+    data = _encoder.encode((metadata.title, metadata.snoozed_by, metadata.snoozed_until))
+    if len(data) > COMPRESSION_THRESHOLD and len(compressed := zlib.compress(data)) < len(data):
+        return VERSION_MSGPACK_ZLIB + compressed
+    return VERSION_MSGPACK + data
+
+
+def decode_alert_metadata(raw: bytes, channel: str, rule_url: str) -> AlertMetadata:
+    """
+    Decodes a value written by `encode_alert_metadata` or a legacy JSON value.
+    """
+    version, data = raw[:1], raw[1:]
+    if version == VERSION_MSGPACK:
+        title, snoozed_by, snoozed_until = _decoder.decode(data)
+    elif version == VERSION_MSGPACK_ZLIB:
+        title, snoozed_by, snoozed_until = _decoder.decode(zlib.decompress(data))
+    else:
+        return AlertMetadata.model_validate_json(raw)
+
+    # validation of the few fields is cheaper than `model_construct`, which is implemented in python
+    return AlertMetadata(
+        title=title, rule_url=rule_url, snoozed_by=snoozed_by, snoozed_until=snoozed_until, channel=channel
+    )
+
+
+def decode_alert_metadata_batch(
+    raw_values: Sequence[bytes], channel: str, rule_urls: Sequence[str]
+) -> list[AlertMetadata]:
+    """
+    Decodes values of snoozes of the channel, the same way as `decode_alert_metadata` but faster.
+
+    The msgpack arrays of all values are joined into one array and decoded by one call,
+    and the models are validated by one call too. Legacy JSON values are decoded one by one.
+    """
+    with paused_gc():
+        return _decode_batch(raw_values, channel, rule_urls)
+
+
+def _decode_batch(raw_values: Sequence[bytes], channel: str, rule_urls: Sequence[str]) -> list[AlertMetadata]:
+    result: list[AlertMetadata | None] = [None] * len(raw_values)
+    indexes: list[int] = []
+    parts: list[bytes] = []
+    for i, (raw, rule_url) in enumerate(zip(raw_values, rule_urls, strict=True)):
+        version = raw[:1]
+        if version == VERSION_MSGPACK:
+            parts.append(raw[1:])
+        elif version == VERSION_MSGPACK_ZLIB:
+            parts.append(zlib.decompress(raw[1:]))
+        else:
+            result[i] = decode_alert_metadata(raw, channel, rule_url)
+            continue
+        indexes.append(i)
+
+    if indexes:
+        fields = _batch_decoder.decode(b''.join((_ARRAY_HEADER, len(parts).to_bytes(4, 'big'), *parts)))
+        decoded = _batch_adapter.validate_python(
+            [
+                {
+                    'title': title,
+                    'rule_url': rule_urls[i],
+                    'snoozed_by': snoozed_by,
+                    'snoozed_until': snoozed_until,
+                    'channel': channel,
+                }
+                for i, (title, snoozed_by, snoozed_until) in zip(indexes, fields, strict=True)
+            ]
+        )
+        for i, metadata in zip(indexes, decoded, strict=True):
+            result[i] = metadata
+    return t.cast(list[AlertMetadata], result)
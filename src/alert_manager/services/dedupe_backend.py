@@ -0,0 +1,70 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+
+class BaseDedupeCache(ABC):
+    """
+    Remembers recently received alerts, so retried and duplicated webhooks are not sent to Slack twice.
+    """
+
+    @abstractmethod
+    async def add(self, key: str) -> bool:
+        """
+        Remembers the key. Returns False if the key was already seen within the ttl.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def discard(self, key: str) -> None:
+        """
+        Forgets the key, e.g. when the alert was not delivered and its retry must not be skipped.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+
+class InMemoryDedupeCache(BaseDedupeCache):
+    """
+    LRU cache with expiring keys. When the cache is full, the least recently added key is evicted.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._keys: OrderedDict[str, float] = OrderedDict()
+
+    async def add(self, key: str) -> bool:
+        now = time.monotonic()
+        if (expires_at := self._keys.get(key)) is not None and expires_at > now:
+            return False
+
+        self._keys.pop(key, None)
+        self._keys[key] = now + self.ttl
+        while len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return True
+
+    async def discard(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+
+class RedisDedupeCache(BaseDedupeCache):
+    """
+    Cache stored in redis and shared by all replicas. A key is added atomically with SET NX.
+    """
+
+    def __init__(self, redis: Redis, ttl: int, prefix: str = 'dedupe') -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def add(self, key: str) -> bool:
+        return bool(await self.redis.set(self._create_redis_key(key), 1, nx=True, ex=self.ttl))
+
+    async def discard(self, key: str) -> None:
+        await self.redis.delete(self._create_redis_key(key))
+
+    def _create_redis_key(self, key: str) -> str:
+        return f'{self.prefix}:{key}'
@@ -0,0 +1,86 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from alert_manager.entities.slack_message_ref import SlackMessageRef
+
+
+class BaseMessageIndex(ABC):
+    """
+    Maps an alert key (see BaseAlertFilter.create_key) to the Slack message posted for it.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> SlackMessageRef | None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def set(self, key: str, ref: SlackMessageRef) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def pop(self, key: str) -> SlackMessageRef | None:
+        raise NotImplementedError  # pragma: no cover
+
+
+class InMemoryMessageIndex(BaseMessageIndex):
+    """
+    LRU index with expiring entries. When the index is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._refs: OrderedDict[str, tuple[SlackMessageRef, float]] = OrderedDict()
+
+    async def get(self, key: str) -> SlackMessageRef | None:
+        if (item := self._refs.get(key)) is None:
+            return None
+
+        ref, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._refs[key]
+            return None
+
+        self._refs.move_to_end(key)
+        return ref
+
+    async def set(self, key: str, ref: SlackMessageRef) -> None:
+        self._refs.pop(key, None)
+        self._refs[key] = (ref, time.monotonic() + self.ttl)
+        while len(self._refs) > self.max_size:
+            self._refs.popitem(last=False)
+
+    async def pop(self, key: str) -> SlackMessageRef | None:
+        if (item := self._refs.pop(key, None)) is None:
+            return None
+
+        ref, expires_at = item
+        return ref if expires_at > time.monotonic() else None
+
+
+class RedisMessageIndex(BaseMessageIndex):
+    """
+    Index stored in redis. Entries are evicted by redis when their ttl expires.
+    """
+
+    def __init__(self, redis: Redis, ttl: int, prefix: str) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> SlackMessageRef | None:
+        raw_ref = await self.redis.get(self._create_redis_key(key))
+        return SlackMessageRef.model_validate_json(raw_ref) if raw_ref else None
+
+    async def set(self, key: str, ref: SlackMessageRef) -> None:
+        await self.redis.set(self._create_redis_key(key), ref.model_dump_json(), ex=self.ttl)
+
+    async def pop(self, key: str) -> SlackMessageRef | None:
+        raw_ref = await self.redis.getdel(self._create_redis_key(key))
+        return SlackMessageRef.model_validate_json(raw_ref) if raw_ref else None
+
+    def _create_redis_key(self, key: str) -> str:
+        return f'{self.prefix}:{key}'
@@ -0,0 +1,235 @@
+import asyncio
+import os
+import socket
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import msgspec
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from structlog import getLogger
+
+from alert_manager.entities.alert_message import AlertMessage
+
+logger = getLogger(__name__)
+
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder(AlertMessage)
+
+
+class BaseOutbox(ABC):
+    """
+    Durable storage of alert messages which could not be delivered to Slack.
+
+    An entry read from the outbox stays there until it is acknowledged, so a
+    message is redelivered if the application stops before acknowledging it.
+    """
+
+    @abstractmethod
+    async def append(self, message: AlertMessage) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def read(self, count: int, timeout: float) -> list[tuple[str, AlertMessage]]:
+        """
+        Returns up to `count` of the oldest unacknowledged entries, waits up to `timeout` seconds for new ones.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def ack(self, entry_id: str) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    async def close(self) -> None:
+        pass
+
+
+class FileOutbox(BaseOutbox):
+    """
+    Outbox kept in memory and persisted to an append-only journal file.
+
+    The journal has a line per appended (`+<id> <message>`) and per acknowledged
+    (`-<id>`) entry. It is rewritten with the remaining entries only, when it
+    contains more acknowledged entries than `max_len`. When the outbox is full,
+    the oldest entry is dropped.
+    """
+
+    def __init__(self, path: str, max_len: int) -> None:
+        self.path = path
+        self.max_len = max_len
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._next_id = 0
+        self._removed = 0
+        self._write_lock = asyncio.Lock()
+        self._appended = asyncio.Event()
+        self._load()
+        self._file = open(self.path, 'ab')
+
+    async def append(self, message: AlertMessage) -> None:
+        entry_id = str(self._next_id)
+        self._next_id += 1
+        data = _encoder.encode(message)
+        self._entries[entry_id] = data
+        records = [b'+%b %b\n' % (entry_id.encode(), data)]
+        while len(self._entries) > self.max_len:
+            dropped_id, _ = self._entries.popitem(last=False)
+            records.append(b'-%b\n' % dropped_id.encode())
+            logger.warning('Slack outbox is full, the oldest message dropped')
+        self._appended.set()
+        await self._write(records, removed=len(records) - 1)
+
+    async def read(self, count: int, timeout: float) -> list[tuple[str, AlertMessage]]:
+        if not self._entries:
+            self._appended.clear()
+            try:
+                await asyncio.wait_for(self._appended.wait(), timeout)
+            except TimeoutError:
+                return []
+
+        entries: list[tuple[str, AlertMessage]] = []
+        for entry_id, data in self._entries.items():
+            if len(entries) >= count:
+                break
+            entries.append((entry_id, _decoder.decode(data)))
+        return entries
+
+    async def ack(self, entry_id: str) -> None:
+        if self._entries.pop(entry_id, None) is not None:
+            await self._write([b'-%b\n' % entry_id.encode()], removed=1)
+
+    async def close(self) -> None:
+        async with self._write_lock:
+            self._file.close()
+
+    async def _write(self, records: list[bytes], removed: int) -> None:
+        async with self._write_lock:
+            self._removed += removed
+            if self._removed > self.max_len:
+                await asyncio.to_thread(self._compact, list(self._entries.items()))
+            else:
+                await asyncio.to_thread(self._write_records, records)
+
+    def _write_records(self, records: list[bytes]) -> None:
+        self._file.writelines(records)
+        self._file.flush()
+
+    def _compact(self, entries: list[tuple[str, bytes]]) -> None:
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.writelines(b'+%b %b\n' % (entry_id.encode(), data) for entry_id, data in entries)
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'ab')
+        self._removed = 0
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return
+
+        *lines, tail = content.split(b'\n')
+        if tail:
+            # the last line is incomplete if the application was killed during a write
+            with open(self.path, 'r+b') as file:
+                file.truncate(len(content) - len(tail))
+
+        for line in lines:
+            if line.startswith(b'+'):
+                entry_id, data = line[1:].split(b' ', 1)
+                self._entries[entry_id.decode()] = data
+                self._next_id = max(self._next_id, int(entry_id) + 1)
+            elif line.startswith(b'-'):
+                self._entries.pop(line[1:].decode(), None)
+                self._removed += 1
+
+        while len(self._entries) > self.max_len:
+            self._entries.popitem(last=False)
+
+
+class RedisOutbox(BaseOutbox):
+    """
+    Outbox stored in a redis stream and read by a consumer group.
+
+    The stream is capped at about `max_len` entries, acknowledged entries are
+    deleted from it. Entries read by a consumer that died without acknowledging
+    them are claimed by another consumer after `claim_idle_time` seconds.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        max_len: int,
+        stream: str = 'slack-outbox',
+        group: str = 'alert-manager',
+        consumer: str | None = None,
+        claim_idle_time: float = 60,
+    ) -> None:
+        self.redis = redis
+        self.max_len = max_len
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or f'{socket.gethostname()}-{os.getpid()}'
+        self.claim_idle_time = claim_idle_time
+        self._group_created = False
+
+    async def append(self, message: AlertMessage) -> None:
+        await self.redis.xadd(self.stream, {'message': _encoder.encode(message)}, maxlen=self.max_len)
+
+    async def read(self, count: int, timeout: float) -> list[tuple[str, AlertMessage]]:
+        await self._create_group()
+
+        # own entries which were read, but not acknowledged yet, go first
+        entries = await self._read_pending(count)
+        if not entries:
+            _, entries, *_ = await self.redis.xautoclaim(
+                self.stream, self.group, self.consumer, int(self.claim_idle_time * 1000), count=count
+            )
+        if not entries:
+            response = await self.redis.xreadgroup(
+                self.group, self.consumer, {self.stream: '>'}, count=count, block=int(timeout * 1000)
+            )
+            entries = response[0][1] if response else []
+
+        messages: list[tuple[str, AlertMessage]] = []
+        for raw_entry_id, fields in entries:
+            entry_id = raw_entry_id.decode() if isinstance(raw_entry_id, bytes) else raw_entry_id
+            if not fields:
+                # the entry was trimmed from the stream before it was delivered
+                await self.ack(entry_id)
+                continue
+            messages.append((entry_id, _decoder.decode(fields[b'message'])))
+        return messages
+
+    async def _read_pending(self, count: int) -> list[tuple[bytes, dict[bytes, bytes]]]:
+        pending = await self.redis.xpending_range(self.stream, self.group, '-', '+', count, consumername=self.consumer)
+        if not pending:
+            return []
+        pending_ids = [entry['message_id'] for entry in pending]
+        entries: list[tuple[bytes, dict[bytes, bytes]]] = await self.redis.xclaim(
+            self.stream, self.group, self.consumer, 0, pending_ids
+        )
+        if len(entries) < len(pending_ids):
+            # entries trimmed from the stream are not claimed, but may stay pending
+            claimed_ids = {entry_id for entry_id, _ in entries}
+            for entry_id in pending_ids:
+                if entry_id not in claimed_ids:
+                    await self.ack(entry_id.decode())
+        return entries
+
+    async def ack(self, entry_id: str) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
+
+    async def _create_group(self) -> None:
+        if self._group_created:
+            return
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id='0', mkstream=True)
+        except ResponseError as err:
+            if 'BUSYGROUP' not in str(err):
+                raise
+        self._group_created = True
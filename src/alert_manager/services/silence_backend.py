@@ -0,0 +1,132 @@
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.asyncio.cluster import RedisCluster
+from structlog import getLogger
+
+from alert_manager.entities.silence import Silence
+from alert_manager.services.silences import SilenceIndex
+
+logger = getLogger(__name__)
+
+
+class BaseSilenceBackend(ABC):
+    """
+    Keeps label silences of channels, see `SilenceIndex`.
+    """
+
+    @abstractmethod
+    async def add(self, silence: Silence) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def expire(self, channel: str, silence_id: str) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def get_index(self, channel: str) -> SilenceIndex | None:
+        """
+        Returns silences of the channel or None if the channel has no silences.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+
+class InMemorySilenceBackend(BaseSilenceBackend):
+    def __init__(self) -> None:
+        self._indexes: dict[str, SilenceIndex] = {}
+
+    async def add(self, silence: Silence) -> None:
+        self._indexes.setdefault(silence.channel, SilenceIndex()).add(silence)
+
+    async def expire(self, channel: str, silence_id: str) -> None:
+        if (index := self._indexes.get(channel)) is None:
+            return
+        index.remove(silence_id)
+        if not index:
+            del self._indexes[channel]
+
+    async def get_index(self, channel: str) -> SilenceIndex | None:
+        return self._indexes.get(channel)
+
+
+class RedisSilenceBackend(BaseSilenceBackend):
+    """
+    Keeps silences of a channel in a hash of silence id -> silence and a version
+    of the hash, which is bumped on every change.
+
+    Every replica builds an index of the silences of a channel and checks the version
+    at most every `refresh_interval` seconds, so checking an alert doesn't need
+    a round-trip to redis. The index is reloaded only when the version changes,
+    silences added or expired by another replica are applied after `refresh_interval` seconds.
+    """
+
+    def __init__(self, redis: Redis | RedisCluster, prefix: str = 'silences', refresh_interval: float = 1) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self.refresh_interval = refresh_interval
+        # channel -> (when the version was checked, the version of the silences, their index)
+        self._indexes: dict[str, tuple[float, bytes | None, SilenceIndex]] = {}
+
+    async def add(self, silence: Silence) -> None:
+        # hash commands are run by a pipeline, the same way for a redis client and a redis cluster client
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(self._create_redis_key(silence.channel), silence.id, silence.model_dump_json())
+            await pipe.execute()
+        await self._bump_version(silence.channel)
+
+    async def expire(self, channel: str, silence_id: str) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hdel(self._create_redis_key(channel), silence_id)
+            await pipe.execute()
+        await self._bump_version(channel)
+
+    async def get_index(self, channel: str) -> SilenceIndex | None:
+        if (cached := self._indexes.get(channel)) is None or cached[0] + self.refresh_interval <= time.monotonic():
+            version = await self.redis.get(self._create_version_key(channel))
+            if cached is None or cached[1] != version:
+                # if the silences change after the version is read, they are reloaded once more on the next check
+                index = SilenceIndex() if version is None else await self._load_index(channel)
+            else:
+                index = cached[2]
+            cached = (time.monotonic(), version, index)
+            self._indexes[channel] = cached
+        return cached[2] or None
+
+    async def _bump_version(self, channel: str) -> None:
+        # the hash and the version may be in different slots of a redis cluster, so the version is bumped
+        # after the hash is changed, otherwise another replica could cache the old silences with the new version
+        await self.redis.incr(self._create_version_key(channel))
+        self._indexes.pop(channel, None)
+
+    async def _load_index(self, channel: str) -> SilenceIndex:
+        redis_key = self._create_redis_key(channel)
+        current_timestamp = datetime.now().timestamp()
+        index = SilenceIndex()
+        expired_ids = []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(redis_key)
+            (raw_silences,) = await pipe.execute()
+        for silence_id, raw_silence in raw_silences.items():
+            try:
+                silence = Silence.model_validate_json(raw_silence)
+            except ValidationError:
+                logger.warning('Invalid silence is skipped', channel=channel, silence_id=silence_id.decode())
+                continue
+            if silence.ends_at <= current_timestamp:
+                expired_ids.append(silence_id)
+            else:
+                index.add(silence)
+        if expired_ids:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hdel(redis_key, *expired_ids)
+                await pipe.execute()
+        return index
+
+    def _create_redis_key(self, channel: str) -> str:
+        return f'{self.prefix}:{channel}'
+
+    def _create_version_key(self, channel: str) -> str:
+        return f'{self.prefix}-version:{channel}'
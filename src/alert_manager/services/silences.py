@@ -0,0 +1,171 @@
+import re
+import typing as t
+
+from alert_manager.entities.silence import LabelMatcher, Silence
+from alert_manager.enums.silence import MatchOperator
+
+# a value is quoted or a sequence of characters without spaces and commas
+_MATCHER_RE = re.compile(
+    r'\s*(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)\s*(?P<operator>=~|!~|!=|=)\s*'
+    r'(?:"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<value>[^\s,"]*))\s*(?:,|$)'
+)
+# slack clients may replace quotes with typographic ones
+_QUOTES = str.maketrans({'\u201c': '"', '\u201d': '"'})
+
+
+def parse_matchers(text: str) -> list[LabelMatcher]:
+    """
+    Parses Alertmanager-style matchers, e.g. `{instance=~"db-.*", job="api"}`.
+
+    Raises ValueError if the text is not a list of matchers, a regular expression is invalid
+    or all matchers match an empty value (such a silence would silence every alert).
+    """
+    text = text.translate(_QUOTES).strip()
+    if text.startswith('{') and text.endswith('}'):
+        text = text[1:-1]
+
+    matchers = []
+    position = 0
+    while position < len(text):
+        if (match := _MATCHER_RE.match(text, position)) is None or match.end() == position:
+            raise ValueError(f'Invalid matcher: {text[position:]}')
+        value = match['value'] if match['quoted'] is None else re.sub(r'\\(.)', r'\1', match['quoted'])
+        matchers.append(LabelMatcher(name=match['name'], operator=MatchOperator(match['operator']), value=value))
+        position = match.end()
+
+    if not matchers:
+        raise ValueError('At least one matcher is required')
+    try:
+        compiled_matchers = [_Matcher.compile(matcher) for matcher in matchers]
+    except re.error as err:
+        raise ValueError(f'Invalid regular expression: {err}') from err
+    if all(matcher.matches('') for matcher in compiled_matchers):
+        raise ValueError('At least one matcher must not match an empty value')
+    return matchers
+
+
+def get_series_labels(rule_name: str, tags: dict[str, str] | None) -> dict[str, str]:
+    """
+    Returns labels of an eval match, `alertname` is the rule name unless the tags have it.
+    """
+    return {'alertname': rule_name, **tags} if tags else {'alertname': rule_name}
+
+
+class _Matcher(t.NamedTuple):
+    name: str
+    operator: MatchOperator
+    value: str
+    regex: re.Pattern[str] | None
+
+    @classmethod
+    def compile(cls, matcher: LabelMatcher) -> t.Self:
+        regex = (
+            # regular expressions are anchored like in Alertmanager
+            re.compile(matcher.value, re.DOTALL)
+            if matcher.operator in (MatchOperator.regex, MatchOperator.not_regex)
+            else None
+        )
+        return cls(matcher.name, matcher.operator, matcher.value, regex)
+
+    def matches(self, value: str) -> bool:
+        if self.operator is MatchOperator.equal:
+            return value == self.value
+        if self.operator is MatchOperator.not_equal:
+            return value != self.value
+        matched = self.regex.fullmatch(value) is not None  # type: ignore[union-attr]
+        return matched if self.operator is MatchOperator.regex else not matched
+
+
+class SilenceIndex:
+    """
+    Active silences of one channel.
+
+    A silence is indexed by one of its matchers which requires a label to be present:
+    by the label name and value of an equality matcher or, if there is no such matcher,
+    by the label name of a matcher which doesn't match an empty value (a missing label
+    is an empty value). The matcher with the least silences in its bucket is chosen.
+    A lookup collects silences from the buckets of the alert labels and checks only
+    them, so it doesn't depend on the total number of silences.
+    """
+
+    def __init__(self) -> None:
+        self._silences: dict[str, Silence] = {}
+        self._matchers: dict[str, list[_Matcher]] = {}
+        self._anchors: dict[str, tuple[str, str] | str | None] = {}
+        self._by_label: dict[tuple[str, str], set[str]] = {}
+        self._by_name: dict[str, set[str]] = {}
+        # silences without a required label, e.g. `job!="api"`, they are checked for every alert
+        self._unanchored: set[str] = set()
+        self._next_expiration = float('inf')
+
+    def __len__(self) -> int:
+        return len(self._silences)
+
+    def add(self, silence: Silence) -> None:
+        self.remove(silence.id)
+        matchers = [_Matcher.compile(matcher) for matcher in silence.matchers]
+        self._silences[silence.id] = silence
+        self._matchers[silence.id] = matchers
+        self._next_expiration = min(self._next_expiration, silence.ends_at)
+
+        label_anchors = [
+            (matcher.name, matcher.value)
+            for matcher in matchers
+            if matcher.operator is MatchOperator.equal and matcher.value
+        ]
+        name_anchors = [matcher.name for matcher in matchers if not matcher.matches('')]
+        anchor: tuple[str, str] | str | None
+        if label_anchors:
+            anchor = min(label_anchors, key=lambda label: len(self._by_label.get(label, ())))
+            self._by_label.setdefault(anchor, set()).add(silence.id)
+        elif name_anchors:
+            anchor = min(name_anchors, key=lambda name: len(self._by_name.get(name, ())))
+            self._by_name.setdefault(anchor, set()).add(silence.id)
+        else:
+            anchor = None
+            self._unanchored.add(silence.id)
+        self._anchors[silence.id] = anchor
+
+    def remove(self, silence_id: str) -> None:
+        if self._silences.pop(silence_id, None) is None:
+            return
+        del self._matchers[silence_id]
+        anchor = self._anchors.pop(silence_id)
+        if anchor is None:
+            self._unanchored.discard(silence_id)
+            return
+        buckets: dict[t.Any, set[str]] = self._by_label if isinstance(anchor, tuple) else self._by_name
+        buckets[anchor].discard(silence_id)
+        if not buckets[anchor]:
+            del buckets[anchor]
+
+    def get_all(self, current_timestamp: float) -> list[Silence]:
+        return [silence for silence in self._silences.values() if silence.ends_at > current_timestamp]
+
+    def match(self, labels: dict[str, str], current_timestamp: float) -> Silence | None:
+        """
+        Returns a silence matching the labels or None if the labels are not silenced.
+        """
+        if self._next_expiration <= current_timestamp:
+            self._remove_expired(current_timestamp)
+
+        candidates: list[str] = list(self._unanchored)
+        for name, value in labels.items():
+            if not value:
+                continue
+            if (silence_ids := self._by_label.get((name, value))) is not None:
+                candidates.extend(silence_ids)
+            if (silence_ids := self._by_name.get(name)) is not None:
+                candidates.extend(silence_ids)
+
+        for silence_id in candidates:
+            if all(matcher.matches(labels.get(matcher.name, '')) for matcher in self._matchers[silence_id]):
+                return self._silences[silence_id]
+        return None
+
+    def _remove_expired(self, current_timestamp: float) -> None:
+        for silence_id in [
+            silence_id for silence_id, silence in self._silences.items() if silence.ends_at <= current_timestamp
+        ]:
+            self.remove(silence_id)
+        self._next_expiration = min((silence.ends_at for silence in self._silences.values()), default=float('inf'))
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from weakref import WeakValueDictionary
+
+from alert_manager.enums.grafana import GrafanaAlertState
+
+
+@dataclass(slots=True)
+class CoalescedAlert:
+    channel: str
+    ts: str
+    state: GrafanaAlertState
+    expires_at: float
+    repeats: int = 1
+
+
+class AlertCoalescer:
+    """
+    Remembers Slack messages posted during the last `window` seconds, so
+    repeated alerts of the same rule can update them instead of posting new ones.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._alerts: OrderedDict[str, CoalescedAlert] = OrderedDict()
+        self._locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+
+    def lock(self, key: str) -> asyncio.Lock:
+        if (lock := self._locks.get(key)) is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def get(self, key: str, state: GrafanaAlertState) -> CoalescedAlert | None:
+        self._remove_expired()
+        alert = self._alerts.get(key)
+        if alert is None or alert.state is not state:
+            return None
+        return alert
+
+    def add(self, key: str, channel: str, ts: str, state: GrafanaAlertState) -> None:
+        self._alerts.pop(key, None)
+        self._alerts[key] = CoalescedAlert(
+            channel=channel,
+            ts=ts,
+            state=state,
+            expires_at=time.monotonic() + self.window,
+        )
+
+    def _remove_expired(self) -> None:
+        # the window is the same for every alert, so the oldest alerts always expire first
+        now = time.monotonic()
+        while self._alerts:
+            key, alert = next(iter(self._alerts.items()))
+            if alert.expires_at > now:
+                break
+            del self._alerts[key]
@@ -0,0 +1,111 @@
+import asyncio
+import zlib
+
+from structlog import getLogger
+
+from alert_manager.config import DeliveryOverflowPolicy
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.services.slack.exceptions import DeliveryQueueFullError
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.outbox import SlackOutbox, is_retryable_error
+
+logger = getLogger(__name__)
+
+
+class DeliveryQueue:
+    """
+    Bounded in-process queue which delivers alert messages to Slack in background.
+
+    Every channel is pinned to a single worker, so messages for the same channel
+    are delivered in the order they were accepted. `max_size` limits the number of
+    queued messages of all workers together, so a single busy channel can use the
+    whole queue. When an outbox is set, messages which failed because Slack is
+    unavailable, or were not delivered before shutdown, are moved to it.
+    """
+
+    def __init__(
+        self,
+        notifier: AlertNotifier,
+        max_size: int,
+        workers: int,
+        overflow_policy: DeliveryOverflowPolicy,
+        outbox: SlackOutbox | None = None,
+    ) -> None:
+        self.notifier = notifier
+        self.overflow_policy = overflow_policy
+        self.outbox = outbox
+        self._queues: list[asyncio.Queue[AlertMessage]] = [asyncio.Queue() for _ in range(workers)]
+        # a slot is taken by a queued message and released when a worker takes the message
+        self._slots = asyncio.Semaphore(max_size)
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def size(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def start(self) -> None:
+        self._workers = [asyncio.create_task(self._worker(queue)) for queue in self._queues]
+
+    async def stop(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in self._queues)), timeout)
+        except TimeoutError:
+            logger.warning('Slack delivery queue was not drained before shutdown', undelivered=self.size)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self.outbox is not None:
+            for queue in self._queues:
+                while not queue.empty():
+                    await self.outbox.append(self._get_nowait(queue))
+
+    async def put(self, message: AlertMessage) -> None:
+        queue = self._get_queue(message.channel)
+
+        if self._slots.locked() and self.overflow_policy is not DeliveryOverflowPolicy.block:
+            if self.overflow_policy is DeliveryOverflowPolicy.reject:
+                raise DeliveryQueueFullError('Slack delivery queue is full')
+
+            # the oldest message of the channel, or of the busiest worker if the channel has none queued
+            dropped = self._get_nowait(queue if not queue.empty() else max(self._queues, key=asyncio.Queue.qsize))
+            logger.warning('Slack delivery queue is full, the oldest message dropped', channel=dropped.channel)
+
+        await self._slots.acquire()
+        queue.put_nowait(message)
+
+    def _get_queue(self, channel: str) -> asyncio.Queue[AlertMessage]:
+        return self._queues[zlib.crc32(channel.encode()) % len(self._queues)]
+
+    def _get_nowait(self, queue: asyncio.Queue[AlertMessage]) -> AlertMessage:
+        message = queue.get_nowait()
+        queue.task_done()
+        self._slots.release()
+        return message
+
+    async def _worker(self, queue: asyncio.Queue[AlertMessage]) -> None:
+        while True:
+            message = await queue.get()
+            self._slots.release()
+            try:
+                await self.notifier.send(message)
+            except asyncio.CancelledError:
+                # shutdown didn't wait for the message, it may be delivered twice but is not lost
+                if self.outbox is not None:
+                    logger.warning(
+                        'Slack delivery is interrupted by shutdown, alert moved to outbox', channel=message.channel
+                    )
+                    await self.outbox.append(message)
+                else:
+                    logger.warning('Slack delivery is interrupted by shutdown, alert is lost', channel=message.channel)
+                raise
+            except Exception as err:
+                if self.outbox is not None and is_retryable_error(err):
+                    logger.warning('Slack is unavailable, alert moved to outbox', channel=message.channel)
+                    await self.outbox.append(message)
+                else:
+                    logger.exception('Failed to deliver alert to Slack', channel=message.channel)
+            finally:
+                queue.task_done()
@@ -0,0 +1,86 @@
+import asyncio
+
+from structlog import getLogger
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.services.slack.message import MessageBuilder
+from alert_manager.services.slack.sender import SlackSender
+
+logger = getLogger(__name__)
+
+
+class AlertDigest:
+    """
+    Buffers alerts of the configured channels and sends them as one message per window.
+
+    `windows` maps a webhook channel (channel name or id, the same value as in
+    the webhook url) to the digest window in seconds. If a digest is not sent,
+    its alerts are put back into the buffer and sent with the next window.
+    """
+
+    def __init__(self, slack_sender: SlackSender, windows: dict[str, int]) -> None:
+        self.slack_sender = slack_sender
+        self.windows = windows
+        # webhook channel -> alert key -> (the latest message, how many times it was received)
+        self._buffers: dict[str, dict[str, tuple[AlertMessage, int]]] = {}
+        self._flush_tasks: dict[str, asyncio.Task[None]] = {}
+
+    def accepts(self, message: AlertMessage) -> bool:
+        return message.webhook_channel in self.windows
+
+    def add(self, message: AlertMessage) -> None:
+        buffer = self._buffers.setdefault(message.webhook_channel, {})
+        _, repeats = buffer.pop(message.key, (None, 0))
+        buffer[message.key] = (message, repeats + 1)
+        self._schedule_flush(message.webhook_channel)
+
+    async def flush(self, webhook_channel: str) -> None:
+        buffer = self._buffers.pop(webhook_channel, None)
+        if not buffer:
+            return
+
+        alerts = list(buffer.values())
+        text, blocks = MessageBuilder.create_digest_message(alerts)
+        try:
+            await self.slack_sender.post_message(channel=alerts[0][0].channel, **self.slack_sender.encode(text, blocks))
+        except BaseException:
+            self._restore(webhook_channel, buffer)
+            raise
+
+    async def close(self) -> None:
+        for task in self._flush_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._flush_tasks.values(), return_exceptions=True)
+        self._flush_tasks = {}
+
+        for webhook_channel in list(self._buffers):
+            try:
+                await self.flush(webhook_channel)
+            except Exception:
+                logger.exception(
+                    'Failed to send alerts digest, alerts are lost',
+                    channel=webhook_channel,
+                    alert_keys=list(self._buffers.pop(webhook_channel, ())),
+                )
+
+    def _schedule_flush(self, webhook_channel: str) -> None:
+        if webhook_channel not in self._flush_tasks:
+            self._flush_tasks[webhook_channel] = asyncio.create_task(
+                self._flush_later(webhook_channel, self.windows[webhook_channel])
+            )
+
+    def _restore(self, webhook_channel: str, buffer: dict[str, tuple[AlertMessage, int]]) -> None:
+        # alerts received while the digest was being sent are newer than the restored ones
+        for key, (message, repeats) in self._buffers.pop(webhook_channel, {}).items():
+            _, restored_repeats = buffer.pop(key, (None, 0))
+            buffer[key] = (message, repeats + restored_repeats)
+        self._buffers[webhook_channel] = buffer
+
+    async def _flush_later(self, webhook_channel: str, window: int) -> None:
+        await asyncio.sleep(window)
+        self._flush_tasks.pop(webhook_channel, None)
+        try:
+            await self.flush(webhook_channel)
+        except Exception:
+            logger.exception('Failed to send alerts digest, alerts are sent with the next one', channel=webhook_channel)
+            self._schedule_flush(webhook_channel)
@@ -1,2 +1,6 @@
 class RuleUrlExtractError(Exception):
     pass
+
+
+class DeliveryQueueFullError(Exception):
+    pass
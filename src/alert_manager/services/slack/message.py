@@ -1,15 +1,50 @@
-import copy
 import typing as t
 from datetime import datetime
 from typing import Any
 
+from alert_manager.entities.alert_message import AlertMessage
 from alert_manager.entities.alert_metadata import AlertMetadata
+from alert_manager.entities.silence import Silence
 from alert_manager.enums.grafana import GrafanaAlertState
 from alert_manager.libs.itertools import divide_seq
 from alert_manager.libs.text import truncate as truncate_text
-from alert_manager.web.entities.grafana import EvalMatch
+from alert_manager.web.entities.grafana import EvalMatch, RuleEvalMatch
+from alert_manager.web.entities.grafana_fast import FastEvalMatch
 
 MsgBlocksType = list[dict[str, Any]]
+MAX_BLOCKS = 50
+MAX_SECTION_TEXT_LENGTH = 3000
+
+# Static blocks are built once and the same objects are put into every message,
+# so they must never be mutated. Code that changes a message copies only the blocks it changes.
+SNOOZE_TIME_SELECT_BLOCK: t.Final[dict[str, Any]] = {
+    'type': 'actions',
+    'elements': [
+        {
+            'type': 'static_select',
+            'action_id': 'snooze-for',
+            'placeholder': {
+                'type': 'plain_text',
+                'text': 'Snooze for :sleeping:',
+                'emoji': True,
+            },
+            'options': [
+                {'text': {'type': 'plain_text', 'text': text}, 'value': value}
+                for text, value in [
+                    ('wake', '0'),
+                    ('15 min', '15'),
+                    ('30 min', '30'),
+                    ('1 hour', '60'),
+                    ('2 hours', '120'),
+                    ('5 hours', '300'),
+                    ('8 hours', '480'),
+                    ('1 day', '1440'),
+                    ('2 day', '2880'),
+                ]
+            ],
+        }
+    ],
+}
 
 
 def get_rule_url(message_blocks: MsgBlocksType) -> str:
@@ -28,7 +63,15 @@ class MessageBuilder:
         GrafanaAlertState.alerting: ':red_circle:',
         GrafanaAlertState.no_data: ':white_circle:',
     }
+    state_names: t.ClassVar[dict[GrafanaAlertState, str]] = {
+        GrafanaAlertState.alerting: 'Alerting',
+        GrafanaAlertState.no_data: 'No Data',
+        GrafanaAlertState.pending: 'Pending',
+        GrafanaAlertState.paused: 'Paused',
+        GrafanaAlertState.ok: 'OK',
+    }
     alerts_not_found_text = "There aren't any snoozed alerts."
+    silences_not_found_text = "There aren't any silences."
 
     @classmethod
     def create_alert_message(
@@ -37,7 +80,8 @@ class MessageBuilder:
         title: str,
         rule_url: str,
         message: str | None,
-        eval_matches: list[EvalMatch],
+        eval_matches: list[EvalMatch] | list[FastEvalMatch] | list[RuleEvalMatch],
+        silenced_matches: int = 0,
     ) -> tuple[str, MsgBlocksType]:
         status_emoji = f'{cls.status_emoji.get(state, "")} '
 
@@ -52,7 +96,7 @@ class MessageBuilder:
             'fields': [
                 {
                     'type': 'mrkdwn',
-                    'text': '\n'.join([f'*{match.metric}:* {match.value}' for match in _eval_matches]),
+                    'text': '\n'.join(map(format_eval_match, _eval_matches)),
                 }
                 for _eval_matches in divide_seq(eval_matches)
                 if _eval_matches
@@ -64,35 +108,15 @@ class MessageBuilder:
             message_block.pop('fields')
         if message_block == {'type': 'section'}:
             message_block = {}
-
-        snooze_time_select_block = {
-            'type': 'actions',
-            'elements': [
-                {
-                    'type': 'static_select',
-                    'action_id': 'snooze-for',
-                    'placeholder': {
-                        'type': 'plain_text',
-                        'text': 'Snooze for :sleeping:',
-                        'emoji': True,
-                    },
-                    'options': [
-                        {'text': {'type': 'plain_text', 'text': text}, 'value': value}
-                        for text, value in [
-                            ('wake', '0'),
-                            ('15 min', '15'),
-                            ('30 min', '30'),
-                            ('1 hour', '60'),
-                            ('2 hours', '120'),
-                            ('5 hours', '300'),
-                            ('8 hours', '480'),
-                            ('1 day', '1440'),
-                            ('2 day', '2880'),
-                        ]
-                    ],
-                }
-            ],
-        }
+        silenced_block = (
+            {
+                'type': 'context',
+                'block_id': 'silenced-matches',
+                'elements': [{'type': 'mrkdwn', 'text': f':mute: {silenced_matches} silenced series are not shown'}],
+            }
+            if silenced_matches
+            else {}
+        )
 
         blocks: MsgBlocksType
         if state is GrafanaAlertState.ok:
@@ -104,7 +128,8 @@ class MessageBuilder:
                     [
                         title_block,
                         message_block,
-                        snooze_time_select_block,
+                        silenced_block,
+                        SNOOZE_TIME_SELECT_BLOCK,
                     ],
                 )
             )
@@ -118,7 +143,8 @@ class MessageBuilder:
         action_data: dict[str, t.Any],
         snoozed_by: str,
     ) -> MsgBlocksType:
-        message_blocks = copy.deepcopy(message_blocks)
+        # blocks are only added or removed, so a shallow copy keeps the original message intact
+        message_blocks = list(message_blocks)
 
         now = datetime.utcnow().strftime('%d %B %Y %H:%M:%S')
         period = action_data['selected_option']['text']['text']
@@ -130,6 +156,34 @@ class MessageBuilder:
 
         return message_blocks
 
+    @staticmethod
+    def add_resolved_status(message_blocks: MsgBlocksType) -> MsgBlocksType:
+        now = datetime.utcnow().strftime('%d %B %Y %H:%M:%S')
+        return [
+            *message_blocks,
+            {
+                'type': 'context',
+                'block_id': 'resolved-status',
+                'elements': [{'type': 'mrkdwn', 'text': f':white_check_mark: Resolved at {now} UTC'}],
+            },
+        ]
+
+    @staticmethod
+    def add_repeat_counter(message_blocks: MsgBlocksType, repeats: int) -> MsgBlocksType:
+        now = datetime.utcnow().strftime('%d %B %Y %H:%M:%S')
+        counter_block = {
+            'type': 'context',
+            'block_id': 'repeat-counter',
+            'elements': [{'type': 'mrkdwn', 'text': f':repeat: Received {repeats} times, last at {now} UTC'}],
+        }
+
+        blocks = [block for block in message_blocks if block.get('block_id') != 'repeat-counter']
+        if blocks and blocks[-1].get('type') == 'actions':
+            blocks.insert(-1, counter_block)
+        else:
+            blocks.append(counter_block)
+        return blocks
+
     @staticmethod
     def _generate_alert_status_block(now: str, period: str, username: str) -> dict[str, t.Any]:
         return {
@@ -176,17 +230,105 @@ class MessageBuilder:
 
         return msg_title, truncate_block_length(blocks)
 
+    @classmethod
+    def create_list_silences(cls, silences: list[Silence]) -> tuple[str, MsgBlocksType]:
+        msg_title = ':mute: Silences:' if silences else cls.silences_not_found_text
+        blocks: MsgBlocksType = [
+            {
+                'type': 'section',
+                'fields': [{'type': 'mrkdwn', 'text': f'*{msg_title}*'}],
+            }
+        ]
+        for silence in silences:
+            matchers = ', '.join(map(str, silence.matchers))
+            ends_at = datetime.utcfromtimestamp(silence.ends_at).strftime('%Y-%m-%d %H:%M:%S')
+            blocks.append(
+                {
+                    'type': 'section',
+                    'text': {
+                        'type': 'mrkdwn',
+                        'text': f'- `{matchers}`, silenced by @{silence.created_by} until {ends_at} UTC',
+                    },
+                    'accessory': {
+                        'type': 'button',
+                        'text': {'type': 'plain_text', 'text': ':loud_sound: Expire', 'emoji': True},
+                        'value': f'{silence.channel};{silence.id}',
+                        'action_id': 'expire-silence',
+                    },
+                }
+            )
+
+        return msg_title, truncate_block_length(blocks)
+
+    @classmethod
+    def create_digest_message(cls, alerts: t.Sequence[tuple[AlertMessage, int]]) -> tuple[str, MsgBlocksType]:
+        """
+        Renders alerts collected during a digest window as a single message grouped by state.
+
+        `alerts` is a sequence of (the latest message of the rule, how many times it was received).
+        """
+        msg_title = f'Alerts digest: {len(alerts)} alerts'
+        blocks: MsgBlocksType = [{'type': 'section', 'text': {'type': 'mrkdwn', 'text': f'*{msg_title}*'}}]
+
+        by_state: dict[GrafanaAlertState, list[str]] = {}
+        for message, repeats in alerts:
+            line = f'- <{message.rule_url}|{message.text}>'
+            if repeats > 1:
+                line += f' (x{repeats})'
+            by_state.setdefault(message.state, []).append(line)
+
+        sections: list[tuple[int, str]] = []
+        for state in cls.state_names:
+            if not (lines := by_state.get(state)):
+                continue
+            header = f'{cls.status_emoji.get(state, "")} *{cls.state_names[state]} ({len(lines)})*'
+            text = header
+            rendered = 0
+            for line in lines:
+                if len(text) + len(line) + 1 > MAX_SECTION_TEXT_LENGTH:
+                    sections.append((rendered, text))
+                    text, rendered = '', 0
+                text = f'{text}\n{line}' if text else line
+                rendered += 1
+            sections.append((rendered, text))
+
+        skipped = 0
+        for rendered, text in sections:
+            if len(blocks) >= MAX_BLOCKS - 1:
+                skipped += rendered
+                continue
+            blocks.append({'type': 'section', 'text': {'type': 'mrkdwn', 'text': text}})
+        if skipped:
+            more_alerts = {'type': 'mrkdwn', 'text': f'...and {skipped} more alerts'}
+            blocks.append({'type': 'context', 'elements': [more_alerts]})
+
+        return msg_title, truncate_block_length(blocks)
+
     @classmethod
     def remove_woke_alert(cls, message_blocks: MsgBlocksType, alert_key: str) -> MsgBlocksType:
+        return cls._remove_list_item(message_blocks, alert_key, cls.alerts_not_found_text)
+
+    @classmethod
+    def remove_expired_silence(cls, message_blocks: MsgBlocksType, silence_key: str) -> MsgBlocksType:
+        return cls._remove_list_item(message_blocks, silence_key, cls.silences_not_found_text)
+
+    @staticmethod
+    def _remove_list_item(message_blocks: MsgBlocksType, value: str, empty_list_text: str) -> MsgBlocksType:
         blocks = [
             message_blocks[0],
-            *[alert for alert in message_blocks[1:] if alert['accessory']['value'] != alert_key],
+            *[item for item in message_blocks[1:] if item['accessory']['value'] != value],
         ]
         if len(blocks) == 1:
-            blocks[0]['fields'][0]['text'] = f'*{cls.alerts_not_found_text}*'
+            header = blocks[0]
+            blocks[0] = {**header, 'fields': [{**header['fields'][0], 'text': f'*{empty_list_text}*'}]}
         return blocks
 
 
+def format_eval_match(match: EvalMatch | FastEvalMatch | RuleEvalMatch) -> str:
+    # a unified alert instance without data has no value
+    return f'*{match.metric}*' if match.value is None else f'*{match.metric}:* {match.value}'
+
+
 def truncate_block_length(blocks: MsgBlocksType) -> MsgBlocksType:
     for block in blocks:
         if block.get('type', '') != 'section':
@@ -0,0 +1,104 @@
+from collections import Counter
+
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.entities.slack_message_ref import SlackMessageRef
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.services.message_index_backend import BaseMessageIndex
+from alert_manager.services.slack.coalescer import AlertCoalescer
+from alert_manager.services.slack.digest import AlertDigest
+from alert_manager.services.slack.message import MessageBuilder
+from alert_manager.services.slack.sender import SlackSender
+
+
+class AlertNotifier:
+    """
+    Delivers rendered alert messages to Slack.
+
+    Alerts of digest channels are buffered and sent in batches. When a coalescer
+    is set, repeats of an alert received within its window update the already
+    posted message instead of posting a new one. When a thread index is set,
+    later firings of a rule are posted as replies to the first message of the rule.
+    When an index of open alerts is set, an ok alert updates the message of the
+    firing alert to the resolved layout instead of posting a new message.
+    """
+
+    def __init__(
+        self,
+        slack_sender: SlackSender,
+        coalescer: AlertCoalescer | None = None,
+        digest: AlertDigest | None = None,
+        thread_index: BaseMessageIndex | None = None,
+        open_alerts: BaseMessageIndex | None = None,
+    ) -> None:
+        self.slack_sender = slack_sender
+        self.coalescer = coalescer
+        self.digest = digest
+        self.thread_index = thread_index
+        self.open_alerts = open_alerts
+        self.stats: Counter[str] = Counter()
+
+    async def send(self, message: AlertMessage) -> None:
+        if self.digest is not None and self.digest.accepts(message):
+            self.digest.add(message)
+            self.stats['digested'] += 1
+            return
+
+        if message.state is GrafanaAlertState.ok and await self._resolve(message):
+            return
+
+        channel, ts = await self._deliver(message)
+        if self.open_alerts is not None and message.state is not GrafanaAlertState.ok:
+            await self.open_alerts.set(message.key, SlackMessageRef(channel=channel, ts=ts))
+
+    async def _resolve(self, message: AlertMessage) -> bool:
+        if self.open_alerts is None or (alert := await self.open_alerts.pop(message.key)) is None:
+            return False
+
+        await self.slack_sender.update_message(
+            channel=alert.channel,
+            ts=alert.ts,
+            **self.slack_sender.encode(message.text, MessageBuilder.add_resolved_status(message.blocks)),
+        )
+        self.stats['resolved'] += 1
+        return True
+
+    async def _deliver(self, message: AlertMessage) -> tuple[str, str]:
+        """
+        Posts the message or updates the coalesced one. Returns the channel id and ts of the Slack message.
+        """
+        if self.coalescer is None:
+            response = await self._post(message)
+            return response['channel'], response['ts']
+
+        async with self.coalescer.lock(message.key):
+            if alert := self.coalescer.get(message.key, message.state):
+                alert.repeats += 1
+                blocks = MessageBuilder.add_repeat_counter(message.blocks, alert.repeats)
+                await self.slack_sender.update_message(
+                    channel=alert.channel,
+                    ts=alert.ts,
+                    **self.slack_sender.encode(message.text, blocks),
+                )
+                self.stats['coalesced'] += 1
+                return alert.channel, alert.ts
+
+            response = await self._post(message)
+            self.coalescer.add(message.key, channel=response['channel'], ts=response['ts'], state=message.state)
+            return response['channel'], response['ts']
+
+    async def _post(self, message: AlertMessage) -> AsyncSlackResponse:
+        content = self.slack_sender.encode(message.text, message.blocks)
+        if self.thread_index is None:
+            self.stats['posted'] += 1
+            return await self.slack_sender.post_message(channel=message.channel, **content)
+
+        if thread := await self.thread_index.get(message.key):
+            self.stats['threaded'] += 1
+            return await self.slack_sender.post_message(channel=thread.channel, thread_ts=thread.ts, **content)
+
+        self.stats['posted'] += 1
+        response = await self.slack_sender.post_message(channel=message.channel, **content)
+        await self.thread_index.set(message.key, SlackMessageRef(channel=response['channel'], ts=response['ts']))
+        return response
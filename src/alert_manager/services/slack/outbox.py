@@ -0,0 +1,99 @@
+import asyncio
+from collections import Counter
+
+import aiohttp
+from slack_sdk.errors import SlackApiError
+from structlog import getLogger
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.services.outbox_backend import BaseOutbox
+from alert_manager.services.slack.notifier import AlertNotifier
+
+logger = getLogger(__name__)
+
+
+def is_retryable_error(err: BaseException) -> bool:
+    """
+    Returns True if the delivery may succeed later: Slack is unavailable or rate limits requests.
+    """
+    if isinstance(err, SlackApiError):
+        status_code: int = err.response.status_code
+        return status_code == 429 or status_code >= 500
+    return isinstance(err, aiohttp.ClientError | TimeoutError)
+
+
+class SlackOutbox:
+    """
+    Keeps alert messages which could not be delivered to Slack and redelivers them in background.
+
+    Entries are delivered in batches and acknowledged one by one. When a delivery
+    fails, the worker backs off exponentially from `min_backoff` to `max_backoff`
+    seconds and starts again from the oldest unacknowledged entry. Rate limits of
+    Slack are respected by the sender of the notifier.
+    """
+
+    def __init__(
+        self,
+        outbox: BaseOutbox,
+        notifier: AlertNotifier,
+        batch_size: int,
+        min_backoff: float,
+        max_backoff: float,
+        read_timeout: float = 5,
+    ) -> None:
+        self.outbox = outbox
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.read_timeout = read_timeout
+        self.stats: Counter[str] = Counter()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def append(self, message: AlertMessage) -> None:
+        await self.outbox.append(message)
+        self.stats['appended'] += 1
+
+    def start(self) -> None:
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await self.outbox.close()
+
+    async def _run(self) -> None:
+        backoff = self.min_backoff
+        while True:
+            try:
+                delivered = await self._deliver_batch()
+            except Exception:
+                logger.exception('Failed to deliver alerts from Slack outbox')
+                delivered = False
+
+            if delivered:
+                backoff = self.min_backoff
+            else:
+                self.stats['backoffs'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _deliver_batch(self) -> bool:
+        """
+        Delivers a batch of entries. Returns False if delivery failed and should be retried later.
+        """
+        for entry_id, message in await self.outbox.read(self.batch_size, timeout=self.read_timeout):
+            try:
+                await self.notifier.send(message)
+            except Exception as err:
+                if is_retryable_error(err):
+                    logger.warning('Slack is unavailable, outbox delivery postponed', channel=message.channel)
+                    return False
+                logger.exception('Failed to deliver alert from Slack outbox, alert dropped', channel=message.channel)
+                self.stats['dropped'] += 1
+            else:
+                self.stats['delivered'] += 1
+            await self.outbox.ack(entry_id)
+        return True
@@ -0,0 +1,98 @@
+import typing as t
+
+import aiohttp
+import msgspec
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+from structlog import getLogger
+
+from alert_manager.libs.text import truncate as truncate_text
+
+logger = getLogger(__name__)
+
+# Slack truncates message text after 40000 characters and rejects too long blocks,
+# so bigger messages are sent without blocks.
+MAX_CONTENT_SIZE = 40000
+
+_encoder = msgspec.json.Encoder()
+
+
+def encode_content(text: str, blocks: list[dict[str, t.Any]]) -> bytes:
+    """
+    Serializes the text and blocks of a message into a json object.
+    """
+    content = _encoder.encode({'text': text, 'blocks': blocks})
+    if len(content) > MAX_CONTENT_SIZE:
+        logger.warning('Slack message is too large, blocks are dropped', size=len(content))
+        content = _encoder.encode({'text': truncate_text(text=text, max_length=MAX_CONTENT_SIZE // 4)})
+    return content
+
+
+class SlackRawClient:
+    """
+    Thin client that posts already serialized messages to the Slack Web API.
+
+    It uses the token, base url and connection settings of the AsyncWebClient,
+    but skips its processing of the arguments and json encoding of every call.
+    """
+
+    def __init__(self, slack_client: AsyncWebClient) -> None:
+        self.slack_client = slack_client
+        self._session: aiohttp.ClientSession | None = None
+
+    async def api_call(self, api_method: str, *, content: bytes, **fields: t.Any) -> AsyncSlackResponse:
+        """
+        Calls an api method with `content` (made by `encode_content`) extended by `fields`.
+
+        Raises SlackApiError for unsuccessful responses the same way AsyncWebClient does.
+        """
+        body = self._build_body(content, fields)
+        url = f'{self.slack_client.base_url}{api_method}'
+        headers = {
+            **self.slack_client.headers,
+            'Authorization': f'Bearer {self.slack_client.token}',
+            'Content-Type': 'application/json;charset=utf-8',
+        }
+        # AsyncWebClient has no ssl context by default, which means the default verification
+        ssl = self.slack_client.ssl if self.slack_client.ssl is not None else True
+        async with self._get_session().post(
+            url,
+            data=body,
+            headers=headers,
+            ssl=ssl,
+            proxy=self.slack_client.proxy,
+            timeout=aiohttp.ClientTimeout(total=self.slack_client.timeout),
+        ) as resp:
+            data = await resp.json(content_type=None)
+            response = AsyncSlackResponse(
+                client=self.slack_client,
+                http_verb='POST',
+                api_url=url,
+                req_args={'data': body},
+                data=data,
+                headers=dict(resp.headers),
+                status_code=resp.status,
+            )
+        # raises SlackApiError, returns the response itself otherwise
+        response.validate()  # type: ignore[no-untyped-call]
+        return response
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.slack_client.session is not None:
+            return self.slack_client.session
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    @staticmethod
+    def _build_body(content: bytes, fields: dict[str, t.Any]) -> bytes:
+        if not fields:
+            return content
+        # content is a json object, so the fields are spliced into it without decoding it again
+        encoded_fields = _encoder.encode(fields)
+        return b'%b,%b' % (encoded_fields[:-1], content[1:])
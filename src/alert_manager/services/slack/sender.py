@@ -0,0 +1,116 @@
+import asyncio
+import typing as t
+from collections import Counter, OrderedDict
+from functools import partial
+
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+from structlog import getLogger
+
+from alert_manager.libs.rate_limit import TokenBucket
+from alert_manager.services.slack.raw_client import SlackRawClient, encode_content
+
+logger = getLogger(__name__)
+
+
+class SlackSender:
+    """
+    Sends messages to Slack respecting its rate limits.
+
+    Every (method, channel) pair has its own token bucket, so bursts are
+    smoothed out before they reach Slack. If Slack still answers with 429,
+    the bucket is paused for `Retry-After` seconds and the call is retried.
+    Calls made in response to a user action (`interactive=True`) use separate
+    buckets, so an alert storm doesn't delay them. At most `max_buckets` buckets
+    are kept, the least recently used one is dropped.
+
+    When a raw client is set, messages passed as `content` (see `encode`) are
+    sent as already serialized bytes, bypassing argument processing of AsyncWebClient.
+    """
+
+    def __init__(
+        self,
+        slack_client: AsyncWebClient,
+        rate: float,
+        burst: int,
+        max_retries: int,
+        raw_client: SlackRawClient | None = None,
+        max_buckets: int = 10000,
+    ) -> None:
+        self.slack_client = slack_client
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.raw_client = raw_client
+        self.max_buckets = max_buckets
+        self.stats: Counter[str] = Counter()
+        # (method, channel, interactive) -> bucket, in order of use
+        self._buckets: OrderedDict[tuple[str, str, bool], TokenBucket] = OrderedDict()
+
+    def encode(self, text: str, blocks: list[dict[str, t.Any]]) -> dict[str, t.Any]:
+        """
+        Returns message arguments for `post_message` and `update_message`.
+
+        With a raw client the message is serialized here once, so retries and
+        repeated sends of the returned arguments reuse the same bytes.
+        """
+        if self.raw_client is None:
+            return {'text': text, 'blocks': blocks}
+        return {'content': encode_content(text, blocks)}
+
+    async def post_message(self, *, channel: str, interactive: bool = False, **kwargs: t.Any) -> AsyncSlackResponse:
+        return await self._call('chat.postMessage', channel=channel, interactive=interactive, **kwargs)
+
+    async def update_message(self, *, channel: str, interactive: bool = False, **kwargs: t.Any) -> AsyncSlackResponse:
+        return await self._call('chat.update', channel=channel, interactive=interactive, **kwargs)
+
+    async def _call(self, method: str, *, channel: str, interactive: bool, **kwargs: t.Any) -> AsyncSlackResponse:
+        func = self._get_api_func(method, kwargs)
+        bucket = self._get_bucket(method, channel, interactive)
+        attempt = 0
+        while True:
+            if delay := bucket.reserve():
+                self.stats['throttled'] += 1
+                await asyncio.sleep(delay)
+
+            try:
+                return await func(channel=channel, **kwargs)
+            except SlackApiError as err:
+                if err.response.status_code != 429 or attempt >= self.max_retries:
+                    raise
+
+                retry_after = get_retry_after(err)
+                self.stats['rate_limited'] += 1
+                logger.warning('Slack rate limit exceeded', method=method, channel=channel, retry_after=retry_after)
+                bucket.pause(retry_after)
+                attempt += 1
+                self.stats['retries'] += 1
+
+    def _get_api_func(self, method: str, kwargs: dict[str, t.Any]) -> t.Callable[..., t.Awaitable[AsyncSlackResponse]]:
+        if 'content' in kwargs and self.raw_client is not None:
+            return partial(self.raw_client.api_call, method)
+        if method == 'chat.update':
+            return self.slack_client.chat_update
+        return self.slack_client.chat_postMessage
+
+    def _get_bucket(self, method: str, channel: str, interactive: bool) -> TokenBucket:
+        key = (method, channel, interactive)
+        if (bucket := self._buckets.get(key)) is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+        if len(self._buckets) >= self.max_buckets:
+            # a bucket unused for long is full again, so dropping it is the same as keeping it
+            self._buckets.popitem(last=False)
+        bucket = self._buckets[key] = TokenBucket(rate=self.rate, capacity=self.burst)
+        return bucket
+
+
+def get_retry_after(err: SlackApiError, default: float = 1) -> float:
+    for name, value in err.response.headers.items():
+        if name.lower() == 'retry-after':
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                break
+    return default
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import Counter
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from structlog import getLogger
+
+from alert_manager.services.snooze_patterns import is_pattern
+
+logger = getLogger(__name__)
+
+
+class SnoozeNearCache:
+    """
+    In-process cache of `RedisAlertFilter.is_snoozed` results.
+
+    Snoozed and not snoozed results are both cached. A snoozed result expires
+    when the snooze ends, any result expires after `ttl` seconds at the latest.
+    `RedisAlertFilter` publishes the key of every changed snooze to `channel`,
+    so replicas drop stale results as soon as a snooze changes. While the
+    subscription is not established the cache is bypassed, because
+    invalidations could be missed.
+
+    Messages are polled with `poll_interval`, which must be shorter than the socket
+    timeout of the client: a blocking read of an idle subscription would fail with
+    the socket timeout and the cache would be dropped.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        max_size: int,
+        ttl: float,
+        channel: str = 'snooze-invalidations',
+        reconnect_delay: float = 1,
+        poll_interval: float = 1,
+    ) -> None:
+        self.redis = redis
+        self.max_size = max_size
+        self.ttl = ttl
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.poll_interval = poll_interval
+        self.stats: Counter[str] = Counter()
+        # incremented on every invalidation, a result read before an invalidation must not be cached
+        self.generation = 0
+        self._entries: dict[str, tuple[bool, float]] = {}
+        self._subscribed = False
+        self._listener: asyncio.Task[None] | None = None
+
+    def get(self, key: str) -> bool | None:
+        """
+        Returns the cached result or None if the key must be checked in redis.
+        """
+        if not self._subscribed:
+            return None
+        if (entry := self._entries.get(key)) is None:
+            self.stats['misses'] += 1
+            return None
+
+        snoozed, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return snoozed
+
+    def put(self, key: str, snoozed_for: float | None, generation: int) -> None:
+        """
+        Caches the result read at `generation`. `snoozed_for` is the number of seconds
+        until the snooze ends or None if the alert is not snoozed.
+        """
+        if not self._subscribed or generation != self.generation:
+            return
+
+        ttl = self.ttl if snoozed_for is None else min(snoozed_for, self.ttl)
+        self._entries.pop(key, None)
+        self._entries[key] = (snoozed_for is not None, time.monotonic() + ttl)
+        if len(self._entries) > self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, key: str) -> None:
+        self.generation += 1
+        if is_pattern(key):
+            # a pattern snooze changes results of any number of keys
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def publish_invalidation(self, key: str) -> None:
+        """
+        Drops the cached result of the key in all replicas, including this one.
+        """
+        self.invalidate(key)
+        await self.redis.publish(self.channel, key)
+
+    def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    while True:
+                        # None means no messages during the interval, the subscription is still alive
+                        if (message := await pubsub.get_message(timeout=self.poll_interval)) is None:
+                            continue
+                        if message['type'] == 'subscribe':
+                            self._subscribed = True
+                        elif message['type'] == 'message':
+                            self.invalidate(message['data'].decode())
+            except (RedisError, OSError):
+                logger.warning('Snooze invalidations subscription is lost, near-cache is bypassed')
+            finally:
+                self._invalidate_all()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _invalidate_all(self) -> None:
+        self._subscribed = False
+        self.generation += 1
+        self._entries.clear()
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import time
+import typing as t
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+import msgspec
+from pydantic import TypeAdapter
+from structlog import getLogger
+
+from alert_manager.entities.alert_metadata import AlertMetadata
+from alert_manager.libs.asyncio_utils import periodic_task
+from alert_manager.libs.gc_utils import paused_gc
+
+logger = getLogger(__name__)
+
+# a snooze is recorded as [key, title, snoozed_by, snoozed_until], a wake up as [key]
+_encoder = msgspec.json.Encoder()
+_record_decoder = msgspec.json.Decoder(list[str | float])
+_snapshot_decoder = msgspec.json.Decoder(list[list[str | float]])
+_snoozes_adapter = TypeAdapter(list[AlertMetadata])
+
+
+def _encode_snooze(key: str, metadata: AlertMetadata) -> list[str | float]:
+    return [key, metadata.title, metadata.snoozed_by, metadata.snoozed_until]
+
+
+class SnoozeJournal:
+    """
+    Persists snoozes of `InMemoryAlertFilter` across restarts.
+
+    The journal is a snapshot of all snoozes (`<path>.snapshot`) and a log of
+    snoozes and wake ups made after it (`<path>`). Changes are buffered in memory
+    and appended to the log every `flush_interval` seconds, so a crash loses at
+    most the changes of the last interval. Every `snapshot_interval` seconds the
+    snoozes are written to a new snapshot and the log is truncated. All file
+    operations run in a thread.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1, snapshot_interval: float = 300) -> None:
+        self.path = path
+        self.snapshot_path = f'{path}.snapshot'
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self._buffer: list[bytes] = []
+        self._lock = asyncio.Lock()
+        self._file: t.BinaryIO | None = None
+        self._get_snoozes: Callable[[], Iterable[tuple[str, AlertMetadata]]] = lambda: ()
+        self._last_snapshot_at = time.monotonic()
+        self._periodic_flush_task: asyncio.Task[None] | None = None
+
+    def load(self) -> dict[str, AlertMetadata]:
+        """
+        Returns snoozes which are not expired yet.
+        """
+        records: dict[str, list[str | float]] = {}
+        try:
+            with open(self.snapshot_path, 'rb') as file:
+                for record in _snapshot_decoder.decode(file.read()):
+                    records[t.cast(str, record[0])] = record
+        except FileNotFoundError:
+            pass
+
+        for record in self._read_log():
+            if len(record) == 1:
+                records.pop(t.cast(str, record[0]), None)
+            else:
+                records[t.cast(str, record[0])] = record
+
+        current_timestamp = datetime.now().timestamp()
+        keys = []
+        fields = []
+        for key, (_, title, snoozed_by, snoozed_until) in records.items():
+            if t.cast(float, snoozed_until) <= current_timestamp:
+                continue
+            channel, rule_url = key.split(';', 1)
+            keys.append(key)
+            fields.append(
+                {
+                    'title': title,
+                    'rule_url': rule_url,
+                    'snoozed_by': snoozed_by,
+                    'snoozed_until': snoozed_until,
+                    'channel': channel,
+                }
+            )
+        # all models are validated by one call
+        with paused_gc():
+            return dict(zip(keys, _snoozes_adapter.validate_python(fields), strict=True))
+
+    def start(self, get_snoozes: Callable[[], Iterable[tuple[str, AlertMetadata]]]) -> None:
+        """
+        Starts writing the journal, `get_snoozes` returns all current snoozes for a snapshot.
+        """
+        self._get_snoozes = get_snoozes
+        self._file = open(self.path, 'ab')
+        self._periodic_flush_task = periodic_task(self._flush, self.flush_interval)
+
+    def snooze(self, key: str, metadata: AlertMetadata) -> None:
+        self._buffer.append(_encoder.encode(_encode_snooze(key, metadata)) + b'\n')
+
+    def wake_up(self, key: str) -> None:
+        """
+        Records that the snooze is removed, whether it's woken up or dropped.
+        """
+        self._buffer.append(_encoder.encode([key]) + b'\n')
+
+    async def close(self) -> None:
+        if self._periodic_flush_task is not None:
+            self._periodic_flush_task.cancel()
+            await asyncio.gather(self._periodic_flush_task, return_exceptions=True)
+            self._periodic_flush_task = None
+        await self._flush()
+        async with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            if self._file is None:
+                return
+            try:
+                if time.monotonic() - self._last_snapshot_at >= self.snapshot_interval:
+                    await self._snapshot(self._file)
+                elif self._buffer:
+                    records, self._buffer = self._buffer, []
+                    await asyncio.to_thread(self._write_records, self._file, records)
+            except OSError:
+                logger.exception('Failed to write snooze journal')
+
+    async def _snapshot(self, file: t.BinaryIO) -> None:
+        # buffered changes are already applied to the snoozes, so they are a part of the snapshot
+        snoozes = list(self._get_snoozes())
+        buffered_count = len(self._buffer)
+        self._last_snapshot_at = time.monotonic()
+        await asyncio.to_thread(self._write_snapshot, file, snoozes)
+        # changes made during the write are not in the snapshot and stay in the buffer
+        del self._buffer[:buffered_count]
+
+    @staticmethod
+    def _write_records(file: t.BinaryIO, records: list[bytes]) -> None:
+        file.writelines(records)
+        file.flush()
+
+    def _write_snapshot(self, file: t.BinaryIO, snoozes: list[tuple[str, AlertMetadata]]) -> None:
+        """
+        Writes the snapshot and truncates the log.
+        """
+        tmp_path = f'{self.snapshot_path}.tmp'
+        with open(tmp_path, 'wb') as snapshot_file:
+            snapshot_file.write(_encoder.encode([_encode_snooze(key, metadata) for key, metadata in snoozes]))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # if the application stops before the log is truncated, the log is replayed on top of the snapshot,
+        # which leads to the same snoozes
+        file.truncate(0)
+
+    def _read_log(self) -> list[list[str | float]]:
+        try:
+            with open(self.path, 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return []
+
+        *lines, tail = content.split(b'\n')
+        if tail:
+            # the last line is incomplete if the application was killed during a write
+            with open(self.path, 'r+b') as file:
+                file.truncate(len(content) - len(tail))
+        records = []
+        for line_number, line in enumerate(lines, 1):
+            if not line:
+                continue
+            try:
+                record = _record_decoder.decode(line)
+            except msgspec.DecodeError:
+                record = []
+            if len(record) not in (1, 4):
+                logger.warning('Invalid snooze journal record is skipped', path=self.path, line_number=line_number)
+                continue
+            records.append(record)
+        return records
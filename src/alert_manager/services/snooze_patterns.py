@@ -0,0 +1,141 @@
+import re
+import typing as t
+from collections.abc import Iterable
+
+# rule urls contain `?` and `[` (query strings), so `*` is the only wildcard of a pattern
+WILDCARD: t.Final = '*'
+# the key of patterns in a trie node, characters of an url are never empty
+_END: t.Final = ''
+
+
+def is_pattern(rule_url: str) -> bool:
+    return WILDCARD in rule_url
+
+
+class SnoozePatternIndex:
+    """
+    Pattern snoozes of one channel, e.g. `https://grafana/d/a1b2c3d4/*` snoozes all
+    panels of a dashboard. `*` matches any sequence of characters.
+
+    A pattern is kept in a trie by its literal end: a pattern ending with a literal,
+    e.g. `https://grafana/d/*?viewPanel=2`, by the reversed suffix, others by the prefix.
+    A lookup walks the url through both tries and checks only the patterns found on
+    the way, so it takes time proportional to the length of the url rather than to
+    the number of patterns. The tries are rebuilt lazily after a change, snoozes
+    change rarely compared to lookups.
+    """
+
+    def __init__(self) -> None:
+        self._patterns: dict[str, float] = {}
+        self._next_expiration = float('inf')
+        self._prefixes: dict[str, t.Any] = {}
+        self._suffixes: dict[str, t.Any] = {}
+        # patterns which start and end with `*`, they are checked one by one
+        self._unanchored: list[str] = []
+        self._regexes: dict[str, re.Pattern[str]] = {}
+        self._compiled = True
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, snoozed_until: float) -> None:
+        self._patterns[pattern] = snoozed_until
+        self._next_expiration = min(self._next_expiration, snoozed_until)
+        self._compiled = False
+
+    def remove(self, pattern: str) -> None:
+        if self._patterns.pop(pattern, None) is not None:
+            self._compiled = False
+
+    def match(self, rule_url: str, current_timestamp: float) -> float | None:
+        """
+        Returns `snoozed_until` of a pattern snooze matching the rule url or None if there is no such snooze.
+        """
+        if self._next_expiration <= current_timestamp:
+            self._remove_expired(current_timestamp)
+        if not self._compiled:
+            self._compile()
+
+        candidates = list(self._unanchored)
+        if self._prefixes:
+            self._collect(self._prefixes, rule_url, candidates)
+        if self._suffixes:
+            self._collect(self._suffixes, reversed(rule_url), candidates)
+        for pattern in candidates:
+            if self._regexes[pattern].fullmatch(rule_url):
+                return self._patterns[pattern]
+        return None
+
+    def _remove_expired(self, current_timestamp: float) -> None:
+        self._patterns = {
+            pattern: snoozed_until
+            for pattern, snoozed_until in self._patterns.items()
+            if snoozed_until > current_timestamp
+        }
+        self._next_expiration = min(self._patterns.values(), default=float('inf'))
+        self._compiled = False
+
+    def _compile(self) -> None:
+        self._prefixes = {}
+        self._suffixes = {}
+        self._unanchored = []
+        self._regexes = {pattern: self._regexes.get(pattern) or self._translate(pattern) for pattern in self._patterns}
+        for pattern in self._patterns:
+            prefix, *_, suffix = pattern.split(WILDCARD)
+            if suffix:
+                self._insert(self._suffixes, reversed(suffix), pattern)
+            elif prefix:
+                self._insert(self._prefixes, prefix, pattern)
+            else:
+                self._unanchored.append(pattern)
+        self._compiled = True
+
+    @staticmethod
+    def _insert(trie: dict[str, t.Any], chars: Iterable[str], pattern: str) -> None:
+        node = trie
+        for char in chars:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(pattern)
+
+    @staticmethod
+    def _collect(trie: dict[str, t.Any], chars: Iterable[str], candidates: list[str]) -> None:
+        """
+        Adds patterns of all nodes on the path of `chars` to `candidates`.
+        """
+        node = trie
+        for char in chars:
+            if _END in node:
+                candidates.extend(node[_END])
+            child: dict[str, t.Any] | None = node.get(char)
+            if child is None:
+                return
+            node = child
+        if _END in node:
+            candidates.extend(node[_END])
+
+    @staticmethod
+    def _translate(pattern: str) -> re.Pattern[str]:
+        return re.compile('.*'.join(map(re.escape, pattern.split(WILDCARD))), re.DOTALL)
+
+
+class SnoozePatterns:
+    """
+    Pattern snoozes of all channels.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: dict[str, SnoozePatternIndex] = {}
+
+    def add(self, channel: str, pattern: str, snoozed_until: float) -> None:
+        self._indexes.setdefault(channel, SnoozePatternIndex()).add(pattern, snoozed_until)
+
+    def remove(self, channel: str, pattern: str) -> None:
+        if (index := self._indexes.get(channel)) is None:
+            return
+        index.remove(pattern)
+        if not index:
+            del self._indexes[channel]
+
+    def match(self, channel: str, rule_url: str, current_timestamp: float) -> bool:
+        index = self._indexes.get(channel)
+        return index is not None and index.match(rule_url, current_timestamp) is not None
@@ -1,6 +1,11 @@
+import re
+
 from pydantic import BaseModel, Field
 
-from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.enums.grafana import GrafanaAlertState, GrafanaUnifiedAlertStatus
+
+# `[ var='B' labels={instance=app-1:8000} value=3 ]`, the first var is the query the condition is evaluated on
+_VALUE_STRING_VAR_RE = re.compile(r"var='(?P<ref>[^']+)'")
 
 
 class EvalMatch(BaseModel):
@@ -16,3 +21,98 @@ class GrafanaAlertRequest(BaseModel):
     rule_name: str = Field(alias='ruleName')
     rule_url: str = Field(alias='ruleUrl')
     eval_matches: list[EvalMatch] = Field(alias='evalMatches')
+
+
+class RuleEvalMatch(BaseModel):
+    """
+    Eval match made of a unified alert instance, an instance without data has no value.
+    """
+
+    metric: str
+    value: int | float | None
+    tags: dict[str, str] | None = Field(default=None)
+
+
+class GrafanaRuleAlert(BaseModel):
+    """
+    Alert instances of one rule of a unified alerting notification, shaped as a legacy alert.
+    """
+
+    title: str
+    message: str | None = Field(default=None)
+    state: GrafanaAlertState
+    rule_name: str
+    rule_url: str
+    eval_matches: list[RuleEvalMatch]
+
+
+class GrafanaUnifiedAlert(BaseModel):
+    status: GrafanaUnifiedAlertStatus
+    labels: dict[str, str] = Field(default_factory=dict)
+    annotations: dict[str, str] = Field(default_factory=dict)
+    generator_url: str = Field(alias='generatorURL')
+    fingerprint: str
+    values: dict[str, int | float] | None = Field(default=None)
+    value_string: str | None = Field(default=None, alias='valueString')
+
+    def get_value(self) -> int | float | None:
+        """
+        Returns the value of the expression named in `valueString`, or of the first
+        expression by its ref id, or None if grafana sent no values (e.g. no data).
+        """
+        if not self.values:
+            return None
+        if self.value_string and (match := _VALUE_STRING_VAR_RE.search(self.value_string)):
+            if (value := self.values.get(match['ref'])) is not None:
+                return value
+        return self.values[min(self.values)]
+
+
+class GrafanaUnifiedAlertRequest(BaseModel):
+    """
+    Notification of grafana unified alerting. One notification carries a group of alerts.
+    """
+
+    status: GrafanaUnifiedAlertStatus
+    alerts: list[GrafanaUnifiedAlert]
+    group_labels: dict[str, str] = Field(default_factory=dict, alias='groupLabels')
+    common_labels: dict[str, str] = Field(default_factory=dict, alias='commonLabels')
+    common_annotations: dict[str, str] = Field(default_factory=dict, alias='commonAnnotations')
+
+    def to_rule_alerts(self) -> list[GrafanaRuleAlert]:
+        """
+        Groups alerts by rule and status and returns one legacy-shaped alert per group.
+
+        Every alert instance of a rule becomes an eval match, so a group renders
+        as one Slack message per rule instead of one message per instance.
+        """
+        groups: dict[tuple[str, GrafanaUnifiedAlertStatus], list[GrafanaUnifiedAlert]] = {}
+        for alert in self.alerts:
+            groups.setdefault((alert.generator_url, alert.status), []).append(alert)
+
+        rule_alerts = []
+        for (rule_url, status), alerts in groups.items():
+            state = GrafanaAlertState.alerting if status is GrafanaUnifiedAlertStatus.firing else GrafanaAlertState.ok
+            rule_name = alerts[0].labels.get('alertname') or self.common_labels.get('alertname') or rule_url
+            annotations = alerts[0].annotations or self.common_annotations
+            rule_alerts.append(
+                GrafanaRuleAlert(
+                    title=f'[{"Alerting" if state is GrafanaAlertState.alerting else "OK"}] {rule_name}',
+                    message=annotations.get('summary') or annotations.get('description'),
+                    state=state,
+                    rule_name=rule_name,
+                    rule_url=rule_url,
+                    eval_matches=[
+                        RuleEvalMatch(metric=format_instance(alert.labels), value=alert.get_value(), tags=alert.labels)
+                        for alert in alerts
+                    ],
+                )
+            )
+        return rule_alerts
+
+
+def format_instance(labels: dict[str, str]) -> str:
+    instance_labels = {name: value for name, value in labels.items() if name not in ('alertname', 'grafana_folder')}
+    if not instance_labels:
+        return labels.get('alertname', '')
+    return ', '.join(f'{name}={value}' for name, value in instance_labels.items())
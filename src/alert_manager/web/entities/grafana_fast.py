@@ -0,0 +1,43 @@
+import typing as t
+
+import msgspec
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import CoreSchema
+
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.web.entities.grafana import GrafanaAlertRequest
+
+
+class FastEvalMatch(msgspec.Struct, gc=False):
+    metric: str
+    value: int | float
+    tags: dict[str, str] | None = None
+
+
+class FastGrafanaAlertRequest(
+    msgspec.Struct,
+    kw_only=True,
+    gc=False,
+    rename={'rule_name': 'ruleName', 'rule_url': 'ruleUrl', 'eval_matches': 'evalMatches'},
+):
+    """
+    Compact counterpart of GrafanaAlertRequest used by the fast ingest path.
+
+    It accepts a subset of what the pydantic model accepts (no lax coercions),
+    so a body rejected here must be validated by the pydantic model again.
+    """
+
+    title: str
+    message: str | None = None
+    state: GrafanaAlertState
+    rule_name: str
+    rule_url: str
+    eval_matches: list[FastEvalMatch]
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: t.Any, handler: GetCoreSchemaHandler) -> CoreSchema:
+        # the wire format is the same, so the openapi schema is borrowed from the pydantic model
+        return handler(GrafanaAlertRequest)
+
+
+grafana_alert_decoder = msgspec.json.Decoder(FastGrafanaAlertRequest)
@@ -1,63 +1,443 @@
+import asyncio
+import hashlib
+import json
+import typing as t
+from datetime import datetime
+
+import msgspec
 from aiohttp import web
 from aiohttp_deps import Depends, Json, Query, Router
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from structlog import getLogger
+from taskiq_dependencies import ParamInfo
 
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.libs.json_stream import ItemSplitter, JsonArraySplitter, NdjsonSplitter
 from alert_manager.libs.security import require_user
 from alert_manager.services.alert_filter_backend import BaseAlertFilter
+from alert_manager.services.dedupe_backend import BaseDedupeCache
+from alert_manager.services.silence_backend import BaseSilenceBackend
+from alert_manager.services.silences import get_series_labels
+from alert_manager.services.slack.delivery import DeliveryQueue
+from alert_manager.services.slack.exceptions import DeliveryQueueFullError
 from alert_manager.services.slack.message import MessageBuilder
-from alert_manager.web.entities.grafana import GrafanaAlertRequest
+from alert_manager.services.slack.outbox import SlackOutbox, is_retryable_error
+from alert_manager.web.entities.grafana import GrafanaAlertRequest, GrafanaRuleAlert, GrafanaUnifiedAlertRequest
+from alert_manager.web.entities.grafana_fast import FastGrafanaAlertRequest, grafana_alert_decoder
 
+logger = getLogger(__name__)
 router = Router()
 
+NDJSON_CONTENT_TYPES = frozenset(('application/x-ndjson', 'application/jsonl', 'application/ndjson'))
+
+GrafanaAlertPayload = GrafanaAlertRequest | FastGrafanaAlertRequest
+# an alert of any webhook, including a rule of a unified alerting notification
+AlertPayload = GrafanaAlertPayload | GrafanaRuleAlert
+
+
+class GrafanaAlertJson(Json):
+    """
+    Json dependency that decodes grafana alerts with msgspec when FAST_INGEST is enabled.
+
+    A body the fast decoder rejects is validated by the pydantic model, so error
+    responses are exactly the same as without the fast path.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.type_cache = TypeAdapter(GrafanaAlertRequest)
+        self.type_initialized = True
+
+    async def __call__(self, param_info: ParamInfo = Depends(), request: web.Request = Depends()) -> t.Any:
+        if request.app['fast_ingest']:
+            try:
+                return grafana_alert_decoder.decode(await request.read())
+            except (msgspec.DecodeError, msgspec.ValidationError):
+                pass
+        return await super().__call__(param_info, request)
+
 
 @router.post('/webhook/grafana/')
 async def grafana_alert_view(
     channel_id: str | None = Depends(Query(default=None)),
     channel_name: str | None = Depends(Query(default=None, alias='channel')),
-    payload: GrafanaAlertRequest = Depends(Json()),
+    payload: GrafanaAlertPayload = Depends(GrafanaAlertJson()),
     request: web.Request = Depends(),
     _: str | None = Depends(require_user),
 ) -> web.Response:
     """
     Accepts and processes alerts from grafana.
     """
-    use_channel_id: bool = request.app['use_channel_id']
     alert_filter: BaseAlertFilter = request.app['alert_filter']
+    filter_channel, slack_channel = get_channels(request.app['use_channel_id'], channel_id, channel_name)
+
+    if await alert_filter.is_snoozed(filter_channel, payload.rule_url):
+        return web.Response()
+    unsilenced_payload, silenced_matches = await apply_silences(request.app, filter_channel, payload)
+    if unsilenced_payload is None:
+        return web.Response()
+
+    status = await deliver_alert(
+        request.app, alert_filter, filter_channel, slack_channel, unsilenced_payload, silenced_matches
+    )
+    if status == 'rejected':
+        return web.Response(status=503, text='Slack delivery queue is full', headers={'Retry-After': '1'})
+    return web.Response(status=202 if status == 'queued' else 200)
+
+
+@router.post('/webhook/grafana/bulk/')
+async def grafana_bulk_alert_view(
+    channel_id: str | None = Depends(Query(default=None)),
+    channel_name: str | None = Depends(Query(default=None, alias='channel')),
+    request: web.Request = Depends(),
+    _: str | None = Depends(require_user),
+) -> web.Response:
+    """
+    Accepts many grafana alerts in one request, as a json array or as ndjson (one alert per line).
+
+    Responds with a summary and a result for every alert in the order they were received.
+    An alert which failed to be delivered gets the `error` status, the other alerts are
+    still delivered and reported, see `deliver_batch`.
+    """
+    alert_filter: BaseAlertFilter = request.app['alert_filter']
+    filter_channel, slack_channel = get_channels(request.app['use_channel_id'], channel_id, channel_name)
+    max_alerts: int = request.app['bulk_max_alerts']
+
+    results: list[dict[str, t.Any]] = []
+    payloads: list[tuple[int, GrafanaAlertRequest]] = []
+    async for raw_payload in iter_bulk_payloads(request):
+        if len(results) >= max_alerts:
+            raise web.HTTPRequestEntityTooLarge(
+                max_size=max_alerts, actual_size=len(results) + 1, text=f'Too many alerts, max is {max_alerts}'
+            )
+        try:
+            payload = GrafanaAlertRequest.model_validate_json(raw_payload)
+        except ValidationError as err:
+            errors = err.errors(include_url=False, include_context=False, include_input=False)
+            results.append({'status': 'invalid', 'errors': errors})
+            continue
+        payloads.append((len(results), payload))
+        results.append({})
+
+    snoozed = await alert_filter.is_snoozed_many(filter_channel, [payload.rule_url for _, payload in payloads])
+    deliverable: list[tuple[int, AlertPayload, int]] = []
+    for index, payload in payloads:
+        if snoozed[payload.rule_url]:
+            results[index] = {'status': 'snoozed'}
+            continue
+        unsilenced_payload, silenced_matches = await apply_silences(request.app, filter_channel, payload)
+        if unsilenced_payload is None:
+            results[index] = {'status': 'silenced'}
+            continue
+        deliverable.append((index, unsilenced_payload, silenced_matches))
+
+    statuses = await deliver_batch(request.app, alert_filter, filter_channel, slack_channel, deliverable)
+    for index, status in statuses.items():
+        results[index] = {'status': status}
+
+    return web.json_response({'summary': summarize_results(results), 'results': results})
+
+
+@router.post('/webhook/grafana/unified/')
+async def grafana_unified_alert_view(
+    channel_id: str | None = Depends(Query(default=None)),
+    channel_name: str | None = Depends(Query(default=None, alias='channel')),
+    payload: GrafanaUnifiedAlertRequest = Depends(Json()),
+    request: web.Request = Depends(),
+    _: str | None = Depends(require_user),
+) -> web.Response:
+    """
+    Accepts and processes notifications of grafana unified alerting.
+
+    Alerts of the group are sent as one Slack message per rule. Responds with a summary
+    and a result for every rule, a rule which failed to be delivered doesn't stop the others.
+    """
+    alert_filter: BaseAlertFilter = request.app['alert_filter']
+    filter_channel, slack_channel = get_channels(request.app['use_channel_id'], channel_id, channel_name)
+
+    rule_alerts = payload.to_rule_alerts()
+    snoozed = await alert_filter.is_snoozed_many(filter_channel, [alert.rule_url for alert in rule_alerts])
+
+    results: list[dict[str, t.Any]] = []
+    for alert in rule_alerts:
+        result = {'rule_url': alert.rule_url, 'state': alert.state.value}
+        results.append(result)
+        if snoozed[alert.rule_url]:
+            result['status'] = 'snoozed'
+            continue
+        unsilenced_alert, silenced_matches = await apply_silences(request.app, filter_channel, alert)
+        if unsilenced_alert is None:
+            result['status'] = 'silenced'
+            continue
+        result['status'] = await deliver_alert_or_error(
+            request.app, alert_filter, filter_channel, slack_channel, unsilenced_alert, silenced_matches
+        )
+
+    summary = summarize_results(results)
+    if 'rejected' in summary:
+        return web.json_response({'summary': summary, 'results': results}, status=503, headers={'Retry-After': '1'})
+    return web.json_response({'summary': summary, 'results': results}, status=202 if 'queued' in summary else 200)
+
+
+@router.get('/health-check/')
+async def health_check_view() -> web.Response:
+    return web.json_response({'status': 'ok'})
+
+
+@router.get('/stats/')
+async def stats_view(request: web.Request = Depends(), _: str | None = Depends(require_user)) -> web.Response:
+    """
+    Returns internal counters of the application components, they include channel names.
+    """
+    return web.json_response({name: dict(counters) for name, counters in request.app['stats'].items()})
+
 
+def get_channels(use_channel_id: bool, channel_id: str | None, channel_name: str | None) -> tuple[str, str]:
+    """
+    Returns the channel used to filter alerts and the channel to send Slack messages to.
+    """
     if use_channel_id:
         if not channel_id:
-            return web.Response(
-                status=400,
-                text='channel_id query parameter is required when USE_CHANNEL_ID=true',
-            )
-        filter_channel = channel_id
-        slack_channel = channel_id
-    else:
-        if not channel_name:
-            return web.Response(
-                status=400,
-                text='channel query parameter is required when USE_CHANNEL_ID=false',
-            )
-        filter_channel = channel_name
-        slack_channel = f'#{channel_name}'
+            raise web.HTTPBadRequest(text='channel_id query parameter is required when USE_CHANNEL_ID=true')
+        return channel_id, channel_id
+
+    if not channel_name:
+        raise web.HTTPBadRequest(text='channel query parameter is required when USE_CHANNEL_ID=false')
+    return channel_name, f'#{channel_name}'
+
+
+async def apply_silences(
+    app: web.Application, filter_channel: str, payload: AlertPayload
+) -> tuple[AlertPayload | None, int]:
+    """
+    Removes silenced eval matches from the alert.
+
+    Returns the alert with the rest of eval matches, or None if all of them are silenced,
+    and the number of silenced eval matches. An alert without eval matches is checked
+    by its `alertname` label.
+    """
+    silence_backend: BaseSilenceBackend | None = app.get('silence_backend')
+    if silence_backend is None or (silence_index := await silence_backend.get_index(filter_channel)) is None:
+        return payload, 0
+
+    current_timestamp = datetime.now().timestamp()
+    if not payload.eval_matches:
+        silence = silence_index.match(get_series_labels(payload.rule_name, None), current_timestamp)
+        return (None, 0) if silence is not None else (payload, 0)
+
+    eval_matches = [
+        match
+        for match in payload.eval_matches
+        if silence_index.match(get_series_labels(payload.rule_name, match.tags), current_timestamp) is None
+    ]
+    silenced_matches = len(payload.eval_matches) - len(eval_matches)
+    if not eval_matches:
+        return None, silenced_matches
+    if not silenced_matches:
+        return payload, 0
+    if isinstance(payload, BaseModel):
+        return payload.model_copy(update={'eval_matches': eval_matches}), silenced_matches
+    return msgspec.structs.replace(payload, eval_matches=eval_matches), silenced_matches
 
-    if await alert_filter.is_snoozed(filter_channel, payload.rule_url):
-        return web.Response()
 
+def create_alert_message(
+    alert_filter: BaseAlertFilter,
+    filter_channel: str,
+    slack_channel: str,
+    payload: AlertPayload,
+    silenced_matches: int = 0,
+) -> AlertMessage:
     text, blocks = MessageBuilder.create_alert_message(
         state=payload.state,
         title=payload.title,
         rule_url=payload.rule_url,
         message=payload.message,
         eval_matches=payload.eval_matches,
+        silenced_matches=silenced_matches,
     )
-    await request.app['slack_client'].chat_postMessage(
+    return AlertMessage(
+        key=alert_filter.create_key(filter_channel, payload.rule_url),
+        webhook_channel=filter_channel,
         channel=slack_channel,
+        rule_url=payload.rule_url,
+        state=payload.state,
         text=text,
         blocks=blocks,
     )
-    return web.Response()
 
 
-@router.get('/health-check/')
-async def health_check_view() -> web.Response:
-    return web.json_response({'status': 'ok'})
+def create_dedupe_key(filter_channel: str, payload: AlertPayload) -> str:
+    """
+    Returns a hash of the alert content, which doesn't depend on the order of keys and eval matches.
+    """
+    eval_matches = sorted(
+        json.dumps([match.metric, None if match.value is None else float(match.value), match.tags], sort_keys=True)
+        for match in payload.eval_matches
+    )
+    content = [filter_channel, payload.state.value, payload.rule_url, payload.title, payload.message, eval_matches]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+async def deliver_alert(
+    app: web.Application,
+    alert_filter: BaseAlertFilter,
+    filter_channel: str,
+    slack_channel: str,
+    payload: AlertPayload,
+    silenced_matches: int = 0,
+) -> t.Literal['sent', 'queued', 'rejected', 'duplicate']:
+    """
+    Renders and delivers the alert unless the same alert was received recently.
+    """
+    dedupe_cache: BaseDedupeCache | None = app.get('dedupe_cache')
+    if dedupe_cache is None:
+        return await deliver(
+            app, create_alert_message(alert_filter, filter_channel, slack_channel, payload, silenced_matches)
+        )
+
+    dedupe_key = create_dedupe_key(filter_channel, payload)
+    if not await dedupe_cache.add(dedupe_key):
+        return 'duplicate'
+
+    try:
+        status = await deliver(
+            app, create_alert_message(alert_filter, filter_channel, slack_channel, payload, silenced_matches)
+        )
+    except Exception:
+        await dedupe_cache.discard(dedupe_key)
+        raise
+    if status == 'rejected':
+        # grafana retries rejected alerts, the retry must not be taken for a duplicate
+        await dedupe_cache.discard(dedupe_key)
+    return status
+
+
+async def deliver_alert_or_error(
+    app: web.Application,
+    alert_filter: BaseAlertFilter,
+    filter_channel: str,
+    slack_channel: str,
+    payload: AlertPayload,
+    silenced_matches: int,
+) -> t.Literal['sent', 'queued', 'rejected', 'duplicate', 'error']:
+    """
+    Delivers one alert of a batch, a failure is reported as the `error` status and doesn't stop the batch.
+    """
+    try:
+        return await deliver_alert(app, alert_filter, filter_channel, slack_channel, payload, silenced_matches)
+    except Exception:
+        logger.exception('Failed to deliver alert', channel=slack_channel, rule_url=payload.rule_url)
+        return 'error'
+
+
+async def deliver_batch(
+    app: web.Application,
+    alert_filter: BaseAlertFilter,
+    filter_channel: str,
+    slack_channel: str,
+    alerts: list[tuple[int, AlertPayload, int]],
+) -> dict[int, t.Literal['sent', 'queued', 'rejected', 'duplicate', 'error']]:
+    """
+    Delivers (index, alert, silenced matches) of a batch and returns index -> status.
+
+    Alerts of different rules are delivered concurrently, at most `bulk_delivery_concurrency`
+    at once, alerts of the same rule are delivered in order. Slack rate limits a channel,
+    so a large batch may take minutes: alerts which are not delivered in `bulk_delivery_timeout`
+    seconds keep being delivered in background and get the `queued` status.
+    """
+    semaphore = asyncio.Semaphore(app['bulk_delivery_concurrency'])
+    statuses: dict[int, t.Literal['sent', 'queued', 'rejected', 'duplicate', 'error']] = {}
+
+    async def deliver_rule_alerts(rule_alerts: list[tuple[int, AlertPayload, int]]) -> None:
+        for index, payload, silenced_matches in rule_alerts:
+            async with semaphore:
+                statuses[index] = await deliver_alert_or_error(
+                    app, alert_filter, filter_channel, slack_channel, payload, silenced_matches
+                )
+
+    alerts_by_rule: dict[str, list[tuple[int, AlertPayload, int]]] = {}
+    for alert in alerts:
+        alerts_by_rule.setdefault(alert[1].rule_url, []).append(alert)
+    if not alerts_by_rule:
+        return statuses
+
+    tasks: set[asyncio.Task[None]] = app['bulk_delivery_tasks']
+    rule_tasks = [asyncio.create_task(deliver_rule_alerts(rule_alerts)) for rule_alerts in alerts_by_rule.values()]
+    for task in rule_tasks:
+        # the tasks outlive the request if it times out or the client disconnects
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.wait(rule_tasks, timeout=app['bulk_delivery_timeout'])
+    return {index: statuses.get(index, 'queued') for index, _, _ in alerts}
+
+
+def summarize_results(results: list[dict[str, t.Any]]) -> dict[str, int]:
+    summary: dict[str, int] = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return summary
+
+
+async def deliver(app: web.Application, message: AlertMessage) -> t.Literal['sent', 'queued', 'rejected']:
+    delivery_queue: DeliveryQueue | None = app.get('delivery_queue')
+    if delivery_queue is None:
+        try:
+            await app['alert_notifier'].send(message)
+        except Exception as err:
+            outbox: SlackOutbox | None = app.get('slack_outbox')
+            if outbox is None or not is_retryable_error(err):
+                raise
+            await outbox.append(message)
+            return 'queued'
+        return 'sent'
+
+    try:
+        await delivery_queue.put(message)
+    except DeliveryQueueFullError:
+        return 'rejected'
+    return 'queued'
+
+
+async def iter_bulk_payloads(request: web.Request) -> t.AsyncIterator[bytes]:
+    """
+    Yields raw alert payloads of a bulk request.
+
+    Json arrays and ndjson are split into alerts as the body arrives, so the body is
+    never buffered as a whole. The size of the body and of every alert is limited,
+    chunked bodies are not checked by `client_max_size` and admission control.
+    """
+    max_body_size: int = request.app['webhook_max_body_size']
+    max_alert_size: int = request.app['bulk_max_alert_size']
+    splitter: ItemSplitter = NdjsonSplitter() if request.content_type in NDJSON_CONTENT_TYPES else JsonArraySplitter()
+    body_size = 0
+    try:
+        async for chunk in request.content.iter_any():
+            body_size += len(chunk)
+            if body_size > max_body_size:
+                raise web.HTTPRequestEntityTooLarge(
+                    max_size=max_body_size,
+                    actual_size=body_size,
+                    text=f'Request body is too large, max size is {max_body_size} bytes',
+                )
+            for raw_payload in splitter.feed(chunk):
+                yield check_alert_size(raw_payload, max_alert_size)
+            if splitter.pending_size > max_alert_size:
+                raise_alert_too_large(max_alert_size, splitter.pending_size)
+        for raw_payload in splitter.close():
+            yield check_alert_size(raw_payload, max_alert_size)
+    except ValueError as err:
+        raise web.HTTPBadRequest(text=str(err))
+
+
+def check_alert_size(raw_payload: bytes, max_alert_size: int) -> bytes:
+    if len(raw_payload) > max_alert_size:
+        raise_alert_too_large(max_alert_size, len(raw_payload))
+    return raw_payload
+
+
+def raise_alert_too_large(max_alert_size: int, actual_size: int) -> t.NoReturn:
+    raise web.HTTPRequestEntityTooLarge(
+        max_size=max_alert_size,
+        actual_size=actual_size,
+        text=f'Alert is too large, max size is {max_alert_size} bytes',
+    )
@@ -13,6 +13,9 @@ from alert_manager.config import Config
 from alert_manager.entities.alert_metadata import AlertMetadata
 from alert_manager.main import app_factory
 from alert_manager.services.alert_filter_backend import RedisAlertFilter
+from alert_manager.services.silence_backend import InMemorySilenceBackend
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.sender import SlackSender
 from tests.fixtures import *  # noqa: F403
 
 
@@ -63,7 +66,12 @@ async def app_fixture(mocker: MockFixture, config, redis, alert_filter, slack_cl
     app = app_factory(config)
     app['redis'] = redis
     app['alert_filter'] = alert_filter
+    app['silence_backend'] = InMemorySilenceBackend()
     app['slack_client'] = slack_client
+    app['slack_sender'] = SlackSender(slack_client, rate=1, burst=100, max_retries=3)
+    app['stats']['slack_sender'] = app['slack_sender'].stats
+    app['alert_notifier'] = AlertNotifier(app['slack_sender'])
+    app['stats']['alert_notifier'] = app['alert_notifier'].stats
     app['slack_socket_client'] = slack_socket_client
     app['use_channel_id'] = False
     yield app
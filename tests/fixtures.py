@@ -8,6 +8,7 @@ __all__ = [
     'legacy_alert_no_data',
     'legacy_alert_no_data_alerting',
     'legacy_alert_ok',
+    'unified_alert',
 ]
 
 
@@ -29,3 +30,8 @@ def legacy_alert_no_data_alerting(test_dir: Path):
 @pytest.fixture
 def legacy_alert_ok(test_dir: Path):
     return json.loads((test_dir / 'data' / 'legacy_alerts.json').read_text())['ok']
+
+
+@pytest.fixture
+def unified_alert(test_dir: Path):
+    return json.loads((test_dir / 'data' / 'unified_alerts.json').read_text())['firing']
@@ -0,0 +1,80 @@
+import pytest
+from aiohttp import hdrs
+from aiohttp.helpers import BasicAuth
+from aiohttp.test_utils import make_mocked_request
+
+from alert_manager.libs.admission import AdmissionControl
+
+
+class TestAdmissionControl:
+    def test_check__request_admitted(self, admission_control):
+        # act
+        response = admission_control.check(create_request())
+
+        # assert
+        assert response is None
+        assert admission_control.stats == {}
+
+    def test_check__too_many_requests_in_flight__request_shed(self, admission_control):
+        # arrange
+        admission_control.in_flight = 2
+
+        # act
+        response = admission_control.check(create_request())
+
+        # assert
+        assert response.status == 503
+        assert response.headers[hdrs.RETRY_AFTER] == '1'
+        assert admission_control.stats == {'shed': 1}
+
+    def test_check__body_too_large__request_rejected(self, admission_control):
+        # act
+        response = admission_control.check(create_request(headers={hdrs.CONTENT_LENGTH: '101'}))
+
+        # assert
+        assert response.status == 413
+        assert admission_control.stats == {'too_large': 1}
+
+    def test_check__account_rate_limit_exceeded__request_throttled(self, admission_control):
+        # arrange
+        headers = {hdrs.AUTHORIZATION: BasicAuth('grafana', 'password').encode()}
+        admission_control.check(create_request(headers=headers))
+        admission_control.check(create_request(headers=headers))
+
+        # act
+        response = admission_control.check(create_request(headers=headers))
+
+        # assert
+        assert response.status == 429
+        assert response.headers[hdrs.RETRY_AFTER] == '1'
+        assert admission_control.stats == {'throttled': 1}
+
+    @pytest.mark.parametrize(
+        'headers',
+        [
+            {},
+            {hdrs.AUTHORIZATION: BasicAuth('grafana', 'wrong_password').encode()},
+            {hdrs.AUTHORIZATION: 'Bearer token'},
+        ],
+    )
+    def test_check__not_authenticated__request_not_throttled(self, admission_control, headers):
+        # act
+        responses = [admission_control.check(create_request(headers=headers)) for _ in range(3)]
+
+        # assert
+        assert responses == [None, None, None]
+
+    @pytest.fixture(name='admission_control')
+    def admission_control_fixture(self):
+        return AdmissionControl(
+            path_prefix='/webhook/',
+            max_in_flight=2,
+            max_body_size=100,
+            rate=1,
+            burst=2,
+            accounts={'grafana': 'password'},
+        )
+
+
+def create_request(headers: dict[str, str] | None = None):
+    return make_mocked_request('POST', '/webhook/grafana/?channel=alerts', headers=headers or {})
@@ -0,0 +1,40 @@
+import gc
+
+import pytest
+
+from alert_manager.libs.gc_utils import paused_gc
+
+
+def test_paused_gc__enabled_after():
+    # act
+    with paused_gc():
+        paused = not gc.isenabled()
+
+    # assert
+    assert paused
+    assert gc.isenabled()
+
+
+def test_paused_gc__exception__enabled_after():
+    # act
+    with pytest.raises(ValueError), paused_gc():
+        raise ValueError
+
+    # assert
+    assert gc.isenabled()
+
+
+def test_paused_gc__disabled_before__kept_disabled():
+    # arrange
+    gc.disable()
+
+    # act
+    try:
+        with paused_gc():
+            pass
+        enabled = gc.isenabled()
+    finally:
+        gc.enable()
+
+    # assert
+    assert not enabled
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from alert_manager.libs.json_stream import JsonArraySplitter, NdjsonSplitter
+
+ITEMS = [{'title': 'a, [b]', 'tags': {'name': 'x"}'}}, [1, {'a': []}], 'c\\\\', 3]
+
+
+class TestJsonArraySplitter:
+    @pytest.mark.parametrize('chunk_size', [1, 2, 7, 1000])
+    def test_feed__items_split_by_any_chunks(self, chunk_size):
+        # arrange
+        body = json.dumps(ITEMS, indent=2).encode()
+        splitter = JsonArraySplitter()
+
+        # act
+        items = []
+        for i in range(0, len(body), chunk_size):
+            items.extend(splitter.feed(body[i : i + chunk_size]))
+        items.extend(splitter.close())
+
+        # assert
+        assert [json.loads(item) for item in items] == ITEMS
+        assert splitter.pending_size == 0
+
+    def test_feed__empty_array__no_items(self):
+        # arrange
+        splitter = JsonArraySplitter()
+
+        # act
+        items = splitter.feed(b' [ ] \n')
+
+        # assert
+        assert items == []
+        assert splitter.close() == []
+
+    def test_feed__incomplete_item__item_buffered(self):
+        # arrange
+        splitter = JsonArraySplitter()
+
+        # act
+        items = splitter.feed(b'[{"a": 1}, {"b": ')
+
+        # assert
+        assert items == [b'{"a": 1}']
+        assert splitter.pending_size == len(b' {"b": ')
+
+    @pytest.mark.parametrize(
+        'body',
+        [b'{"a": 1}', b'[1,,2]', b'[,1]', b'[1,]', b'[1]]', b'[1] 2', b'[1}'],
+    )
+    def test_feed__invalid_array__error_raised(self, body):
+        # arrange
+        splitter = JsonArraySplitter()
+
+        # act & assert
+        with pytest.raises(ValueError):
+            splitter.feed(body)
+
+    def test_close__array_not_complete__error_raised(self):
+        # arrange
+        splitter = JsonArraySplitter()
+        splitter.feed(b'[1, 2')
+
+        # act & assert
+        with pytest.raises(ValueError, match='Json array is not complete'):
+            splitter.close()
+
+
+class TestNdjsonSplitter:
+    def test_feed__lines_split_by_any_chunks(self):
+        # arrange
+        splitter = NdjsonSplitter()
+
+        # act
+        items = [*splitter.feed(b'{"a": 1}\n\n{"b"'), *splitter.feed(b': 2}\r\n{"c": 3}'), *splitter.close()]
+
+        # assert
+        assert items == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
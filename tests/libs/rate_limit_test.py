@@ -0,0 +1,65 @@
+from freezegun import freeze_time
+
+from alert_manager.libs.rate_limit import TokenBucket
+
+
+def test_reserve__tokens_available__no_delay():
+    # arrange
+    bucket = TokenBucket(rate=1, capacity=2)
+
+    # act
+    delays = [bucket.reserve(), bucket.reserve()]
+
+    # assert
+    assert delays == [0, 0]
+
+
+def test_reserve__bucket_is_empty__delay_returned():
+    # arrange
+    with freeze_time('2023-07-11'):
+        bucket = TokenBucket(rate=2, capacity=1)
+
+        # act
+        delays = [bucket.reserve(), bucket.reserve(), bucket.reserve()]
+
+    # assert
+    assert delays == [0, 0.5, 1]
+
+
+def test_reserve__bucket_refilled_over_time():
+    # arrange
+    with freeze_time('2023-07-11 00:00:00') as frozen_time:
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.reserve()
+        frozen_time.tick(1)
+
+        # act
+        delay = bucket.reserve()
+
+    # assert
+    assert delay == 0
+
+
+def test_try_acquire__bucket_is_empty__false_returned():
+    # arrange
+    with freeze_time('2023-07-11'):
+        bucket = TokenBucket(rate=1, capacity=1)
+
+        # act
+        results = [bucket.try_acquire(), bucket.try_acquire()]
+
+    # assert
+    assert results == [True, False]
+
+
+def test_pause__next_reservation_delayed():
+    # arrange
+    with freeze_time('2023-07-11'):
+        bucket = TokenBucket(rate=1, capacity=5)
+
+        # act
+        bucket.pause(30)
+        delay = bucket.reserve()
+
+    # assert
+    assert delay == 30
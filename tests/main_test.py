@@ -0,0 +1,117 @@
+import aiohttp
+import pytest
+from redis.asyncio import Redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import SentinelConnectionPool
+
+from alert_manager.config import RedisMode
+from alert_manager.main import create_redis, create_slack_session, warm_up_slack_client
+from tests.services.slack.sender_test import create_slack_error
+
+
+async def test_create_slack_session__connector_configured(config):
+    # arrange
+    config.slack_http_pool_size = 10
+    config.slack_http_pool_size_per_host = 5
+
+    # act
+    session = create_slack_session(config)
+
+    # assert
+    try:
+        assert session.connector.limit == 10
+        assert session.connector.limit_per_host == 5
+        assert session.connector.use_dns_cache
+    finally:
+        await session.close()
+
+
+async def test_create_redis__standalone__pool_configured(config):
+    # arrange
+    config.redis_url = 'redis://localhost:6379/1'
+    config.redis_max_connections = 10
+    config.redis_socket_timeout = 2
+
+    # act
+    redis = create_redis(config)
+
+    # assert
+    try:
+        assert isinstance(redis, Redis)
+        assert redis.connection_pool.max_connections == 10
+        assert redis.connection_pool.connection_kwargs['db'] == 1
+        assert redis.connection_pool.connection_kwargs['socket_timeout'] == 2
+    finally:
+        await redis.aclose()
+
+
+async def test_create_redis__cluster__cluster_client_created(config):
+    # arrange
+    config.redis_url = 'redis://localhost:7000'
+    config.redis_mode = RedisMode.cluster
+    config.redis_health_check_interval = 10
+
+    # act
+    redis = create_redis(config)
+
+    # assert
+    try:
+        assert isinstance(redis, RedisCluster)
+        assert redis.connection_kwargs['health_check_interval'] == 10
+    finally:
+        await redis.aclose()
+
+
+async def test_create_redis__sentinel__master_client_created(config):
+    # arrange
+    config.redis_url = 'redis://:password@localhost/2'
+    config.redis_mode = RedisMode.sentinel
+    config.redis_sentinel_nodes = ['sentinel-1:26379', 'sentinel-2:26379']
+
+    # act
+    redis = create_redis(config)
+
+    # assert
+    try:
+        pool = redis.connection_pool
+        assert isinstance(pool, SentinelConnectionPool)
+        assert pool.service_name == 'mymaster'
+        sentinels = [sentinel.connection_pool.connection_kwargs for sentinel in pool.sentinel_manager.sentinels]
+        assert [(kwargs['host'], kwargs['port']) for kwargs in sentinels] == [
+            ('sentinel-1', 26379),
+            ('sentinel-2', 26379),
+        ]
+        assert pool.connection_kwargs['password'] == 'password'  # noqa: S105
+        assert pool.connection_kwargs['db'] == 2
+    finally:
+        await redis.aclose()
+
+
+async def test_create_redis__sentinel_nodes_not_set__error_raised(config):
+    # arrange
+    config.redis_url = 'redis://localhost'
+    config.redis_mode = RedisMode.sentinel
+
+    # act & assert
+    with pytest.raises(ValueError, match='Redis sentinel nodes are not set'):
+        create_redis(config)
+
+
+async def test_warm_up_slack_client__connection_established(slack_client):
+    # act
+    await warm_up_slack_client(slack_client)
+
+    # assert
+    slack_client.auth_test.assert_called_once_with()
+
+
+@pytest.mark.parametrize('error', [aiohttp.ClientConnectionError(), create_slack_error(401, {}), TimeoutError()])
+async def test_warm_up_slack_client__request_failed__startup_not_interrupted(slack_client, error):
+    # arrange
+    slack_client.auth_test.side_effect = error
+
+    # act
+    await warm_up_slack_client(slack_client)
+
+    # assert
+    slack_client.auth_test.assert_called_once_with()
@@ -1,13 +1,18 @@
+import asyncio
+import sqlite3
 from datetime import datetime, timedelta
 
 import pytest
 from freezegun import freeze_time
+from redis.crc import key_slot
 
 from alert_manager.entities.alert_metadata import AlertMetadata
 from alert_manager.services.alert_filter_backend import (
     InMemoryAlertFilter,
     RedisAlertFilter,
+    SqliteAlertFilter,
 )
+from alert_manager.services.alert_metadata_codec import decode_alert_metadata
 
 
 @freeze_time('2023-07-11')
@@ -33,7 +38,7 @@ class TestInMemoryAlertFilter:
         self, in_memory_alert_filter, alert_metadata, alert_key
     ):
         # arrange
-        in_memory_alert_filter._snoozed_alerts[alert_key] = alert_metadata
+        in_memory_alert_filter._add(alert_key, alert_metadata)
 
         # act
         await in_memory_alert_filter.snooze(
@@ -56,7 +61,7 @@ class TestInMemoryAlertFilter:
 
     async def test_is_snoozed(self, in_memory_alert_filter, alert_metadata, alert_key):
         # arrange
-        in_memory_alert_filter._snoozed_alerts[alert_key] = alert_metadata
+        in_memory_alert_filter._add(alert_key, alert_metadata)
 
         # act
         result = await in_memory_alert_filter.is_snoozed(
@@ -79,7 +84,7 @@ class TestInMemoryAlertFilter:
         # arrange
         snoozed_until = (datetime.now() - timedelta(minutes=10)).timestamp()
         alert_metadata.snoozed_until = snoozed_until
-        in_memory_alert_filter._snoozed_alerts[alert_key] = alert_metadata
+        in_memory_alert_filter._add(alert_key, alert_metadata)
 
         # act
         result = await in_memory_alert_filter.is_snoozed(
@@ -89,11 +94,39 @@ class TestInMemoryAlertFilter:
         # assert
         assert result is False
 
+    async def test_is_snoozed_many(self, in_memory_alert_filter, alert_metadata, alert_key):
+        # arrange
+        in_memory_alert_filter._add(alert_key, alert_metadata)
+
+        # act
+        result = await in_memory_alert_filter.is_snoozed_many(
+            channel=alert_metadata.channel, rule_urls=[alert_metadata.rule_url, 'http://grafana/other']
+        )
+
+        # assert
+        assert result == {alert_metadata.rule_url: True, 'http://grafana/other': False}
+
+    async def test_is_snoozed_many__expired_alert__alert_removed(
+        self, in_memory_alert_filter, alert_metadata, alert_key
+    ):
+        # arrange
+        alert_metadata.snoozed_until = (datetime.now() - timedelta(minutes=10)).timestamp()
+        in_memory_alert_filter._add(alert_key, alert_metadata)
+
+        # act
+        result = await in_memory_alert_filter.is_snoozed_many(
+            channel=alert_metadata.channel, rule_urls=[alert_metadata.rule_url, alert_metadata.rule_url]
+        )
+
+        # assert
+        assert result == {alert_metadata.rule_url: False}
+        assert alert_key not in in_memory_alert_filter._snoozed_alerts
+
     async def test_clean_alerts(self, in_memory_alert_filter, alert_metadata, alert_key):
         # arrange
         snoozed_until = (datetime.now() - timedelta(minutes=10)).timestamp()
         alert_metadata.snoozed_until = snoozed_until
-        in_memory_alert_filter._snoozed_alerts[alert_key] = alert_metadata
+        in_memory_alert_filter._add(alert_key, alert_metadata)
 
         # act
         await in_memory_alert_filter._clean_alerts()
@@ -101,9 +134,50 @@ class TestInMemoryAlertFilter:
         # assert
         assert alert_key not in in_memory_alert_filter._snoozed_alerts
 
+    async def test_clean_alerts__alert_re_snoozed__new_snooze_kept(
+        self, in_memory_alert_filter, alert_metadata, alert_key
+    ):
+        # arrange
+        expired_metadata = alert_metadata.model_copy(
+            update={'snoozed_until': (datetime.now() - timedelta(minutes=10)).timestamp()}
+        )
+        in_memory_alert_filter._add(alert_key, expired_metadata)
+        in_memory_alert_filter._add(alert_key, alert_metadata)
+
+        # act
+        await in_memory_alert_filter._clean_alerts()
+
+        # assert
+        assert in_memory_alert_filter._snoozed_alerts == {alert_key: alert_metadata}
+        assert in_memory_alert_filter._expirations == [(alert_metadata.snoozed_until, alert_key)]
+
+    async def test_snooze__storage_is_full__snooze_which_ends_first_dropped(self, in_memory_alert_filter):
+        # arrange
+        in_memory_alert_filter.max_size = 2
+        await in_memory_alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=30)
+        await in_memory_alert_filter.snooze('alerts', 'title', 'http://grafana/2', 'user', minutes=10)
+
+        # act
+        await in_memory_alert_filter.snooze('other', 'title', 'http://grafana/3', 'user', minutes=20)
+
+        # assert
+        assert set(in_memory_alert_filter._snoozed_alerts) == {'alerts;http://grafana/1', 'other;http://grafana/3'}
+        assert set(await in_memory_alert_filter.get_all('alerts')) == {'alerts;http://grafana/1'}
+
+    async def test_get_all__expired_alert__not_returned(self, in_memory_alert_filter, alert_metadata, alert_key):
+        # arrange
+        alert_metadata.snoozed_until = (datetime.now() - timedelta(minutes=10)).timestamp()
+        in_memory_alert_filter._add(alert_key, alert_metadata)
+
+        # act
+        alerts = await in_memory_alert_filter.get_all(channel=alert_metadata.channel)
+
+        # assert
+        assert alerts == {}
+
     async def test_get_all(self, in_memory_alert_filter, alert_metadata, alert_key):
         # arrange
-        in_memory_alert_filter._snoozed_alerts[alert_key] = alert_metadata
+        in_memory_alert_filter._add(alert_key, alert_metadata)
 
         # act
         alerts = await in_memory_alert_filter.get_all(channel=alert_metadata.channel)
@@ -111,11 +185,39 @@ class TestInMemoryAlertFilter:
         # assert
         assert alerts == {alert_key: alert_metadata}
 
+    async def test_is_snoozed__pattern_snoozed(self, in_memory_alert_filter):
+        # arrange
+        await in_memory_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+
+        # act
+        result = await in_memory_alert_filter.is_snoozed_many(
+            'alerts', ['http://grafana/d/a1b2/overview?viewPanel=1', 'http://grafana/d/c3d4/overview']
+        )
+
+        # assert
+        assert result == {
+            'http://grafana/d/a1b2/overview?viewPanel=1': True,
+            'http://grafana/d/c3d4/overview': False,
+        }
+        assert await in_memory_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is True
+        assert await in_memory_alert_filter.is_snoozed('other', 'http://grafana/d/a1b2/overview') is False
+
+    async def test_wake_up__pattern_snooze__alerts_not_snoozed(self, in_memory_alert_filter):
+        # arrange
+        await in_memory_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+
+        # act
+        await in_memory_alert_filter.wake_up('alerts;http://grafana/d/a1b2/*')
+
+        # assert
+        assert await in_memory_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is False
+        assert in_memory_alert_filter._patterns._indexes == {}
+
     async def test_get_all__get_non_existent_alerts__receive_empty_dict(
         self, in_memory_alert_filter, alert_metadata, alert_key
     ):
         # arrange
-        in_memory_alert_filter._snoozed_alerts[alert_key] = alert_metadata
+        in_memory_alert_filter._add(alert_key, alert_metadata)
 
         # act
         alerts = await in_memory_alert_filter.get_all(channel='some_channel')
@@ -142,7 +244,7 @@ class TestRedisAlertFilter:
         # assert
         alerts = await redis.mget(alert_key)
         assert len(alerts) == 1
-        assert AlertMetadata.model_validate_json(alerts[0]) == alert_metadata
+        assert decode_alert_metadata(alerts[0], alert_metadata.channel, alert_metadata.rule_url) == alert_metadata
 
     async def test_snooze__snooze_to_zero_minutes__alert_deleted_from_inner_storage(
         self, redis, redis_alert_filter, alert_metadata, alert_key
@@ -216,6 +318,24 @@ class TestRedisAlertFilter:
         # assert
         assert result is False
 
+    async def test_is_snoozed_many(self, redis_alert_filter, alert_metadata):
+        # arrange
+        await redis_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        result = await redis_alert_filter.is_snoozed_many(
+            channel=alert_metadata.channel, rule_urls=[alert_metadata.rule_url, 'http://grafana/other']
+        )
+
+        # assert
+        assert result == {alert_metadata.rule_url: True, 'http://grafana/other': False}
+
     async def test_get_all(self, redis_alert_filter, alert_metadata, alert_key):
         # arrange
         await redis_alert_filter.snooze(
@@ -250,6 +370,446 @@ class TestRedisAlertFilter:
         # assert
         assert alerts == {}
 
+    async def test_is_snoozed__pattern_snoozed(self, redis_alert_filter):
+        # arrange
+        await redis_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+
+        # act
+        result = await redis_alert_filter.is_snoozed_many(
+            'alerts', ['http://grafana/d/a1b2/overview?viewPanel=1', 'http://grafana/d/c3d4/overview']
+        )
+
+        # assert
+        assert result == {
+            'http://grafana/d/a1b2/overview?viewPanel=1': True,
+            'http://grafana/d/c3d4/overview': False,
+        }
+        assert await redis_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is True
+        assert await redis_alert_filter.is_snoozed('other', 'http://grafana/d/a1b2/overview') is False
+        assert 'alerts;http://grafana/d/a1b2/*' in await redis_alert_filter.get_all('alerts')
+
+    async def test_wake_up__pattern_woken_up_by_other_replica__cached_index_reloaded(self, redis, redis_alert_filter):
+        # arrange
+        await redis_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+        assert await redis_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is True
+
+        # act
+        await RedisAlertFilter(redis).wake_up('alerts;http://grafana/d/a1b2/*')
+
+        # assert
+        assert await redis_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is False
+        assert await redis.zcard('snoozed-patterns:alerts') == 0
+
+    async def test_snooze__alert_added_to_channel_index(self, redis, redis_alert_filter, alert_metadata, alert_key):
+        # act
+        await redis_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # assert
+        score = await redis.zscore(f'snoozed:{alert_metadata.channel}', alert_key)
+        assert score == (datetime.now() + timedelta(minutes=10)).timestamp()
+
+    async def test_wake_up__alert_removed_from_channel_index(
+        self, redis, redis_alert_filter, alert_metadata, alert_key
+    ):
+        # arrange
+        await redis_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        await redis_alert_filter.wake_up(alert_key)
+
+        # assert
+        assert await redis.exists(alert_key) == 0
+        assert await redis.zcard(f'snoozed:{alert_metadata.channel}') == 0
+
+    async def test_get_all__expired_alert__alert_pruned_from_channel_index(
+        self, redis, redis_alert_filter, alert_metadata
+    ):
+        # arrange
+        with freeze_time('2023-07-10'):
+            await redis_alert_filter.snooze(
+                channel=alert_metadata.channel,
+                title=alert_metadata.title,
+                rule_url=alert_metadata.rule_url,
+                snoozed_by=alert_metadata.snoozed_by,
+                minutes=10,
+            )
+
+        # act
+        alerts = await redis_alert_filter.get_all(channel=alert_metadata.channel)
+
+        # assert
+        assert alerts == {}
+        assert await redis.zcard(f'snoozed:{alert_metadata.channel}') == 0
+
+    async def test_get_all__legacy_json_value__alert_decoded(
+        self, redis, redis_alert_filter, alert_metadata, alert_key
+    ):
+        # arrange
+        await redis.set(alert_key, alert_metadata.model_dump_json())
+        await redis.zadd(f'snoozed:{alert_metadata.channel}', {alert_key: alert_metadata.snoozed_until})
+
+        # act
+        alerts = await redis_alert_filter.get_all(channel=alert_metadata.channel)
+
+        # assert
+        assert alerts == {alert_key: alert_metadata}
+
+    async def test_migrate_index__legacy_alerts__alerts_indexed(
+        self, redis, redis_alert_filter, alert_metadata, alert_key
+    ):
+        # arrange
+        await redis.set(alert_key, alert_metadata.model_dump_json())
+        await redis.set(f'thread:{alert_key}', '{"channel": "C1", "ts": "1.1"}')
+        await redis.set('dedupe:key', 1)
+
+        # act
+        indexed = await redis_alert_filter.migrate_index(batch_size=2)
+
+        # assert
+        assert indexed == 1
+        assert await redis_alert_filter.get_all(channel=alert_metadata.channel) == {alert_key: alert_metadata}
+
+    async def test_migrate_index__prefixed_key_with_snooze_value__not_indexed(
+        self, redis, redis_alert_filter, alert_metadata, alert_key
+    ):
+        # arrange
+        await redis.set(f'thread:{alert_key}', alert_metadata.model_dump_json())
+
+        # act
+        indexed = await redis_alert_filter.migrate_index()
+
+        # assert
+        assert indexed == 0
+        assert await redis.keys('snoozed:*') == []
+
+
+@freeze_time('2023-07-11')
+class TestRedisAlertFilterHashTags:
+    async def test_snooze__keys_of_channel_in_one_slot(self, redis, hash_tags_alert_filter, alert_metadata):
+        # act
+        await hash_tags_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # assert
+        redis_keys = sorted(await redis.keys())
+        assert redis_keys == [b'snoozed:{alerts}', b'{alerts};' + alert_metadata.rule_url.encode()]
+        assert len({key_slot(key) for key in redis_keys}) == 1
+
+    async def test_snooze__pattern_keys_in_slot_of_channel(self, redis, hash_tags_alert_filter):
+        # act
+        await hash_tags_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+
+        # assert
+        redis_keys = sorted(await redis.keys())
+        assert redis_keys == [
+            b'snoozed-patterns-version:{alerts}',
+            b'snoozed-patterns:{alerts}',
+            b'snoozed:{alerts}',
+            b'{alerts};http://grafana/d/a1b2/*',
+        ]
+        assert len({key_slot(key) for key in redis_keys}) == 1
+        assert await hash_tags_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is True
+
+    async def test_get_all__untagged_keys_returned(self, hash_tags_alert_filter, alert_metadata, alert_key):
+        # arrange
+        await hash_tags_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        alerts = await hash_tags_alert_filter.get_all(channel=alert_metadata.channel)
+
+        # assert
+        assert alerts == {alert_key: alert_metadata}
+
+    async def test_wake_up(self, redis, hash_tags_alert_filter, alert_metadata, alert_key):
+        # arrange
+        await hash_tags_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        await hash_tags_alert_filter.wake_up(alert_key)
+
+        # assert
+        assert await redis.keys() == []
+        assert await hash_tags_alert_filter.is_snoozed_many(
+            channel=alert_metadata.channel, rule_urls=[alert_metadata.rule_url]
+        ) == {alert_metadata.rule_url: False}
+
+    @pytest.fixture(name='hash_tags_alert_filter')
+    def hash_tags_alert_filter_fixture(self, redis):
+        return RedisAlertFilter(redis, hash_tags=True)
+
+
+@freeze_time('2023-07-11')
+class TestSqliteAlertFilter:
+    async def test_snooze(self, sqlite_alert_filter, alert_metadata, alert_key):
+        # arrange
+        minutes = int((alert_metadata.snoozed_until - datetime.now().timestamp()) / 60)
+
+        # act
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=minutes,
+        )
+
+        # assert
+        assert await sqlite_alert_filter.get_all(channel=alert_metadata.channel) == {alert_key: alert_metadata}
+
+    async def test_snooze__snooze_to_zero_minutes__alert_deleted_from_inner_storage(
+        self, sqlite_alert_filter, alert_metadata
+    ):
+        # arrange
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=0,
+        )
+
+        # assert
+        assert await sqlite_alert_filter.get_all(channel=alert_metadata.channel) == {}
+        assert (
+            await sqlite_alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+            is False
+        )
+
+    async def test_snooze__concurrent_snoozes__all_stored(self, sqlite_alert_filter):
+        # act
+        await asyncio.gather(
+            *(
+                sqlite_alert_filter.snooze('alerts', 'title', f'http://grafana/{i}', 'user', minutes=10)
+                for i in range(10)
+            )
+        )
+
+        # assert
+        assert len(await sqlite_alert_filter.get_all('alerts')) == 10
+
+    async def test_is_snoozed(self, sqlite_alert_filter, alert_metadata):
+        # arrange
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        result = await sqlite_alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+
+        # assert
+        assert result is True
+
+    async def test_is_snoozed__inner_storage_is_empty__return_false(self, sqlite_alert_filter, alert_metadata):
+        # act
+        result = await sqlite_alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+
+        # assert
+        assert result is False
+
+    async def test_is_snoozed__check_expired_alert(self, sqlite_alert_filter, alert_metadata):
+        # arrange
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        with freeze_time(datetime.now() + timedelta(minutes=11)):
+            result = await sqlite_alert_filter.is_snoozed(
+                channel=alert_metadata.channel, rule_url=alert_metadata.rule_url
+            )
+
+        # assert
+        assert result is False
+
+    async def test_is_snoozed_many(self, sqlite_alert_filter, alert_metadata):
+        # arrange
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        result = await sqlite_alert_filter.is_snoozed_many(
+            channel=alert_metadata.channel,
+            rule_urls=[alert_metadata.rule_url, 'http://grafana/other', alert_metadata.rule_url],
+        )
+
+        # assert
+        assert result == {alert_metadata.rule_url: True, 'http://grafana/other': False}
+
+    async def test_is_snoozed_many__more_rule_urls_than_query_params__all_checked(self, sqlite_alert_filter):
+        # arrange
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/2000', 'user', minutes=10)
+        rule_urls = [f'http://grafana/{i}' for i in range(2001)]
+
+        # act
+        result = await sqlite_alert_filter.is_snoozed_many('alerts', rule_urls)
+
+        # assert
+        assert {rule_url for rule_url, snoozed in result.items() if snoozed} == {
+            'http://grafana/1',
+            'http://grafana/2000',
+        }
+        assert len(result) == 2001
+
+    async def test_get_all__get_non_existent_alerts__receive_empty_dict(self, sqlite_alert_filter, alert_metadata):
+        # arrange
+        await sqlite_alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # act
+        alerts = await sqlite_alert_filter.get_all(channel='some_channel')
+
+        # assert
+        assert alerts == {}
+
+    async def test_is_snoozed__pattern_snoozed(self, sqlite_alert_filter):
+        # arrange
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+
+        # act
+        result = await sqlite_alert_filter.is_snoozed_many(
+            'alerts', ['http://grafana/d/a1b2/overview?viewPanel=1', 'http://grafana/d/c3d4/overview']
+        )
+
+        # assert
+        assert result == {
+            'http://grafana/d/a1b2/overview?viewPanel=1': True,
+            'http://grafana/d/c3d4/overview': False,
+        }
+        assert await sqlite_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is True
+        assert await sqlite_alert_filter.is_snoozed('other', 'http://grafana/d/a1b2/overview') is False
+
+    async def test_wake_up__pattern_snooze__alerts_not_snoozed(self, sqlite_alert_filter):
+        # arrange
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+
+        # act
+        await sqlite_alert_filter.wake_up('alerts;http://grafana/d/a1b2/*')
+
+        # assert
+        assert await sqlite_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is False
+
+    async def test_sweep_expired(self, sqlite_alert_filter):
+        # arrange
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/2', 'user', minutes=30)
+
+        # act
+        with freeze_time(datetime.now() + timedelta(minutes=20)):
+            await sqlite_alert_filter._sweep_expired()
+
+        # assert
+        rows = await sqlite_alert_filter._read('SELECT rule_url FROM snoozed_alerts', ())
+        assert rows == [('http://grafana/2',)]
+
+    async def test_sweep_expired__sqlite_error__next_sweep_runs(self, sqlite_alert_filter, mocker):
+        # arrange
+        await sqlite_alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        mocker.patch.object(sqlite_alert_filter, '_write', side_effect=[sqlite3.OperationalError('locked')])
+
+        # act
+        await sqlite_alert_filter._sweep_expired()
+
+        # assert
+        mocker.stopall()
+        with freeze_time(datetime.now() + timedelta(minutes=20)):
+            await sqlite_alert_filter._sweep_expired()
+        assert await sqlite_alert_filter._read('SELECT rule_url FROM snoozed_alerts', ()) == []
+
+    async def test_close__snoozes_kept_after_restart(self, tmp_path, alert_metadata, alert_key):
+        # arrange
+        path = str(tmp_path / 'snoozes.db')
+        alert_filter = SqliteAlertFilter(path)
+        await alert_filter.start()
+        await alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+        await alert_filter.close()
+
+        # act
+        restored_alert_filter = SqliteAlertFilter(path)
+        await restored_alert_filter.start()
+
+        # assert
+        assert await restored_alert_filter.get_all(channel=alert_metadata.channel) == {alert_key: alert_metadata}
+        await restored_alert_filter.close()
+
+    async def test_start__pattern_snoozes_restored(self, tmp_path):
+        # arrange
+        path = str(tmp_path / 'snoozes.db')
+        alert_filter = SqliteAlertFilter(path)
+        await alert_filter.start()
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/d/a1b2/*', 'user', minutes=10)
+        await alert_filter.close()
+
+        # act
+        restored_alert_filter = SqliteAlertFilter(path)
+        await restored_alert_filter.start()
+
+        # assert
+        assert await restored_alert_filter.is_snoozed('alerts', 'http://grafana/d/a1b2/overview') is True
+        await restored_alert_filter.close()
+
 
 @pytest.fixture(name='redis_alert_filter')
 async def redis_alert_filter_fixture(redis):
@@ -263,6 +823,14 @@ async def in_memory_alert_filter_fixture():
     alert_filter._periodic_clean_task.cancel()
 
 
+@pytest.fixture(name='sqlite_alert_filter')
+async def sqlite_alert_filter_fixture(tmp_path):
+    alert_filter = SqliteAlertFilter(str(tmp_path / 'snoozes.db'))
+    await alert_filter.start()
+    yield alert_filter
+    await alert_filter.close()
+
+
 @pytest.fixture(name='alert_key')
 def alert_key_fixture(channel, alert_metadata: AlertMetadata):
     return f'{channel};{alert_metadata.rule_url}'
@@ -0,0 +1,77 @@
+import gc
+
+import pytest
+
+from alert_manager.services.alert_metadata_codec import (
+    VERSION_MSGPACK,
+    VERSION_MSGPACK_ZLIB,
+    decode_alert_metadata,
+    decode_alert_metadata_batch,
+    encode_alert_metadata,
+)
+
+
+@pytest.mark.parametrize(
+    ('title', 'version'),
+    [
+        ('[Alerting] High load on the site', VERSION_MSGPACK),
+        ('[Alerting] High load on the site ' * 10, VERSION_MSGPACK_ZLIB),
+    ],
+)
+def test_encode_alert_metadata__decoded_back(alert_metadata, title, version):
+    # arrange
+    alert_metadata.title = title
+
+    # act
+    raw = encode_alert_metadata(alert_metadata)
+
+    # assert
+    assert raw[:1] == version
+    assert decode_alert_metadata(raw, alert_metadata.channel, alert_metadata.rule_url) == alert_metadata
+
+
+def test_encode_alert_metadata__smaller_than_json(alert_metadata):
+    # act
+    raw = encode_alert_metadata(alert_metadata)
+
+    # assert
+    assert len(raw) < len(alert_metadata.model_dump_json()) / 2
+
+
+def test_decode_alert_metadata__legacy_json_value__decoded(alert_metadata):
+    # act
+    metadata = decode_alert_metadata(alert_metadata.model_dump_json().encode(), 'ignored', 'ignored')
+
+    # assert
+    assert metadata == alert_metadata
+
+
+def test_decode_alert_metadata_batch__mixed_values__decoded_in_order(alert_metadata):
+    # arrange
+    snoozes = [
+        alert_metadata.model_copy(update={'rule_url': 'http://grafana/1'}),
+        alert_metadata.model_copy(update={'rule_url': 'http://grafana/2', 'title': 'Long title ' * 20}),
+        alert_metadata.model_copy(update={'rule_url': 'http://grafana/3'}),
+    ]
+    raw_values = [
+        encode_alert_metadata(snoozes[0]),
+        encode_alert_metadata(snoozes[1]),
+        snoozes[2].model_dump_json().encode(),
+    ]
+
+    # act
+    decoded = decode_alert_metadata_batch(
+        raw_values, alert_metadata.channel, [metadata.rule_url for metadata in snoozes]
+    )
+
+    # assert
+    assert decoded == snoozes
+    assert gc.isenabled()
+
+
+def test_decode_alert_metadata_batch__no_values__empty():
+    # act
+    decoded = decode_alert_metadata_batch([], 'alerts', [])
+
+    # assert
+    assert decoded == []
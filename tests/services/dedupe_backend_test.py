@@ -0,0 +1,84 @@
+import pytest
+from freezegun import freeze_time
+
+from alert_manager.services.dedupe_backend import InMemoryDedupeCache, RedisDedupeCache
+
+
+@freeze_time('2023-07-11')
+class TestInMemoryDedupeCache:
+    async def test_add__new_key__true_returned(self, in_memory_dedupe_cache):
+        # act
+        result = await in_memory_dedupe_cache.add('key')
+
+        # assert
+        assert result is True
+
+    async def test_add__seen_key__false_returned(self, in_memory_dedupe_cache):
+        # arrange
+        await in_memory_dedupe_cache.add('key')
+
+        # act
+        result = await in_memory_dedupe_cache.add('key')
+
+        # assert
+        assert result is False
+
+    async def test_add__expired_key__true_returned(self, in_memory_dedupe_cache):
+        # arrange
+        with freeze_time('2023-07-10'):
+            await in_memory_dedupe_cache.add('key')
+
+        # act
+        result = await in_memory_dedupe_cache.add('key')
+
+        # assert
+        assert result is True
+
+    async def test_add__cache_is_full__oldest_key_evicted(self, in_memory_dedupe_cache):
+        # arrange
+        await in_memory_dedupe_cache.add('key-1')
+        await in_memory_dedupe_cache.add('key-2')
+
+        # act
+        await in_memory_dedupe_cache.add('key-3')
+
+        # assert
+        assert list(in_memory_dedupe_cache._keys) == ['key-2', 'key-3']
+
+    async def test_discard(self, in_memory_dedupe_cache):
+        # arrange
+        await in_memory_dedupe_cache.add('key')
+
+        # act
+        await in_memory_dedupe_cache.discard('key')
+
+        # assert
+        assert await in_memory_dedupe_cache.add('key') is True
+
+    @pytest.fixture(name='in_memory_dedupe_cache')
+    def in_memory_dedupe_cache_fixture(self):
+        return InMemoryDedupeCache(max_size=2, ttl=60)
+
+
+class TestRedisDedupeCache:
+    async def test_add(self, redis, redis_dedupe_cache):
+        # act
+        results = [await redis_dedupe_cache.add('key'), await redis_dedupe_cache.add('key')]
+
+        # assert
+        assert results == [True, False]
+        assert 0 < await redis.ttl('dedupe:key') <= 60
+
+    async def test_discard(self, redis_dedupe_cache):
+        # arrange
+        await redis_dedupe_cache.add('key')
+
+        # act
+        await redis_dedupe_cache.discard('key')
+
+        # assert
+        assert await redis_dedupe_cache.add('key') is True
+
+    @pytest.fixture(name='redis_dedupe_cache')
+    def redis_dedupe_cache_fixture(self, redis):
+        return RedisDedupeCache(redis, ttl=60)
@@ -0,0 +1,97 @@
+import pytest
+from freezegun import freeze_time
+
+from alert_manager.entities.slack_message_ref import SlackMessageRef
+from alert_manager.services.message_index_backend import InMemoryMessageIndex, RedisMessageIndex
+
+
+@freeze_time('2023-07-11')
+class TestInMemoryMessageIndex:
+    async def test_get(self, in_memory_message_index, message_ref):
+        # arrange
+        await in_memory_message_index.set('alerts;rule', message_ref)
+
+        # act
+        result = await in_memory_message_index.get('alerts;rule')
+
+        # assert
+        assert result == message_ref
+
+    async def test_get__expired_entry__none_returned(self, in_memory_message_index, message_ref):
+        # arrange
+        with freeze_time('2023-07-10'):
+            await in_memory_message_index.set('alerts;rule', message_ref)
+
+        # act
+        result = await in_memory_message_index.get('alerts;rule')
+
+        # assert
+        assert result is None
+        assert in_memory_message_index._refs == {}
+
+    async def test_set__index_is_full__least_recently_used_entry_evicted(self, in_memory_message_index, message_ref):
+        # arrange
+        await in_memory_message_index.set('alerts;rule-1', message_ref)
+        await in_memory_message_index.set('alerts;rule-2', message_ref)
+        await in_memory_message_index.get('alerts;rule-1')
+
+        # act
+        await in_memory_message_index.set('alerts;rule-3', message_ref)
+
+        # assert
+        assert list(in_memory_message_index._refs) == ['alerts;rule-1', 'alerts;rule-3']
+
+    async def test_pop(self, in_memory_message_index, message_ref):
+        # arrange
+        await in_memory_message_index.set('alerts;rule', message_ref)
+
+        # act
+        result = await in_memory_message_index.pop('alerts;rule')
+
+        # assert
+        assert result == message_ref
+        assert await in_memory_message_index.get('alerts;rule') is None
+
+    @pytest.fixture(name='in_memory_message_index')
+    def in_memory_message_index_fixture(self):
+        return InMemoryMessageIndex(max_size=2, ttl=3600)
+
+
+class TestRedisMessageIndex:
+    async def test_get(self, redis, redis_message_index, message_ref):
+        # arrange
+        await redis_message_index.set('alerts;rule', message_ref)
+
+        # act
+        result = await redis_message_index.get('alerts;rule')
+
+        # assert
+        assert result == message_ref
+        assert await redis.ttl('thread:alerts;rule') == 3600
+
+    async def test_get__non_existent_entry__none_returned(self, redis_message_index):
+        # act
+        result = await redis_message_index.get('alerts;rule')
+
+        # assert
+        assert result is None
+
+    async def test_pop(self, redis_message_index, message_ref):
+        # arrange
+        await redis_message_index.set('alerts;rule', message_ref)
+
+        # act
+        result = await redis_message_index.pop('alerts;rule')
+
+        # assert
+        assert result == message_ref
+        assert await redis_message_index.get('alerts;rule') is None
+
+    @pytest.fixture(name='redis_message_index')
+    def redis_message_index_fixture(self, redis):
+        return RedisMessageIndex(redis, ttl=3600, prefix='thread')
+
+
+@pytest.fixture(name='message_ref')
+def message_ref_fixture():
+    return SlackMessageRef(channel='C123', ts='1689033600.000100')
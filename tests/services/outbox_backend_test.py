@@ -0,0 +1,171 @@
+import pytest
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.services.outbox_backend import FileOutbox, RedisOutbox
+
+
+class TestFileOutbox:
+    async def test_read__unacknowledged_entries_returned_in_order(self, file_outbox):
+        # arrange
+        await file_outbox.append(create_message('1'))
+        await file_outbox.append(create_message('2'))
+        await file_outbox.append(create_message('3'))
+
+        # act
+        entries = await file_outbox.read(2, timeout=0)
+
+        # assert
+        assert [message.text for _, message in entries] == ['1', '2']
+
+    async def test_read__empty_outbox__waits_for_new_entries(self, file_outbox):
+        # act
+        entries = await file_outbox.read(10, timeout=0.01)
+
+        # assert
+        assert entries == []
+
+    async def test_ack__entry_removed(self, file_outbox):
+        # arrange
+        await file_outbox.append(create_message('1'))
+        await file_outbox.append(create_message('2'))
+        (entry_id, _), _ = await file_outbox.read(10, timeout=0)
+
+        # act
+        await file_outbox.ack(entry_id)
+
+        # assert
+        assert [message.text for _, message in await file_outbox.read(10, timeout=0)] == ['2']
+
+    async def test_append__outbox_is_full__oldest_entry_dropped(self, file_outbox):
+        # act
+        for text in ('1', '2', '3', '4'):
+            await file_outbox.append(create_message(text))
+
+        # assert
+        assert [message.text for _, message in await file_outbox.read(10, timeout=0)] == ['2', '3', '4']
+
+    async def test_init__unacknowledged_entries_restored(self, file_outbox, outbox_path):
+        # arrange
+        await file_outbox.append(create_message('1'))
+        await file_outbox.append(create_message('2'))
+        (entry_id, _), _ = await file_outbox.read(10, timeout=0)
+        await file_outbox.ack(entry_id)
+        await file_outbox.close()
+        with open(outbox_path, 'ab') as file:
+            # the application was killed in the middle of a write
+            file.write(b'+2 {"key":')
+
+        # act
+        restored_outbox = FileOutbox(outbox_path, max_len=3)
+
+        # assert
+        entries = await restored_outbox.read(10, timeout=0)
+        assert [(entry_id, message.text) for entry_id, message in entries] == [('1', '2')]
+        await restored_outbox.append(create_message('3'))
+        assert [entry_id for entry_id, _ in await restored_outbox.read(10, timeout=0)] == ['1', '2']
+        await restored_outbox.close()
+
+    async def test_ack__many_entries_acknowledged__journal_compacted(self, file_outbox, outbox_path):
+        # arrange
+        for text in ('1', '2', '3', '4', '5'):
+            await file_outbox.append(create_message(text))
+
+        # act
+        for entry_id, _ in await file_outbox.read(10, timeout=0):
+            await file_outbox.ack(entry_id)
+
+        # assert
+        with open(outbox_path, 'rb') as file:
+            records = file.read().splitlines()
+        assert [record[:3] for record in records] == [b'+4 ', b'-4']
+
+    @pytest.fixture(name='outbox_path')
+    def outbox_path_fixture(self, tmp_path):
+        return str(tmp_path / 'outbox.log')
+
+    @pytest.fixture(name='file_outbox')
+    async def file_outbox_fixture(self, outbox_path):
+        outbox = FileOutbox(outbox_path, max_len=3)
+        yield outbox
+        await outbox.close()
+
+
+class TestRedisOutbox:
+    async def test_read__new_entries_returned(self, redis_outbox):
+        # arrange
+        await redis_outbox.append(create_message('1'))
+        await redis_outbox.append(create_message('2'))
+
+        # act
+        entries = await redis_outbox.read(10, timeout=0.01)
+
+        # assert
+        assert [message for _, message in entries] == [create_message('1'), create_message('2')]
+
+    async def test_read__unacknowledged_entries_returned_again(self, redis_outbox):
+        # arrange
+        await redis_outbox.append(create_message('1'))
+        await redis_outbox.append(create_message('2'))
+        (entry_id, _), _ = await redis_outbox.read(10, timeout=0.01)
+        await redis_outbox.ack(entry_id)
+
+        # act
+        entries = await redis_outbox.read(10, timeout=0.01)
+
+        # assert
+        assert [message.text for _, message in entries] == ['2']
+
+    async def test_read__entries_of_dead_consumer__entries_claimed(self, redis, redis_outbox):
+        # arrange
+        await redis_outbox.append(create_message('1'))
+        await redis_outbox.read(10, timeout=0.01)
+        other_outbox = RedisOutbox(redis, max_len=3, consumer='other', claim_idle_time=0)
+
+        # act
+        entries = await other_outbox.read(10, timeout=0.01)
+
+        # assert
+        assert [message.text for _, message in entries] == ['1']
+
+    async def test_ack__entry_deleted_from_stream(self, redis, redis_outbox):
+        # arrange
+        await redis_outbox.append(create_message('1'))
+        ((entry_id, _),) = await redis_outbox.read(10, timeout=0.01)
+
+        # act
+        await redis_outbox.ack(entry_id)
+
+        # assert
+        assert await redis.xlen(redis_outbox.stream) == 0
+        assert await redis_outbox.read(10, timeout=0.01) == []
+
+    async def test_read__unacknowledged_entry_trimmed__entry_acknowledged(self, redis, redis_outbox):
+        # arrange
+        await redis_outbox.append(create_message('1'))
+        await redis_outbox.append(create_message('2'))
+        (entry_id, _), _ = await redis_outbox.read(10, timeout=0.01)
+        await redis.xdel(redis_outbox.stream, entry_id)
+
+        # act
+        entries = await redis_outbox.read(10, timeout=0.01)
+
+        # assert
+        assert [message.text for _, message in entries] == ['2']
+        assert len(await redis.xpending_range(redis_outbox.stream, redis_outbox.group, '-', '+', 10)) == 1
+
+    @pytest.fixture(name='redis_outbox')
+    def redis_outbox_fixture(self, redis):
+        return RedisOutbox(redis, max_len=3, consumer='test')
+
+
+def create_message(text: str) -> AlertMessage:
+    return AlertMessage(
+        key='alerts;http://grafana/rule',
+        webhook_channel='alerts',
+        channel='#alerts',
+        rule_url='http://grafana/rule',
+        state=GrafanaAlertState.alerting,
+        text=text,
+        blocks=[{'type': 'section', 'text': {'type': 'mrkdwn', 'text': text}}],
+    )
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+import pytest
+from freezegun import freeze_time
+
+from alert_manager.entities.silence import Silence
+from alert_manager.services.silence_backend import InMemorySilenceBackend, RedisSilenceBackend
+from alert_manager.services.silences import parse_matchers
+
+
+@freeze_time('2023-07-11')
+class TestInMemorySilenceBackend:
+    async def test_add(self, in_memory_silence_backend):
+        # act
+        await in_memory_silence_backend.add(create_silence('1', 'job="api"'))
+
+        # assert
+        index = await in_memory_silence_backend.get_index('alerts')
+        assert index.match({'job': 'api'}, datetime.now().timestamp()).id == '1'
+        assert await in_memory_silence_backend.get_index('other') is None
+
+    async def test_expire__last_silence__channel_dropped(self, in_memory_silence_backend):
+        # arrange
+        await in_memory_silence_backend.add(create_silence('1', 'job="api"'))
+
+        # act
+        await in_memory_silence_backend.expire('alerts', '1')
+
+        # assert
+        assert await in_memory_silence_backend.get_index('alerts') is None
+
+
+@freeze_time('2023-07-11')
+class TestRedisSilenceBackend:
+    async def test_add(self, redis_silence_backend):
+        # act
+        await redis_silence_backend.add(create_silence('1', 'job="api"'))
+
+        # assert
+        index = await redis_silence_backend.get_index('alerts')
+        assert index.match({'job': 'api'}, datetime.now().timestamp()).id == '1'
+        assert await redis_silence_backend.get_index('other') is None
+
+    async def test_get_index__silence_added_by_other_replica__loaded_after_refresh_interval(self, redis):
+        # arrange
+        silence_backend = RedisSilenceBackend(redis, refresh_interval=60)
+        other_silence_backend = RedisSilenceBackend(redis)
+        assert await silence_backend.get_index('alerts') is None
+
+        # act
+        await other_silence_backend.add(create_silence('1', 'job="api"'))
+
+        # assert
+        assert await silence_backend.get_index('alerts') is None
+        silence_backend.refresh_interval = 0
+        assert len(await silence_backend.get_index('alerts')) == 1
+
+    async def test_get_index__silences_not_changed__not_reloaded(self, redis, redis_silence_backend, mocker):
+        # arrange
+        await redis_silence_backend.add(create_silence('1', 'job="api"'))
+        index = await redis_silence_backend.get_index('alerts')
+        hgetall = mocker.spy(redis, 'hgetall')
+
+        # act
+        reloaded_index = await redis_silence_backend.get_index('alerts')
+
+        # assert
+        assert reloaded_index is index
+        hgetall.assert_not_called()
+        assert await redis_silence_backend.get_index('other') is None
+        hgetall.assert_not_called()
+
+    async def test_get_index__expired_silence__removed(self, redis, redis_silence_backend):
+        # arrange
+        await redis_silence_backend.add(create_silence('1', 'job="api"', ends_at=datetime.now().timestamp() - 1))
+        await redis_silence_backend.add(create_silence('2', 'job="web"'))
+
+        # act
+        index = await redis_silence_backend.get_index('alerts')
+
+        # assert
+        assert [silence.id for silence in index.get_all(datetime.now().timestamp())] == ['2']
+        assert await redis.hkeys('silences:alerts') == [b'2']
+
+    async def test_expire(self, redis, redis_silence_backend):
+        # arrange
+        await redis_silence_backend.add(create_silence('1', 'job="api"'))
+
+        # act
+        await redis_silence_backend.expire('alerts', '1')
+
+        # assert
+        assert await redis_silence_backend.get_index('alerts') is None
+        assert await redis.exists('silences:alerts') == 0
+
+
+@pytest.fixture(name='in_memory_silence_backend')
+def in_memory_silence_backend_fixture():
+    return InMemorySilenceBackend()
+
+
+@pytest.fixture(name='redis_silence_backend')
+def redis_silence_backend_fixture(redis):
+    return RedisSilenceBackend(redis, refresh_interval=0)
+
+
+def create_silence(silence_id: str, matchers: str, ends_at: float | None = None) -> Silence:
+    return Silence(
+        id=silence_id,
+        channel='alerts',
+        matchers=parse_matchers(matchers),
+        created_by='user',
+        ends_at=datetime.now().timestamp() + 3600 if ends_at is None else ends_at,
+    )
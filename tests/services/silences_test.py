@@ -0,0 +1,123 @@
+import pytest
+
+from alert_manager.entities.silence import LabelMatcher, Silence
+from alert_manager.enums.silence import MatchOperator
+from alert_manager.services.silences import SilenceIndex, get_series_labels, parse_matchers
+
+NOW = 1000.0
+
+
+class TestParseMatchers:
+    @pytest.mark.parametrize(
+        'text',
+        [
+            'instance=~"db-.*", job="api"',
+            '{instance=~"db-.*",job="api"}',
+            'instance =~ db-.*, job = api',
+            'instance=~\u201cdb-.*\u201d, job=\u201capi\u201d',
+        ],
+    )
+    def test_parse_matchers(self, text):
+        # act
+        matchers = parse_matchers(text)
+
+        # assert
+        assert matchers == [
+            LabelMatcher(name='instance', operator=MatchOperator.regex, value='db-.*'),
+            LabelMatcher(name='job', operator=MatchOperator.equal, value='api'),
+        ]
+
+    def test_parse_matchers__escaped_quote__quote_unescaped(self):
+        # act
+        matchers = parse_matchers(r'name="say \"hi\", bye"')
+
+        # assert
+        assert matchers == [LabelMatcher(name='name', operator=MatchOperator.equal, value='say "hi", bye')]
+
+    @pytest.mark.parametrize(
+        ('text', 'error'),
+        [
+            ('', 'At least one matcher is required'),
+            ('job', 'Invalid matcher: job'),
+            ('job="api" instance="db"', 'Invalid matcher'),
+            ('instance=~"db-("', 'Invalid regular expression'),
+            ('job!="api"', 'At least one matcher must not match an empty value'),
+            ('job=~".*"', 'At least one matcher must not match an empty value'),
+        ],
+    )
+    def test_parse_matchers__invalid_text__error_raised(self, text, error):
+        # act & assert
+        with pytest.raises(ValueError, match=error):
+            parse_matchers(text)
+
+
+class TestSilenceIndex:
+    @pytest.mark.parametrize(
+        ('matchers', 'expected'),
+        [
+            ('job="api"', True),
+            ('job="api", instance=~"db-.*"', True),
+            ('job="api", instance=~"db"', False),
+            ('instance=~"db-.*"', True),
+            ('instance!~"app-.*", job="api"', True),
+            ('job="api", env=""', True),
+            ('job="api", env!=""', False),
+            ('alertname="High load"', True),
+            ('job="web"', False),
+        ],
+    )
+    def test_match(self, matchers, expected):
+        # arrange
+        index = SilenceIndex()
+        index.add(create_silence('1', matchers))
+
+        # act
+        silence = index.match(get_series_labels('High load', {'job': 'api', 'instance': 'db-1'}), NOW)
+
+        # assert
+        assert (silence is not None) is expected
+
+    def test_match__only_silences_of_alert_labels_checked(self):
+        # arrange
+        index = SilenceIndex()
+        for i in range(1000):
+            index.add(create_silence(str(i), f'job="job-{i}"'))
+        index.add(create_silence('instance', 'instance=~"db-.*"'))
+
+        # act & assert
+        assert index.match({'job': 'job-500'}, NOW).id == '500'
+        assert index.match({'job': 'other', 'instance': 'db-1'}, NOW).id == 'instance'
+        assert index.match({'job': 'other'}, NOW) is None
+        assert len(index._by_label) == 1000
+        assert index._by_name == {'instance': {'instance'}}
+        assert index._unanchored == set()
+
+    def test_match__silence_expired__not_matched(self):
+        # arrange
+        index = SilenceIndex()
+        index.add(create_silence('1', 'job="api"', ends_at=NOW + 60))
+
+        # act
+        silence = index.match({'job': 'api'}, NOW + 60)
+
+        # assert
+        assert silence is None
+        assert len(index) == 0
+
+    def test_remove(self):
+        # arrange
+        index = SilenceIndex()
+        index.add(create_silence('1', 'job="api"'))
+
+        # act
+        index.remove('1')
+
+        # assert
+        assert index.match({'job': 'api'}, NOW) is None
+        assert index._by_label == {}
+
+
+def create_silence(silence_id: str, matchers: str, ends_at: float = NOW + 3600) -> Silence:
+    return Silence(
+        id=silence_id, channel='alerts', matchers=parse_matchers(matchers), created_by='user', ends_at=ends_at
+    )
@@ -0,0 +1,212 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from alert_manager.config import DeliveryOverflowPolicy
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.services.slack.delivery import DeliveryQueue
+from alert_manager.services.slack.exceptions import DeliveryQueueFullError
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.outbox import SlackOutbox
+from alert_manager.services.slack.sender import SlackSender
+
+
+class TestDeliveryQueue:
+    async def test_put__message_delivered_by_worker(self, slack_client, notifier):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=10, workers=2, overflow_policy=DeliveryOverflowPolicy.reject)
+        queue.start()
+
+        # act
+        await queue.put(create_message('#alerts', 'msg'))
+        await queue.stop(timeout=1)
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_postMessage.call_args[1] == {'channel': '#alerts', 'text': 'msg', 'blocks': []}
+
+    async def test_put__messages_for_channel_delivered_in_order(self, slack_client, notifier):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=100, workers=4, overflow_policy=DeliveryOverflowPolicy.reject)
+        queue.start()
+
+        # act
+        for i in range(20):
+            await queue.put(create_message('#alerts', str(i)))
+        await queue.stop(timeout=1)
+
+        # assert
+        assert [call[1]['text'] for call in slack_client.chat_postMessage.call_args_list] == [str(i) for i in range(20)]
+
+    async def test_put__queue_is_full_and_reject_policy__error_raised(self, slack_client, notifier):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=1, workers=1, overflow_policy=DeliveryOverflowPolicy.reject)
+        await queue.put(create_message('#alerts', '1'))
+
+        # act & assert
+        with pytest.raises(DeliveryQueueFullError):
+            await queue.put(create_message('#alerts', '2'))
+        assert queue.size == 1
+
+    async def test_put__one_channel__whole_queue_used(self, slack_client, notifier):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=4, workers=4, overflow_policy=DeliveryOverflowPolicy.reject)
+        for i in range(4):
+            await queue.put(create_message('#alerts', str(i)))
+
+        # act & assert
+        with pytest.raises(DeliveryQueueFullError):
+            await queue.put(create_message('#other', '4'))
+        assert queue.size == 4
+
+    async def test_put__queue_is_full_and_drop_oldest_policy__oldest_message_of_busiest_worker_dropped(
+        self, slack_client, notifier
+    ):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=2, workers=2, overflow_policy=DeliveryOverflowPolicy.drop_oldest)
+        await queue.put(create_message('#alerts', '1'))
+        await queue.put(create_message('#alerts', '2'))
+        other_channel = next(
+            f'#other-{i}' for i in range(100) if queue._get_queue(f'#other-{i}') is not queue._get_queue('#alerts')
+        )
+
+        # act
+        await queue.put(create_message(other_channel, '3'))
+        queue.start()
+        await queue.stop(timeout=1)
+
+        # assert
+        assert sorted(call[1]['text'] for call in slack_client.chat_postMessage.call_args_list) == ['2', '3']
+
+    async def test_put__queue_is_full_and_drop_oldest_policy__oldest_message_dropped(self, slack_client, notifier):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=1, workers=1, overflow_policy=DeliveryOverflowPolicy.drop_oldest)
+        await queue.put(create_message('#alerts', '1'))
+
+        # act
+        await queue.put(create_message('#alerts', '2'))
+        queue.start()
+        await queue.stop(timeout=1)
+
+        # assert
+        assert [call[1]['text'] for call in slack_client.chat_postMessage.call_args_list] == ['2']
+
+    async def test_put__queue_is_full_and_block_policy__waits_for_free_slot(self, slack_client, notifier):
+        # arrange
+        queue = DeliveryQueue(notifier, max_size=1, workers=1, overflow_policy=DeliveryOverflowPolicy.block)
+        await queue.put(create_message('#alerts', '1'))
+
+        # act
+        put_task = asyncio.create_task(queue.put(create_message('#alerts', '2')))
+        await asyncio.sleep(0)
+        assert not put_task.done()
+        queue.start()
+        await put_task
+        await queue.stop(timeout=1)
+
+        # assert
+        assert [call[1]['text'] for call in slack_client.chat_postMessage.call_args_list] == ['1', '2']
+
+    async def test_worker__delivery_failed__next_message_delivered(self, slack_client, notifier):
+        # arrange
+        slack_client.chat_postMessage.side_effect = [RuntimeError('slack is down'), None]
+        queue = DeliveryQueue(notifier, max_size=10, workers=1, overflow_policy=DeliveryOverflowPolicy.reject)
+        queue.start()
+
+        # act
+        await queue.put(create_message('#alerts', '1'))
+        await queue.put(create_message('#alerts', '2'))
+        await queue.stop(timeout=1)
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+
+    async def test_worker__slack_unavailable__message_moved_to_outbox(self, slack_client, notifier, outbox):
+        # arrange
+        slack_client.chat_postMessage.side_effect = aiohttp.ClientConnectionError()
+        queue = DeliveryQueue(
+            notifier, max_size=10, workers=1, overflow_policy=DeliveryOverflowPolicy.reject, outbox=outbox
+        )
+        queue.start()
+
+        # act
+        await queue.put(create_message('#alerts', '1'))
+        await queue.stop(timeout=1)
+
+        # assert
+        outbox.append.assert_called_once_with(create_message('#alerts', '1'))
+
+    async def test_worker__not_retryable_error__message_not_moved_to_outbox(self, slack_client, notifier, outbox):
+        # arrange
+        slack_client.chat_postMessage.side_effect = RuntimeError('invalid message')
+        queue = DeliveryQueue(
+            notifier, max_size=10, workers=1, overflow_policy=DeliveryOverflowPolicy.reject, outbox=outbox
+        )
+        queue.start()
+
+        # act
+        await queue.put(create_message('#alerts', '1'))
+        await queue.stop(timeout=1)
+
+        # assert
+        outbox.append.assert_not_called()
+
+    async def test_stop__queue_not_drained__messages_moved_to_outbox(self, notifier, outbox):
+        # arrange
+        queue = DeliveryQueue(
+            notifier, max_size=10, workers=1, overflow_policy=DeliveryOverflowPolicy.reject, outbox=outbox
+        )
+        await queue.put(create_message('#alerts', '1'))
+        await queue.put(create_message('#alerts', '2'))
+
+        # act
+        await queue.stop(timeout=0)
+
+        # assert
+        assert [call.args[0].text for call in outbox.append.call_args_list] == ['1', '2']
+        assert queue.size == 0
+
+    async def test_stop__message_is_being_sent__message_moved_to_outbox(self, slack_client, notifier, outbox):
+        # arrange
+        sent = asyncio.Event()
+
+        async def send_forever(**kwargs):
+            sent.set()
+            await asyncio.Event().wait()
+
+        slack_client.chat_postMessage.side_effect = send_forever
+        queue = DeliveryQueue(
+            notifier, max_size=10, workers=1, overflow_policy=DeliveryOverflowPolicy.reject, outbox=outbox
+        )
+        queue.start()
+        await queue.put(create_message('#alerts', '1'))
+        await sent.wait()
+
+        # act
+        await queue.stop(timeout=0)
+
+        # assert
+        outbox.append.assert_called_once_with(create_message('#alerts', '1'))
+
+    @pytest.fixture(name='outbox')
+    def outbox_fixture(self, mocker):
+        return mocker.MagicMock(SlackOutbox)
+
+
+def create_message(channel: str, text: str) -> AlertMessage:
+    return AlertMessage(
+        key=f'{channel};http://grafana/rule',
+        webhook_channel=channel,
+        channel=channel,
+        rule_url='http://grafana/rule',
+        state=GrafanaAlertState.alerting,
+        text=text,
+        blocks=[],
+    )
+
+
+@pytest.fixture(name='notifier')
+def notifier_fixture(slack_client):
+    return AlertNotifier(SlackSender(slack_client, rate=1, burst=100, max_retries=3))
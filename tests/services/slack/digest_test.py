@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.services.slack.digest import AlertDigest
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.sender import SlackSender
+
+
+class TestAlertDigest:
+    async def test_send__digest_channel__alerts_sent_in_one_message_after_window(self, slack_client, notifier):
+        # act
+        await notifier.send(create_message('digest', 'http://grafana/rule-1', GrafanaAlertState.alerting))
+        await notifier.send(create_message('digest', 'http://grafana/rule-2', GrafanaAlertState.ok))
+        await notifier.send(create_message('digest', 'http://grafana/rule-1', GrafanaAlertState.alerting))
+        assert slack_client.chat_postMessage.call_count == 0
+        await asyncio.sleep(0.02)
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_postMessage.call_args[1] == {
+            'channel': '#digest',
+            'text': 'Alerts digest: 2 alerts',
+            'blocks': [
+                {'type': 'section', 'text': {'type': 'mrkdwn', 'text': '*Alerts digest: 2 alerts*'}},
+                {
+                    'type': 'section',
+                    'text': {
+                        'type': 'mrkdwn',
+                        'text': ':red_circle: *Alerting (1)*\n- <http://grafana/rule-1|title> (x2)',
+                    },
+                },
+                {
+                    'type': 'section',
+                    'text': {
+                        'type': 'mrkdwn',
+                        'text': ':large_green_circle: *OK (1)*\n- <http://grafana/rule-2|title>',
+                    },
+                },
+            ],
+        }
+        assert notifier.stats == {'digested': 3}
+
+    async def test_send__regular_channel__alert_sent_immediately(self, slack_client, notifier):
+        # act
+        await notifier.send(create_message('alerts', 'http://grafana/rule-1', GrafanaAlertState.alerting))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+
+    async def test_flush__slack_error__alerts_sent_with_next_digest(self, slack_client, digest):
+        # arrange
+        slack_client.chat_postMessage.side_effect = [TimeoutError(), None]
+        digest.add(create_message('digest', 'http://grafana/rule-1', GrafanaAlertState.alerting))
+        await asyncio.sleep(0.02)
+        assert slack_client.chat_postMessage.call_count == 1
+
+        # act
+        digest.add(create_message('digest', 'http://grafana/rule-1', GrafanaAlertState.ok))
+        digest.add(create_message('digest', 'http://grafana/rule-2', GrafanaAlertState.alerting))
+        await asyncio.sleep(0.02)
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+        assert slack_client.chat_postMessage.call_args[1]['text'] == 'Alerts digest: 2 alerts'
+        assert slack_client.chat_postMessage.call_args[1]['blocks'][2]['text']['text'] == (
+            ':large_green_circle: *OK (1)*\n- <http://grafana/rule-1|title> (x2)'
+        )
+        assert digest._buffers == {}
+
+    async def test_close__buffered_alerts_flushed(self, slack_client, digest):
+        # arrange
+        digest.windows['digest'] = 3600
+        digest.add(create_message('digest', 'http://grafana/rule-1', GrafanaAlertState.alerting))
+
+        # act
+        await digest.close()
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+
+    @pytest.fixture(name='digest')
+    def digest_fixture(self, slack_client):
+        return AlertDigest(SlackSender(slack_client, rate=1, burst=100, max_retries=3), windows={'digest': 0.01})
+
+    @pytest.fixture(name='notifier')
+    def notifier_fixture(self, slack_client, digest):
+        return AlertNotifier(digest.slack_sender, digest=digest)
+
+
+def create_message(channel: str, rule_url: str, state: GrafanaAlertState) -> AlertMessage:
+    return AlertMessage(
+        key=f'{channel};{rule_url}',
+        webhook_channel=channel,
+        channel=f'#{channel}',
+        rule_url=rule_url,
+        state=state,
+        text='title',
+        blocks=[],
+    )
@@ -1,5 +1,15 @@
+import copy
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.entities.silence import Silence
 from alert_manager.enums.grafana import GrafanaAlertState
-from alert_manager.services.slack.message import MessageBuilder, truncate_block_length
+from alert_manager.services.silences import parse_matchers
+from alert_manager.services.slack.message import (
+    MAX_BLOCKS,
+    SNOOZE_TIME_SELECT_BLOCK,
+    MessageBuilder,
+    truncate_block_length,
+)
 
 
 class TestMessageBuilder:
@@ -18,6 +28,128 @@ class TestMessageBuilder:
         # assert
         assert len(blocks) == 2
 
+    def test_create_alert_message__many_alerts__snooze_block_shared(self, alert_metadata):
+        # act
+        _, first_blocks = MessageBuilder.create_alert_message(
+            state=GrafanaAlertState.alerting,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            message='message',
+            eval_matches=[],
+        )
+        _, second_blocks = MessageBuilder.create_alert_message(
+            state=GrafanaAlertState.alerting,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            message='message',
+            eval_matches=[],
+        )
+
+        # assert
+        assert first_blocks[-1] is second_blocks[-1] is SNOOZE_TIME_SELECT_BLOCK
+
+    def test_add_alert_status_to_message__original_blocks_not_changed(self, alert_metadata):
+        # arrange
+        _, blocks = MessageBuilder.create_alert_message(
+            state=GrafanaAlertState.alerting,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            message='message',
+            eval_matches=[],
+        )
+        original_blocks = copy.deepcopy(blocks)
+        action_data = {'selected_option': {'text': {'type': 'plain_text', 'text': '15 min'}, 'value': '15'}}
+
+        # act
+        new_blocks = MessageBuilder.add_alert_status_to_message(blocks, action_data, snoozed_by='user_nick')
+
+        # assert
+        assert blocks == original_blocks
+        assert new_blocks[:-1] == original_blocks
+        assert new_blocks[-1]['block_id'] == 'alert-status'
+
+    def test_remove_woke_alert__last_alert__original_blocks_not_changed(self, alert_metadata):
+        # arrange
+        _, blocks = MessageBuilder.create_list_snoozed_alerts({'alerts;rule': alert_metadata})
+        original_blocks = copy.deepcopy(blocks)
+
+        # act
+        new_blocks = MessageBuilder.remove_woke_alert(blocks, 'alerts;rule')
+
+        # assert
+        assert blocks == original_blocks
+        assert new_blocks == [
+            {'type': 'section', 'fields': [{'type': 'mrkdwn', 'text': f'*{MessageBuilder.alerts_not_found_text}*'}]}
+        ]
+
+    def test_create_alert_message__silenced_matches__silenced_block_added(self, alert_metadata):
+        # act
+        _, blocks = MessageBuilder.create_alert_message(
+            state=GrafanaAlertState.alerting,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            message='message',
+            eval_matches=[],
+            silenced_matches=2,
+        )
+
+        # assert
+        assert blocks[-2] == {
+            'type': 'context',
+            'block_id': 'silenced-matches',
+            'elements': [{'type': 'mrkdwn', 'text': ':mute: 2 silenced series are not shown'}],
+        }
+        assert blocks[-1] is SNOOZE_TIME_SELECT_BLOCK
+
+    def test_remove_expired_silence__last_silence__not_found_text_shown(self):
+        # arrange
+        silence = Silence(
+            id='silence-id',
+            channel='alerts',
+            matchers=parse_matchers('job="api"'),
+            created_by='user_nick',
+            ends_at=1689033600.123456,
+        )
+        _, blocks = MessageBuilder.create_list_silences([silence])
+        assert blocks[1]['text']['text'] == '- `job="api"`, silenced by @user_nick until 2023-07-11 00:00:00 UTC'
+
+        # act
+        new_blocks = MessageBuilder.remove_expired_silence(blocks, 'alerts;silence-id')
+
+        # assert
+        assert new_blocks == [
+            {'type': 'section', 'fields': [{'type': 'mrkdwn', 'text': f'*{MessageBuilder.silences_not_found_text}*'}]}
+        ]
+
+    def test_create_digest_message__too_many_alerts__slack_limits_respected(self):
+        # arrange
+        alerts = [
+            (
+                AlertMessage(
+                    key=f'alerts;http://grafana/rule-{i}',
+                    webhook_channel='alerts',
+                    channel='#alerts',
+                    rule_url=f'http://grafana/rule-{i}',
+                    state=state,
+                    text=f'[Alerting] rule {i} ' + 'x' * 100,
+                    blocks=[],
+                ),
+                1,
+            )
+            for i in range(3000)
+            for state in (GrafanaAlertState.alerting, GrafanaAlertState.ok)
+        ]
+
+        # act
+        text, blocks = MessageBuilder.create_digest_message(alerts)
+
+        # assert
+        assert text == 'Alerts digest: 6000 alerts'
+        assert len(blocks) == MAX_BLOCKS
+        assert all(len(block['text']['text']) <= 3000 for block in blocks if block['type'] == 'section')
+        assert blocks[-1]['elements'][0]['text'].startswith('...and ')
+        assert blocks[-1]['elements'][0]['text'].endswith(' more alerts')
+
 
 def test_truncate_block_length__non_section():
     # arrange
@@ -0,0 +1,188 @@
+import pytest
+from freezegun import freeze_time
+
+from alert_manager.entities.alert_message import AlertMessage
+from alert_manager.enums.grafana import GrafanaAlertState
+from alert_manager.services.message_index_backend import InMemoryMessageIndex
+from alert_manager.services.slack.coalescer import AlertCoalescer
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.sender import SlackSender
+
+
+@freeze_time('2023-07-11')
+class TestAlertNotifierCoalescing:
+    async def test_send__first_alert__message_posted(self, slack_client, notifier):
+        # act
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_update.call_count == 0
+
+    async def test_send__repeated_alert_within_window__message_updated(self, slack_client, notifier, message_blocks):
+        # act
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_update.call_count == 2
+        assert slack_client.chat_update.call_args[1] == {
+            'channel': 'C123',
+            'ts': '1689033600.000100',
+            'text': 'text',
+            'blocks': [
+                message_blocks[0],
+                {
+                    'type': 'context',
+                    'block_id': 'repeat-counter',
+                    'elements': [
+                        {'type': 'mrkdwn', 'text': ':repeat: Received 3 times, last at 11 July 2023 00:00:00 UTC'}
+                    ],
+                },
+                message_blocks[1],
+            ],
+        }
+        assert notifier.stats == {'posted': 1, 'coalesced': 2}
+
+    async def test_send__repeated_alert_after_window__message_posted(self, slack_client, notifier):
+        # act
+        with freeze_time('2023-07-11 00:00:00') as frozen_time:
+            await notifier.send(create_message(GrafanaAlertState.alerting))
+            frozen_time.tick(61)
+            await notifier.send(create_message(GrafanaAlertState.alerting))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+        assert slack_client.chat_update.call_count == 0
+
+    async def test_send__alert_state_changed__message_posted(self, slack_client, notifier):
+        # act
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+        await notifier.send(create_message(GrafanaAlertState.ok))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+        assert slack_client.chat_update.call_count == 0
+
+    @pytest.fixture(name='notifier')
+    def notifier_fixture(self, slack_client):
+        slack_client.chat_postMessage.return_value = {'channel': 'C123', 'ts': '1689033600.000100'}
+        return AlertNotifier(
+            SlackSender(slack_client, rate=1, burst=100, max_retries=3),
+            coalescer=AlertCoalescer(window=60),
+        )
+
+
+class TestAlertNotifierThreading:
+    async def test_send__first_firing__message_posted_to_channel(self, slack_client, notifier):
+        # act
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+
+        # assert
+        assert slack_client.chat_postMessage.call_args[1]['channel'] == '#alerts'
+        assert 'thread_ts' not in slack_client.chat_postMessage.call_args[1]
+
+    async def test_send__repeated_firing__message_posted_to_thread(self, slack_client, notifier):
+        # arrange
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+
+        # act
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+        assert slack_client.chat_postMessage.call_args[1]['channel'] == 'C123'
+        assert slack_client.chat_postMessage.call_args[1]['thread_ts'] == '1689033600.000100'
+        assert notifier.stats == {'posted': 1, 'threaded': 1}
+
+    @pytest.fixture(name='notifier')
+    def notifier_fixture(self, slack_client):
+        slack_client.chat_postMessage.return_value = {'channel': 'C123', 'ts': '1689033600.000100'}
+        return AlertNotifier(
+            SlackSender(slack_client, rate=1, burst=100, max_retries=3),
+            thread_index=InMemoryMessageIndex(max_size=10, ttl=3600),
+        )
+
+
+@freeze_time('2023-07-11')
+class TestAlertNotifierResolveInPlace:
+    async def test_send__ok_alert_for_open_alert__message_updated_to_resolved(self, slack_client, notifier):
+        # arrange
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+        ok_message = create_message(GrafanaAlertState.ok)
+        ok_message.blocks = ok_message.blocks[:1]
+
+        # act
+        await notifier.send(ok_message)
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_update.call_args[1] == {
+            'channel': 'C123',
+            'ts': '1689033600.000100',
+            'text': 'text',
+            'blocks': [
+                ok_message.blocks[0],
+                {
+                    'type': 'context',
+                    'block_id': 'resolved-status',
+                    'elements': [
+                        {'type': 'mrkdwn', 'text': ':white_check_mark: Resolved at 11 July 2023 00:00:00 UTC'}
+                    ],
+                },
+            ],
+        }
+        assert notifier.stats == {'posted': 1, 'resolved': 1}
+
+    async def test_send__ok_alert_without_open_alert__message_posted(self, slack_client, notifier):
+        # act
+        await notifier.send(create_message(GrafanaAlertState.ok))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_update.call_count == 0
+
+    async def test_send__second_ok_alert__message_posted(self, slack_client, notifier):
+        # arrange
+        await notifier.send(create_message(GrafanaAlertState.alerting))
+        await notifier.send(create_message(GrafanaAlertState.ok))
+
+        # act
+        await notifier.send(create_message(GrafanaAlertState.ok))
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+        assert slack_client.chat_update.call_count == 1
+
+    @pytest.fixture(name='notifier')
+    def notifier_fixture(self, slack_client):
+        slack_client.chat_postMessage.return_value = {'channel': 'C123', 'ts': '1689033600.000100'}
+        return AlertNotifier(
+            SlackSender(slack_client, rate=1, burst=100, max_retries=3),
+            open_alerts=InMemoryMessageIndex(max_size=10, ttl=3600),
+        )
+
+
+@pytest.fixture(name='message_blocks')
+def message_blocks_fixture():
+    return [
+        {'type': 'section', 'block_id': 'title|http://grafana/rule', 'text': {'type': 'mrkdwn', 'text': 'title'}},
+        {'type': 'actions', 'elements': []},
+    ]
+
+
+def create_message(state: GrafanaAlertState) -> AlertMessage:
+    return AlertMessage(
+        key='alerts;http://grafana/rule',
+        webhook_channel='alerts',
+        channel='#alerts',
+        rule_url='http://grafana/rule',
+        state=state,
+        text='text',
+        blocks=[
+            {'type': 'section', 'block_id': 'title|http://grafana/rule', 'text': {'type': 'mrkdwn', 'text': 'title'}},
+            {'type': 'actions', 'elements': []},
+        ],
+    )
@@ -0,0 +1,84 @@
+import aiohttp
+import pytest
+
+from alert_manager.services.outbox_backend import FileOutbox
+from alert_manager.services.slack.notifier import AlertNotifier
+from alert_manager.services.slack.outbox import SlackOutbox
+from alert_manager.services.slack.sender import SlackSender
+from tests.services.outbox_backend_test import create_message
+from tests.services.slack.sender_test import create_slack_error
+
+
+class TestSlackOutbox:
+    async def test_deliver_batch__messages_delivered_and_acknowledged(self, slack_client, slack_outbox):
+        # arrange
+        await slack_outbox.append(create_message('1'))
+        await slack_outbox.append(create_message('2'))
+
+        # act
+        delivered = await slack_outbox._deliver_batch()
+
+        # assert
+        assert delivered
+        assert [call.kwargs['text'] for call in slack_client.chat_postMessage.call_args_list] == ['1', '2']
+        assert await slack_outbox.outbox.read(10, timeout=0) == []
+        assert slack_outbox.stats == {'appended': 2, 'delivered': 2}
+
+    @pytest.mark.parametrize('error', [aiohttp.ClientConnectionError(), create_slack_error(503, {})])
+    async def test_deliver_batch__slack_unavailable__delivery_postponed(self, slack_client, slack_outbox, error):
+        # arrange
+        await slack_outbox.append(create_message('1'))
+        await slack_outbox.append(create_message('2'))
+        slack_client.chat_postMessage.side_effect = [{'channel': 'C1', 'ts': '1'}, error]
+
+        # act
+        delivered = await slack_outbox._deliver_batch()
+
+        # assert
+        assert not delivered
+        assert [message.text for _, message in await slack_outbox.outbox.read(10, timeout=0)] == ['2']
+
+    async def test_deliver_batch__not_retryable_error__message_dropped(self, slack_client, slack_outbox):
+        # arrange
+        await slack_outbox.append(create_message('1'))
+        await slack_outbox.append(create_message('2'))
+        slack_client.chat_postMessage.side_effect = [create_slack_error(400, {}), {'channel': 'C1', 'ts': '1'}]
+
+        # act
+        delivered = await slack_outbox._deliver_batch()
+
+        # assert
+        assert delivered
+        assert await slack_outbox.outbox.read(10, timeout=0) == []
+        assert slack_outbox.stats['dropped'] == 1
+        assert slack_outbox.stats['delivered'] == 1
+
+    async def test_run__slack_unavailable__retried_with_backoff(self, mocker, slack_client, slack_outbox):
+        # arrange
+        await slack_outbox.append(create_message('1'))
+        slack_client.chat_postMessage.side_effect = aiohttp.ClientConnectionError()
+        mock_sleep = mocker.patch(
+            'alert_manager.services.slack.outbox.asyncio.sleep', side_effect=[None, None, None, RuntimeError('stop')]
+        )
+
+        # act
+        with pytest.raises(RuntimeError, match='stop'):
+            await slack_outbox._run()
+
+        # assert
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2, 4, 4]
+        assert slack_client.chat_postMessage.call_count == 4
+
+    @pytest.fixture(name='slack_outbox')
+    async def slack_outbox_fixture(self, tmp_path, slack_client):
+        notifier = AlertNotifier(SlackSender(slack_client, rate=1, burst=100, max_retries=0))
+        outbox = SlackOutbox(
+            FileOutbox(str(tmp_path / 'outbox.log'), max_len=10),
+            notifier,
+            batch_size=10,
+            min_backoff=1,
+            max_backoff=4,
+            read_timeout=0,
+        )
+        yield outbox
+        await outbox.stop()
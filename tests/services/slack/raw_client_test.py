@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from aiohttp import web
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from alert_manager.services.slack.raw_client import MAX_CONTENT_SIZE, SlackRawClient, encode_content
+from alert_manager.services.slack.sender import SlackSender
+
+
+class TestSlackRawClient:
+    async def test_api_call__content_with_fields_posted(self, raw_client, slack_api):
+        # arrange
+        content = encode_content('text', [{'type': 'section', 'text': {'type': 'mrkdwn', 'text': 'text'}}])
+
+        # act
+        response = await raw_client.api_call('chat.postMessage', content=content, channel='#alerts', thread_ts='1')
+
+        # assert
+        assert response['ts'] == '1.0001'
+        request = slack_api['requests'][0]
+        assert request['authorization'] == 'Bearer slack_token'
+        assert json.loads(request['body']) == {
+            'channel': '#alerts',
+            'thread_ts': '1',
+            'text': 'text',
+            'blocks': [{'type': 'section', 'text': {'type': 'mrkdwn', 'text': 'text'}}],
+        }
+
+    async def test_api_call__rate_limited__slack_api_error_raised(self, raw_client, slack_api):
+        # arrange
+        slack_api['responses'].append(
+            web.json_response({'ok': False, 'error': 'ratelimited'}, status=429, headers={'Retry-After': '3'})
+        )
+
+        # act & assert
+        with pytest.raises(SlackApiError) as exc_info:
+            await raw_client.api_call('chat.postMessage', content=encode_content('text', []), channel='#alerts')
+        assert exc_info.value.response.status_code == 429
+        assert exc_info.value.response.headers['Retry-After'] == '3'
+
+    async def test_post_message__rate_limited__retried_with_same_content(self, mocker, raw_client, slack_api):
+        # arrange
+        mocker.patch('alert_manager.services.slack.sender.asyncio.sleep')
+        sender = SlackSender(raw_client.slack_client, rate=1, burst=2, max_retries=2, raw_client=raw_client)
+        slack_api['responses'].append(
+            web.json_response({'ok': False, 'error': 'ratelimited'}, status=429, headers={'Retry-After': '1'})
+        )
+
+        # act
+        response = await sender.post_message(channel='#alerts', **sender.encode('text', []))
+
+        # assert
+        assert response['ts'] == '1.0001'
+        assert sender.stats['retries'] == 1
+        assert [request['body'] for request in slack_api['requests']] == [
+            b'{"channel":"#alerts","text":"text","blocks":[]}'
+        ] * 2
+
+    def test_encode_content__too_large__blocks_dropped(self):
+        # arrange
+        blocks = [{'type': 'section', 'text': {'type': 'mrkdwn', 'text': 'x' * 3000}} for _ in range(50)]
+
+        # act
+        content = encode_content('text', blocks)
+
+        # assert
+        assert len(content) <= MAX_CONTENT_SIZE
+        assert json.loads(content) == {'text': 'text'}
+
+    @pytest.fixture(name='slack_api')
+    async def slack_api_fixture(self, aiohttp_server):
+        state: dict[str, list] = {'requests': [], 'responses': []}
+
+        async def handler(request: web.Request) -> web.Response:
+            state['requests'].append({'authorization': request.headers['Authorization'], 'body': await request.read()})
+            if state['responses']:
+                return state['responses'].pop(0)
+            return web.json_response({'ok': True, 'channel': 'C1', 'ts': '1.0001'})
+
+        app = web.Application()
+        app.router.add_post('/api/{method}', handler)
+        server = await aiohttp_server(app)
+        state['url'] = str(server.make_url('/api/'))
+        return state
+
+    @pytest.fixture(name='raw_client')
+    async def raw_client_fixture(self, slack_api):
+        client = SlackRawClient(AsyncWebClient(token='slack_token', base_url=slack_api['url']))  # noqa: S106
+        yield client
+        await client.close()
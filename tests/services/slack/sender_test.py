@@ -0,0 +1,113 @@
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from alert_manager.services.slack.sender import SlackSender
+
+
+class TestSlackSender:
+    async def test_post_message__message_sent(self, slack_client, sender):
+        # act
+        await sender.post_message(channel='#alerts', text='text', blocks=[])
+
+        # assert
+        slack_client.chat_postMessage.assert_called_once_with(channel='#alerts', text='text', blocks=[])
+        assert sender.stats == {}
+
+    async def test_post_message__burst_exceeded__calls_throttled(self, slack_client, sender, mock_sleep):
+        # act
+        for _ in range(3):
+            await sender.post_message(channel='#alerts', text='text', blocks=[])
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 3
+        assert sender.stats['throttled'] == 1
+        assert mock_sleep.call_count == 1
+
+    async def test_post_message__channels_throttled_independently(self, slack_client, sender, mock_sleep):
+        # act
+        for channel in ('#alerts-1', '#alerts-2', '#alerts-3'):
+            await sender.post_message(channel=channel, text='text', blocks=[])
+            await sender.update_message(channel=channel, ts='1', text='text', blocks=[])
+
+        # assert
+        assert sender.stats['throttled'] == 0
+        mock_sleep.assert_not_called()
+
+    async def test_update_message__interactive__not_throttled_by_alerts(self, slack_client, sender, mock_sleep):
+        # arrange
+        for _ in range(5):
+            await sender.update_message(channel='#alerts', ts='1', text='text', blocks=[])
+        mock_sleep.reset_mock()
+
+        # act
+        await sender.update_message(channel='#alerts', ts='1', text='text', blocks=[], interactive=True)
+
+        # assert
+        mock_sleep.assert_not_called()
+        slack_client.chat_update.assert_called_with(channel='#alerts', ts='1', text='text', blocks=[])
+
+    async def test_post_message__max_buckets_exceeded__least_recently_used_bucket_dropped(self, slack_client):
+        # arrange
+        sender = SlackSender(slack_client, rate=1, burst=2, max_retries=2, max_buckets=2)
+        await sender.post_message(channel='#alerts-1', text='text', blocks=[])
+        await sender.post_message(channel='#alerts-2', text='text', blocks=[])
+        await sender.post_message(channel='#alerts-1', text='text', blocks=[])
+
+        # act
+        await sender.post_message(channel='#alerts-3', text='text', blocks=[])
+
+        # assert
+        assert [channel for _, channel, _ in sender._buckets] == ['#alerts-1', '#alerts-3']
+
+    async def test_post_message__rate_limited__retried_after_delay(self, slack_client, sender, mock_sleep):
+        # arrange
+        slack_client.chat_postMessage.side_effect = [create_slack_error(429, {'Retry-After': '30'}), None]
+
+        # act
+        await sender.post_message(channel='#alerts', text='text', blocks=[])
+
+        # assert
+        assert slack_client.chat_postMessage.call_count == 2
+        assert sender.stats['rate_limited'] == 1
+        assert sender.stats['retries'] == 1
+        assert mock_sleep.call_args[0][0] == pytest.approx(30, abs=0.1)
+
+    async def test_post_message__rate_limited_too_many_times__error_raised(self, slack_client, sender, mock_sleep):
+        # arrange
+        slack_client.chat_postMessage.side_effect = create_slack_error(429, {'Retry-After': '1'})
+
+        # act & assert
+        with pytest.raises(SlackApiError):
+            await sender.post_message(channel='#alerts', text='text', blocks=[])
+        assert slack_client.chat_postMessage.call_count == 3
+
+    async def test_post_message__other_error__error_raised_without_retry(self, slack_client, sender):
+        # arrange
+        slack_client.chat_postMessage.side_effect = create_slack_error(400, {})
+
+        # act & assert
+        with pytest.raises(SlackApiError):
+            await sender.post_message(channel='#alerts', text='text', blocks=[])
+        assert slack_client.chat_postMessage.call_count == 1
+
+    @pytest.fixture(name='sender')
+    def sender_fixture(self, slack_client):
+        return SlackSender(slack_client, rate=1, burst=2, max_retries=2)
+
+    @pytest.fixture(name='mock_sleep')
+    def mock_sleep_fixture(self, mocker):
+        return mocker.patch('alert_manager.services.slack.sender.asyncio.sleep')
+
+
+def create_slack_error(status_code: int, headers: dict[str, str]) -> SlackApiError:
+    response = AsyncSlackResponse(
+        client=None,
+        http_verb='POST',
+        api_url='https://slack.com/api/chat.postMessage',
+        req_args={},
+        data={'ok': False, 'error': 'ratelimited'},
+        headers=headers,
+        status_code=status_code,
+    )
+    return SlackApiError(message='error', response=response)
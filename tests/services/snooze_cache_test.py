@@ -0,0 +1,255 @@
+import asyncio
+
+import pytest
+from freezegun import freeze_time
+from redis.asyncio import Redis
+
+from alert_manager.services.alert_filter_backend import RedisAlertFilter
+from alert_manager.services.snooze_cache import SnoozeNearCache
+
+
+@freeze_time('2023-07-11')
+class TestSnoozeNearCache:
+    async def test_get__cached_result_returned(self, subscribed_near_cache):
+        # arrange
+        subscribed_near_cache.put('alerts;rule', 600, subscribed_near_cache.generation)
+        subscribed_near_cache.put('alerts;other', None, subscribed_near_cache.generation)
+
+        # act
+        results = [subscribed_near_cache.get('alerts;rule'), subscribed_near_cache.get('alerts;other')]
+
+        # assert
+        assert results == [True, False]
+        assert subscribed_near_cache.stats == {'hits': 2}
+
+    async def test_get__snooze_ended__result_expired(self, subscribed_near_cache):
+        # arrange
+        with freeze_time('2023-07-10 23:59:00'):
+            subscribed_near_cache.put('alerts;rule', 30, subscribed_near_cache.generation)
+
+        # act
+        result = subscribed_near_cache.get('alerts;rule')
+
+        # assert
+        assert result is None
+
+    async def test_get__not_subscribed__cache_bypassed(self, near_cache):
+        # arrange
+        near_cache.put('alerts;rule', 600, near_cache.generation)
+
+        # act
+        result = near_cache.get('alerts;rule')
+
+        # assert
+        assert result is None
+
+    async def test_put__invalidated_while_reading__result_not_cached(self, subscribed_near_cache):
+        # arrange
+        generation = subscribed_near_cache.generation
+        subscribed_near_cache.invalidate('alerts;rule')
+
+        # act
+        subscribed_near_cache.put('alerts;rule', None, generation)
+
+        # assert
+        assert subscribed_near_cache.get('alerts;rule') is None
+
+    async def test_invalidate__pattern_snooze_changed__all_results_dropped(self, subscribed_near_cache):
+        # arrange
+        subscribed_near_cache.put('alerts;http://grafana/d/a1b2/overview', None, subscribed_near_cache.generation)
+        subscribed_near_cache.put('other;http://grafana/d/c3d4/overview', None, subscribed_near_cache.generation)
+
+        # act
+        subscribed_near_cache.invalidate('alerts;http://grafana/d/a1b2/*')
+
+        # assert
+        assert subscribed_near_cache.get('alerts;http://grafana/d/a1b2/overview') is None
+        assert subscribed_near_cache.get('other;http://grafana/d/c3d4/overview') is None
+
+    async def test_put__cache_is_full__oldest_result_evicted(self, subscribed_near_cache):
+        # act
+        for key in ('alerts;1', 'alerts;2', 'alerts;3'):
+            subscribed_near_cache.put(key, None, subscribed_near_cache.generation)
+
+        # assert
+        assert [subscribed_near_cache.get(key) for key in ('alerts;1', 'alerts;2', 'alerts;3')] == [None, False, False]
+
+    @pytest.fixture(name='near_cache')
+    def near_cache_fixture(self, redis):
+        return SnoozeNearCache(redis, max_size=2, ttl=3600)
+
+    @pytest.fixture(name='subscribed_near_cache')
+    def subscribed_near_cache_fixture(self, near_cache):
+        near_cache._subscribed = True
+        return near_cache
+
+
+class TestRedisAlertFilterNearCache:
+    async def test_is_snoozed__result_cached(self, redis, alert_filter, near_cache, alert_metadata):
+        # arrange
+        await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+        # the snooze is created bypassing the filter, so the cached result is stale
+        await redis.set(f'{alert_metadata.channel};{alert_metadata.rule_url}', alert_metadata.model_dump_json())
+
+        # act
+        result = await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+
+        # assert
+        assert result is False
+        assert near_cache.stats == {'misses': 1, 'hits': 1}
+
+    async def test_snooze__result_of_other_replica_invalidated(self, redis, alert_filter, near_cache, alert_metadata):
+        # arrange
+        await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+        other_replica_filter = RedisAlertFilter(redis, near_cache=SnoozeNearCache(redis, max_size=10, ttl=3600))
+
+        # act
+        await other_replica_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # assert
+        await wait_for(lambda: near_cache.generation > 0)
+        assert await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url) is True
+
+    async def test_snooze__pattern_snoozed_by_other_replica__cached_result_invalidated(
+        self, redis, alert_filter, near_cache, alert_metadata
+    ):
+        # arrange
+        await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url='http://grafana/d/a1b2/overview')
+        other_replica_filter = RedisAlertFilter(redis, near_cache=SnoozeNearCache(redis, max_size=10, ttl=3600))
+
+        # act
+        await other_replica_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url='http://grafana/d/a1b2/*',
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+
+        # assert
+        await wait_for(lambda: near_cache.generation > 0)
+        assert (
+            await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url='http://grafana/d/a1b2/overview')
+            is True
+        )
+
+    async def test_is_snoozed_many__cached_and_missed_results_merged(self, alert_filter, near_cache, alert_metadata):
+        # arrange
+        await alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by=alert_metadata.snoozed_by,
+            minutes=10,
+        )
+        # the own invalidation message is received too
+        await wait_for(lambda: near_cache.generation > 1)
+        await alert_filter.is_snoozed(channel=alert_metadata.channel, rule_url=alert_metadata.rule_url)
+
+        # act
+        result = await alert_filter.is_snoozed_many(
+            channel=alert_metadata.channel, rule_urls=[alert_metadata.rule_url, 'http://grafana/other']
+        )
+
+        # assert
+        assert result == {alert_metadata.rule_url: True, 'http://grafana/other': False}
+        assert near_cache.stats == {'misses': 2, 'hits': 1}
+
+    @pytest.fixture(name='near_cache')
+    async def near_cache_fixture(self, redis):
+        near_cache = SnoozeNearCache(redis, max_size=10, ttl=3600)
+        near_cache.start()
+        await wait_for(lambda: near_cache._subscribed)
+        yield near_cache
+        await near_cache.close()
+
+    @pytest.fixture(name='alert_filter')
+    def alert_filter_fixture(self, redis, near_cache):
+        return RedisAlertFilter(redis, near_cache=near_cache)
+
+
+class TestSnoozeNearCacheSubscription:
+    async def test_listen__subscription_idle_longer_than_socket_timeout__cache_kept(self, pubsub_server):
+        # arrange
+        redis = Redis(host='127.0.0.1', port=pubsub_server.port, socket_timeout=0.2)
+        near_cache = SnoozeNearCache(redis, max_size=10, ttl=3600, poll_interval=0.05)
+        near_cache.start()
+        await wait_for(lambda: near_cache._subscribed)
+        near_cache.put('alerts;rule', None, near_cache.generation)
+        near_cache.put('alerts;other', None, near_cache.generation)
+
+        # act
+        await asyncio.sleep(0.5)
+        pubsub_server.publish('snooze-invalidations', 'alerts;rule')
+        await wait_for(lambda: near_cache.get('alerts;rule') is None)
+
+        # assert
+        assert near_cache._subscribed is True
+        assert near_cache.get('alerts;other') is False
+        await near_cache.close()
+        await redis.aclose()
+
+    @pytest.fixture(name='pubsub_server')
+    async def pubsub_server_fixture(self):
+        server = PubSubServer()
+        await server.start()
+        yield server
+        await server.close()
+
+
+class PubSubServer:
+    """
+    Redis server which confirms subscriptions and sends nothing else until a message is published.
+    """
+
+    def __init__(self) -> None:
+        self.port = 0
+        self._server: asyncio.Server | None = None
+        self._writers: list[asyncio.StreamWriter] = []
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        for writer in self._writers:
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def publish(self, channel: str, data: str) -> None:
+        for writer in self._writers:
+            writer.write(
+                b'*3\r\n'
+                + encode_bulk_string(b'message')
+                + encode_bulk_string(channel.encode())
+                + encode_bulk_string(data.encode())
+            )
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.append(writer)
+        while line := await reader.readline():
+            args = []
+            for _ in range(int(line[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            if args[0].upper() == b'SUBSCRIBE':
+                writer.write(b'*3\r\n' + encode_bulk_string(b'subscribe') + encode_bulk_string(args[1]) + b':1\r\n')
+            else:
+                writer.write(b'+OK\r\n')
+
+
+def encode_bulk_string(value: bytes) -> bytes:
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+async def wait_for(condition, timeout: float = 1) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
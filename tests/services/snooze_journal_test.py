@@ -0,0 +1,134 @@
+import os
+
+import pytest
+
+from alert_manager.services.alert_filter_backend import InMemoryAlertFilter
+from alert_manager.services.snooze_journal import SnoozeJournal
+
+
+class TestSnoozeJournal:
+    async def test_load__snoozes_restored_after_restart(self, journal_path):
+        # arrange
+        alert_filter = InMemoryAlertFilter(journal=SnoozeJournal(journal_path))
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/2', 'user', minutes=10)
+        await alert_filter.snooze('other', 'title', 'http://grafana/1', 'user', minutes=10)
+        await alert_filter.wake_up('alerts;http://grafana/2')
+        await alert_filter.close()
+
+        # act
+        restored_alert_filter = InMemoryAlertFilter(journal=SnoozeJournal(journal_path))
+
+        # assert
+        assert restored_alert_filter._snoozed_alerts == alert_filter._snoozed_alerts
+        assert set(restored_alert_filter._snoozed_alerts) == {'alerts;http://grafana/1', 'other;http://grafana/1'}
+        await restored_alert_filter.close()
+
+    async def test_load__more_snoozes_than_max_size__snoozes_which_end_first_dropped(self, journal_path):
+        # arrange
+        with open(journal_path, 'wb') as file:
+            file.write(b'["alerts;http://grafana/1","title","user",4000000002.0]\n')
+            file.write(b'["alerts;http://grafana/2","title","user",4000000000.0]\n')
+            file.write(b'["alerts;http://grafana/3","title","user",4000000001.0]\n')
+
+        # act
+        alert_filter = InMemoryAlertFilter(max_size=2, journal=SnoozeJournal(journal_path))
+
+        # assert
+        assert set(await alert_filter.get_all('alerts')) == {'alerts;http://grafana/1', 'alerts;http://grafana/3'}
+        assert sorted(alert_filter._expirations) == [
+            (4000000001.0, 'alerts;http://grafana/3'),
+            (4000000002.0, 'alerts;http://grafana/1'),
+        ]
+        await alert_filter.close()
+
+    async def test_load__expired_snoozes_discarded(self, journal_path):
+        # arrange
+        with open(journal_path, 'wb') as file:
+            file.write(b'["alerts;http://grafana/1","title","user",1000.0]\n')
+            file.write(b'["alerts;http://grafana/2","title","user",4000000000.0]\n')
+
+        # act
+        snoozes = SnoozeJournal(journal_path).load()
+
+        # assert
+        assert list(snoozes) == ['alerts;http://grafana/2']
+
+    async def test_load__incomplete_last_record__record_skipped(self, journal_path):
+        # arrange
+        with open(journal_path, 'wb') as file:
+            file.write(b'["alerts;http://grafana/1","title","user",4000000000.0]\n')
+            # the application was killed in the middle of a write
+            file.write(b'["alerts;http://grafana/2","tit')
+
+        # act
+        snoozes = SnoozeJournal(journal_path).load()
+
+        # assert
+        assert list(snoozes) == ['alerts;http://grafana/1']
+        with open(journal_path, 'rb') as file:
+            assert file.read().endswith(b'\n')
+
+    async def test_load__corrupt_record_in_the_middle__record_skipped(self, journal_path):
+        # arrange
+        with open(journal_path, 'wb') as file:
+            file.write(b'["alerts;http://grafana/1","title","user",4000000000.0]\n')
+            file.write(b'["alerts;http://grafana/2",tit\n')
+            file.write(b'["alerts;http://grafana/3","title"]\n')
+            file.write(b'["alerts;http://grafana/4","title","user",4000000000.0]\n')
+
+        # act
+        snoozes = SnoozeJournal(journal_path).load()
+
+        # assert
+        assert list(snoozes) == ['alerts;http://grafana/1', 'alerts;http://grafana/4']
+
+    async def test_load__snooze_evicted_by_max_size__not_restored(self, journal_path):
+        # arrange
+        alert_filter = InMemoryAlertFilter(max_size=1, journal=SnoozeJournal(journal_path))
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/2', 'user', minutes=20)
+        await alert_filter.close()
+
+        # act
+        restored_alert_filter = InMemoryAlertFilter(max_size=2, journal=SnoozeJournal(journal_path))
+
+        # assert
+        assert list(await restored_alert_filter.get_all('alerts')) == ['alerts;http://grafana/2']
+        await restored_alert_filter.close()
+
+    async def test_flush__snapshot_interval_passed__log_folded_into_snapshot(self, journal_path):
+        # arrange
+        journal = SnoozeJournal(journal_path, snapshot_interval=0)
+        alert_filter = InMemoryAlertFilter(journal=journal)
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/2', 'user', minutes=10)
+        await alert_filter.wake_up('alerts;http://grafana/2')
+
+        # act
+        await journal._flush()
+
+        # assert
+        assert os.path.getsize(journal_path) == 0
+        assert list(SnoozeJournal(journal_path).load()) == ['alerts;http://grafana/1']
+        await alert_filter.close()
+
+    async def test_flush__snapshot_write_failed__changes_written_to_log(self, journal_path, mocker):
+        # arrange
+        journal = SnoozeJournal(journal_path, snapshot_interval=0)
+        alert_filter = InMemoryAlertFilter(journal=journal)
+        await alert_filter.snooze('alerts', 'title', 'http://grafana/1', 'user', minutes=10)
+        mocker.patch.object(journal, '_write_snapshot', side_effect=OSError('No space left on device'))
+        await journal._flush()
+        journal.snapshot_interval = 300
+
+        # act
+        await journal._flush()
+
+        # assert
+        assert list(SnoozeJournal(journal_path).load()) == ['alerts;http://grafana/1']
+        await alert_filter.close()
+
+    @pytest.fixture(name='journal_path')
+    def journal_path_fixture(self, tmp_path):
+        return str(tmp_path / 'snoozes.log')
@@ -0,0 +1,92 @@
+import pytest
+
+from alert_manager.services.snooze_patterns import SnoozePatternIndex, SnoozePatterns
+
+NOW = 1000.0
+
+
+class TestSnoozePatternIndex:
+    @pytest.mark.parametrize(
+        ('pattern', 'rule_url', 'expected'),
+        [
+            ('http://grafana/d/a1b2/*', 'http://grafana/d/a1b2/overview?viewPanel=1', True),
+            ('http://grafana/d/a1b2/*', 'http://grafana/d/a1b2/', True),
+            ('http://grafana/d/a1b2/*', 'http://grafana/d/a1b3/overview', False),
+            ('http://grafana/d/a1b2/*', 'http://grafana/d/a1', False),
+            ('*', 'http://grafana/d/a1b2/overview', True),
+            ('http://grafana/d/*?viewPanel=1', 'http://grafana/d/a1b2/overview?viewPanel=1', True),
+            ('http://grafana/d/*?viewPanel=1', 'http://grafana/d/a1b2/overview?viewPanel=12', False),
+            # `?` and `.` are not wildcards
+            ('http://grafana/d/*?viewPanel=1', 'http://grafana/d/a1b2/overviewXviewPanel=1', False),
+            ('http://grafana.*/d/a1b2', 'http://grafanaXcom/d/a1b2', False),
+            ('*viewPanel=*', 'http://grafana/d/a1b2/overview?viewPanel=3&orgId=1', True),
+        ],
+    )
+    def test_match(self, pattern, rule_url, expected):
+        # arrange
+        index = SnoozePatternIndex()
+        index.add(pattern, NOW + 60)
+
+        # act
+        result = index.match(rule_url, NOW)
+
+        # assert
+        assert (result is not None) is expected
+
+    def test_match__many_patterns__snoozed_until_of_matched_pattern_returned(self):
+        # arrange
+        index = SnoozePatternIndex()
+        index.add('http://grafana/d/a1b2/*', NOW + 60)
+        index.add('http://grafana/d/c3d4/*', NOW + 120)
+        index.add('http://grafana/d/*?viewPanel=5', NOW + 180)
+        index.add('http://grafana/d/*?viewPanel=6', NOW + 240)
+
+        # act & assert
+        assert index.match('http://grafana/d/c3d4/overview', NOW) == NOW + 120
+        assert index.match('http://grafana/d/e5f6/overview?viewPanel=6', NOW) == NOW + 240
+        assert index.match('http://grafana/d/e5f6/overview?viewPanel=7', NOW) is None
+
+    def test_match__pattern_expired__not_matched(self):
+        # arrange
+        index = SnoozePatternIndex()
+        index.add('http://grafana/d/a1b2/*', NOW + 60)
+        index.add('http://grafana/d/*', NOW + 120)
+
+        # act & assert
+        assert index.match('http://grafana/d/a1b2/overview', NOW + 90) == NOW + 120
+        assert index.match('http://grafana/d/a1b2/overview', NOW + 150) is None
+        assert len(index) == 0
+
+    def test_remove(self):
+        # arrange
+        index = SnoozePatternIndex()
+        index.add('http://grafana/d/a1b2/*', NOW + 60)
+        assert index.match('http://grafana/d/a1b2/overview', NOW) is not None
+
+        # act
+        index.remove('http://grafana/d/a1b2/*')
+
+        # assert
+        assert index.match('http://grafana/d/a1b2/overview', NOW) is None
+
+
+class TestSnoozePatterns:
+    def test_match__pattern_of_other_channel__not_matched(self):
+        # arrange
+        patterns = SnoozePatterns()
+        patterns.add('alerts', 'http://grafana/d/a1b2/*', NOW + 60)
+
+        # act & assert
+        assert patterns.match('alerts', 'http://grafana/d/a1b2/overview', NOW) is True
+        assert patterns.match('other', 'http://grafana/d/a1b2/overview', NOW) is False
+
+    def test_remove__last_pattern_of_channel__channel_dropped(self):
+        # arrange
+        patterns = SnoozePatterns()
+        patterns.add('alerts', 'http://grafana/d/a1b2/*', NOW + 60)
+
+        # act
+        patterns.remove('alerts', 'http://grafana/d/a1b2/*')
+
+        # assert
+        assert patterns._indexes == {}
@@ -1,5 +1,9 @@
+import asyncio
+import json
+from datetime import datetime
 from unittest.mock import MagicMock
 
+import aiohttp
 import pytest
 from aiohttp import web
 from aiohttp.helpers import BasicAuth
@@ -7,7 +11,16 @@ from aiohttp.web_exceptions import HTTPBadRequest, HTTPNotFound
 from pytest_aiohttp.plugin import AiohttpClient
 from pytest_mock import MockFixture
 
+from alert_manager.config import DeliveryOverflowPolicy
+from alert_manager.entities.silence import Silence
 from alert_manager.main import error_logging_middleware
+from alert_manager.services.dedupe_backend import RedisDedupeCache
+from alert_manager.services.silences import parse_matchers
+from alert_manager.services.slack.delivery import DeliveryQueue
+from alert_manager.services.slack.outbox import SlackOutbox
+from alert_manager.web.entities.grafana import GrafanaAlertRequest
+from alert_manager.web.entities.grafana_fast import grafana_alert_decoder
+from alert_manager.web.views import create_dedupe_key
 
 
 class TestGrafanaAlertViewLegacyAlert:
@@ -260,6 +273,581 @@ class TestGrafanaAlertViewLegacyAlert:
         }
 
 
+class TestGrafanaAlertViewDeliveryQueue:
+    async def test_alert_received__message_queued(
+        self, client, delivery_queue, slack_client, legacy_alert_alerting, webhook_url
+    ):
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 202
+        assert delivery_queue.size == 1
+        assert slack_client.chat_postMessage.call_count == 0
+
+    async def test_queue_is_full__service_unavailable(self, client, legacy_alert_alerting, webhook_url):
+        # arrange
+        await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 503
+        assert resp.headers['Retry-After'] == '1'
+
+    @pytest.fixture(name='delivery_queue')
+    def delivery_queue_fixture(self, app, config):
+        config.slack_delivery_shutdown_timeout = 0
+        app['delivery_queue'] = DeliveryQueue(
+            app['alert_notifier'], max_size=1, workers=1, overflow_policy=DeliveryOverflowPolicy.reject
+        )
+        return app['delivery_queue']
+
+    @pytest.fixture
+    async def client(self, aiohttp_client, app, delivery_queue) -> AiohttpClient:
+        return await aiohttp_client(app)
+
+
+class TestGrafanaAlertViewOutbox:
+    async def test_slack_unavailable__message_moved_to_outbox(
+        self, client, slack_client, slack_outbox, legacy_alert_alerting, webhook_url
+    ):
+        # arrange
+        slack_client.chat_postMessage.side_effect = aiohttp.ClientConnectionError()
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 202
+        assert slack_outbox.append.call_args.args[0].text == legacy_alert_alerting['title']
+
+    async def test_not_retryable_error__internal_server_error(
+        self, client, slack_client, slack_outbox, legacy_alert_alerting, webhook_url
+    ):
+        # arrange
+        slack_client.chat_postMessage.side_effect = RuntimeError('invalid message')
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 500
+        slack_outbox.append.assert_not_called()
+
+    @pytest.fixture(name='slack_outbox')
+    def slack_outbox_fixture(self, mocker, app):
+        app['slack_outbox'] = mocker.MagicMock(SlackOutbox)
+        return app['slack_outbox']
+
+    @pytest.fixture
+    async def client(self, aiohttp_client, app, slack_outbox) -> AiohttpClient:
+        return await aiohttp_client(app)
+
+
+class TestGrafanaAlertViewDedupe:
+    async def test_duplicate_alert__message_published_once(
+        self, client, slack_client, legacy_alert_alerting, webhook_url
+    ):
+        # arrange
+        await client.post(webhook_url, json=legacy_alert_alerting)
+        legacy_alert_alerting['evalMatches'].reverse()
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_count == 1
+
+    async def test_same_alert_for_other_channel__message_published(
+        self, client, slack_client, legacy_alert_alerting, webhook_url
+    ):
+        # arrange
+        await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # act
+        resp = await client.post('/webhook/grafana/?channel=other-alerts', json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_count == 2
+
+    async def test_delivery_failed__retry_published(self, client, slack_client, legacy_alert_alerting, webhook_url):
+        # arrange
+        slack_client.chat_postMessage.side_effect = [RuntimeError('slack is down'), {'channel': 'C1', 'ts': '1'}]
+        await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_count == 2
+
+    async def test_bulk_request_with_duplicates__duplicates_reported(self, client, slack_client, legacy_alert_alerting):
+        # act
+        resp = await client.post(
+            '/webhook/grafana/bulk/?channel=alerts', json=[legacy_alert_alerting, legacy_alert_alerting]
+        )
+
+        # assert
+        assert (await resp.json())['summary'] == {'sent': 1, 'duplicate': 1}
+        assert slack_client.chat_postMessage.call_count == 1
+
+    @pytest.fixture
+    async def client(self, aiohttp_client, app) -> AiohttpClient:
+        app['dedupe_cache'] = RedisDedupeCache(app['redis'], ttl=60)
+        return await aiohttp_client(app)
+
+
+class TestGrafanaAlertViewFastIngest:
+    async def test_alert_received__same_message_published(
+        self, mocker: MockFixture, client, slack_client, legacy_alert_alerting, webhook_url, fast_ingest
+    ):
+        # arrange
+        decoder = mocker.patch('alert_manager.web.views.grafana_alert_decoder', wraps=grafana_alert_decoder)
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert decoder.decode.call_count == int(fast_ingest)
+        assert slack_client.chat_postMessage.call_args.kwargs['blocks'][1] == {
+            'type': 'section',
+            'text': {'type': 'mrkdwn', 'text': legacy_alert_alerting['message']},
+            'fields': [{'type': 'mrkdwn', 'text': '*index:* 3'}, {'type': 'mrkdwn', 'text': '*about:* 3.4'}],
+        }
+
+    async def test_lax_payload__accepted_by_pydantic(
+        self, client, slack_client, legacy_alert_alerting, webhook_url, fast_ingest
+    ):
+        # arrange
+        legacy_alert_alerting['evalMatches'][0]['value'] = '3'
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_count == 1
+
+    async def test_null_value__bad_request(self, client, slack_client, legacy_alert_alerting, webhook_url, fast_ingest):
+        # arrange
+        legacy_alert_alerting['evalMatches'][0]['value'] = None
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 400
+        assert slack_client.chat_postMessage.call_count == 0
+
+    @pytest.mark.parametrize(
+        ('body', 'expected_errors'),
+        [
+            (
+                b'{"title": "alert"}',
+                [
+                    {'type': 'missing', 'loc': ['body', 'state'], 'msg': 'Field required'},
+                    {'type': 'missing', 'loc': ['body', 'ruleName'], 'msg': 'Field required'},
+                    {'type': 'missing', 'loc': ['body', 'ruleUrl'], 'msg': 'Field required'},
+                    {'type': 'missing', 'loc': ['body', 'evalMatches'], 'msg': 'Field required'},
+                ],
+            ),
+            (
+                b'not json',
+                [
+                    {
+                        'type': 'model_type',
+                        'loc': ['body'],
+                        'msg': 'Input should be a valid dictionary or instance of GrafanaAlertRequest',
+                        'ctx': {'class_name': 'GrafanaAlertRequest'},
+                    }
+                ],
+            ),
+        ],
+    )
+    async def test_invalid_payload__pydantic_errors_returned(
+        self, client, slack_client, webhook_url, fast_ingest, body, expected_errors
+    ):
+        # act
+        resp = await client.post(webhook_url, data=body, headers={'Content-Type': 'application/json'})
+
+        # assert
+        assert resp.status == 400
+        assert await resp.json() == expected_errors
+        assert slack_client.chat_postMessage.call_count == 0
+
+    @pytest.fixture(name='fast_ingest', params=[False, True], ids=['pydantic', 'fast'])
+    def fast_ingest_fixture(self, app, request):
+        app['fast_ingest'] = request.param
+        return request.param
+
+    @pytest.fixture
+    async def client(self, aiohttp_client, app, fast_ingest) -> AiohttpClient:
+        return await aiohttp_client(app)
+
+
+class TestGrafanaAlertViewSilences:
+    async def test_some_series_silenced__only_other_series_published(
+        self, app, client, slack_client, legacy_alert_alerting, webhook_url, channel, fast_ingest
+    ):
+        # arrange
+        legacy_alert_alerting['evalMatches'][1]['tags']['name'] = 'about'
+        await app['silence_backend'].add(create_silence(channel, 'job="my_app", name="about"'))
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        blocks = slack_client.chat_postMessage.call_args.kwargs['blocks']
+        assert blocks[1]['fields'] == [{'type': 'mrkdwn', 'text': '*index:* 3'}]
+        assert blocks[2] == {
+            'type': 'context',
+            'block_id': 'silenced-matches',
+            'elements': [{'type': 'mrkdwn', 'text': ':mute: 1 silenced series are not shown'}],
+        }
+
+    async def test_all_series_silenced__alert_skipped(
+        self, app, client, slack_client, legacy_alert_alerting, webhook_url, channel, fast_ingest
+    ):
+        # arrange
+        await app['silence_backend'].add(create_silence(channel, 'alertname=~"High load.*", instance="app:8000"'))
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_count == 0
+
+    async def test_silence_of_other_channel__alert_published(
+        self, app, client, slack_client, legacy_alert_alerting, webhook_url, fast_ingest
+    ):
+        # arrange
+        await app['silence_backend'].add(create_silence('other', 'job="my_app"'))
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 200
+        assert len(slack_client.chat_postMessage.call_args.kwargs['blocks'][1]['fields']) == 2
+
+    @pytest.fixture(name='fast_ingest', params=[False, True], ids=['pydantic', 'fast'])
+    def fast_ingest_fixture(self, app, request):
+        app['fast_ingest'] = request.param
+        return request.param
+
+    @pytest.fixture
+    async def client(self, aiohttp_client, app, fast_ingest) -> AiohttpClient:
+        return await aiohttp_client(app)
+
+
+class TestGrafanaAlertViewUnifiedAlert:
+    async def test_alert_group_received__one_message_per_rule_published(
+        self, client, slack_client, unified_alert, channel
+    ):
+        # act
+        resp = await client.post(f'/webhook/grafana/unified/?channel={channel}', json=unified_alert)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_count == 2
+        firing_call, resolved_call = slack_client.chat_postMessage.call_args_list
+        assert firing_call[1]['text'] == '[Alerting] High load on the site'
+        assert firing_call[1]['blocks'][1] == {
+            'type': 'section',
+            'text': {'type': 'mrkdwn', 'text': 'Too many requests'},
+            'fields': [
+                {'type': 'mrkdwn', 'text': '*instance=app-1:8000:* 3'},
+                {'type': 'mrkdwn', 'text': '*instance=app-2:8000:* 3.4'},
+            ],
+        }
+        assert resolved_call[1]['text'] == '[OK] Disk is full'
+        assert len(resolved_call[1]['blocks']) == 1
+
+    async def test_snoozed_rule__only_other_rules_published(
+        self, client, slack_client, alert_filter, unified_alert, channel, mocker
+    ):
+        # arrange
+        await alert_filter.snooze(
+            channel=channel,
+            title='[Alerting] High load on the site',
+            rule_url=unified_alert['alerts'][0]['generatorURL'],
+            snoozed_by='user_nick',
+            minutes=10,
+        )
+        is_snoozed_many = mocker.spy(alert_filter, 'is_snoozed_many')
+
+        # act
+        resp = await client.post(f'/webhook/grafana/unified/?channel={channel}', json=unified_alert)
+
+        # assert
+        assert resp.status == 200
+        assert (await resp.json())['summary'] == {'snoozed': 1, 'sent': 1}
+        assert is_snoozed_many.call_count == 1
+        assert slack_client.chat_postMessage.call_count == 1
+        assert slack_client.chat_postMessage.call_args[1]['text'] == '[OK] Disk is full'
+
+    async def test_alert_values__value_of_query_shown_and_instances_without_values_kept(
+        self, client, slack_client, unified_alert, channel
+    ):
+        # arrange
+        unified_alert['alerts'][0]['values'] = {'C': 1, 'B': 3}
+        unified_alert['alerts'][1]['values'] = None
+
+        # act
+        resp = await client.post(f'/webhook/grafana/unified/?channel={channel}', json=unified_alert)
+
+        # assert
+        assert resp.status == 200
+        assert slack_client.chat_postMessage.call_args_list[0][1]['blocks'][1]['fields'] == [
+            {'type': 'mrkdwn', 'text': '*instance=app-1:8000:* 3'},
+            {'type': 'mrkdwn', 'text': '*instance=app-2:8000*'},
+        ]
+
+    async def test_delivery_failed__other_rules_delivered(self, client, slack_client, unified_alert, channel):
+        # arrange
+        async def post_message(**kwargs):
+            if kwargs['text'].startswith('[Alerting]'):
+                raise RuntimeError('invalid message')
+            return {'channel': 'C1234567890', 'ts': '1689033600.000100'}
+
+        slack_client.chat_postMessage.side_effect = post_message
+
+        # act
+        resp = await client.post(f'/webhook/grafana/unified/?channel={channel}', json=unified_alert)
+
+        # assert
+        assert resp.status == 200
+        assert await resp.json() == {
+            'summary': {'error': 1, 'sent': 1},
+            'results': [
+                {
+                    'rule_url': 'http://localhost:3000/alerting/grafana/high-load/view?orgId=1',
+                    'state': 'alerting',
+                    'status': 'error',
+                },
+                {
+                    'rule_url': 'http://localhost:3000/alerting/grafana/disk-full/view?orgId=1',
+                    'state': 'ok',
+                    'status': 'sent',
+                },
+            ],
+        }
+
+    async def test_invalid_payload__bad_request(self, client, channel):
+        # act
+        resp = await client.post(f'/webhook/grafana/unified/?channel={channel}', json={'status': 'firing'})
+
+        # assert
+        assert resp.status == 400
+
+
+class TestGrafanaBulkAlertView:
+    async def test_json_array__alerts_published(self, client, slack_client, legacy_alert_alerting, legacy_alert_ok):
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting, legacy_alert_ok])
+
+        # assert
+        assert resp.status == 200
+        assert await resp.json() == {
+            'summary': {'sent': 2},
+            'results': [{'status': 'sent'}, {'status': 'sent'}],
+        }
+        assert slack_client.chat_postMessage.call_count == 2
+
+    async def test_ndjson__alerts_published(self, client, slack_client, legacy_alert_alerting, legacy_alert_ok):
+        # arrange
+        body = '\n'.join(json.dumps(alert) for alert in (legacy_alert_alerting, legacy_alert_ok)) + '\n'
+
+        # act
+        resp = await client.post(self.url, data=body, headers={'Content-Type': 'application/x-ndjson'})
+
+        # assert
+        assert resp.status == 200
+        assert (await resp.json())['summary'] == {'sent': 2}
+        assert slack_client.chat_postMessage.call_count == 2
+
+    async def test_chunked_ndjson__alerts_published(self, client, slack_client, legacy_alert_alerting, legacy_alert_ok):
+        # arrange
+        body = ('\n'.join(json.dumps(alert) for alert in (legacy_alert_alerting, legacy_alert_ok)) + '\n').encode()
+
+        async def chunks():
+            for i in range(0, len(body), 10):
+                yield body[i : i + 10]
+
+        # act
+        resp = await client.post(self.url, data=chunks(), headers={'Content-Type': 'application/x-ndjson'})
+
+        # assert
+        assert resp.status == 200
+        assert (await resp.json())['summary'] == {'sent': 2}
+
+    async def test_chunked_body_is_too_large__request_rejected(self, app, client, slack_client, legacy_alert_ok):
+        # arrange
+        app['webhook_max_body_size'] = 1000
+        line = json.dumps(legacy_alert_ok).encode() + b'\n'
+
+        async def chunks():
+            for _ in range(10):
+                yield line
+
+        # act
+        resp = await client.post(self.url, data=chunks(), headers={'Content-Type': 'application/x-ndjson'})
+
+        # assert
+        assert resp.status == 413
+        assert slack_client.chat_postMessage.call_count == 0
+
+    @pytest.mark.parametrize('content_type', ['application/json', 'application/x-ndjson'])
+    async def test_alert_is_too_large__request_rejected(
+        self, app, client, slack_client, legacy_alert_alerting, legacy_alert_ok, content_type
+    ):
+        # arrange
+        app['bulk_max_alert_size'] = len(json.dumps(legacy_alert_ok)) + 10
+        alerts = [legacy_alert_ok, legacy_alert_alerting]
+        body = json.dumps(alerts) if content_type == 'application/json' else '\n'.join(map(json.dumps, alerts))
+
+        # act
+        resp = await client.post(self.url, data=body, headers={'Content-Type': content_type})
+
+        # assert
+        assert resp.status == 413
+        assert slack_client.chat_postMessage.call_count == 0
+
+    async def test_delivery_failed__error_status_returned_and_other_alerts_delivered(
+        self, client, slack_client, legacy_alert_alerting, legacy_alert_ok
+    ):
+        # arrange
+        async def post_message(**kwargs):
+            if kwargs['text'].startswith('[Alerting]'):
+                raise RuntimeError('invalid message')
+            return {'channel': 'C1234567890', 'ts': '1689033600.000100'}
+
+        slack_client.chat_postMessage.side_effect = post_message
+        other_alert = {**legacy_alert_ok, 'ruleUrl': 'http://grafana/other-rule'}
+
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting, other_alert])
+
+        # assert
+        assert resp.status == 200
+        assert await resp.json() == {
+            'summary': {'error': 1, 'sent': 1},
+            'results': [{'status': 'error'}, {'status': 'sent'}],
+        }
+
+    async def test_invalid_and_snoozed_alerts__per_alert_results_returned(
+        self, client, slack_client, alert_filter, alert_metadata, legacy_alert_alerting, legacy_alert_ok, mocker
+    ):
+        # arrange
+        await alert_filter.snooze(
+            channel=alert_metadata.channel,
+            title=alert_metadata.title,
+            rule_url=alert_metadata.rule_url,
+            snoozed_by='user_nick',
+            minutes=10,
+        )
+        is_snoozed_many = mocker.spy(alert_filter, 'is_snoozed_many')
+        other_alert = {**legacy_alert_ok, 'ruleUrl': 'http://grafana/other-rule'}
+
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting, {'title': 'broken'}, other_alert])
+
+        # assert
+        assert resp.status == 200
+        body = await resp.json()
+        assert body['summary'] == {'snoozed': 1, 'invalid': 1, 'sent': 1}
+        assert [result['status'] for result in body['results']] == ['snoozed', 'invalid', 'sent']
+        assert {error['loc'][0] for error in body['results'][1]['errors']} == {
+            'state',
+            'ruleName',
+            'ruleUrl',
+            'evalMatches',
+        }
+        assert is_snoozed_many.call_count == 1
+        assert slack_client.chat_postMessage.call_count == 1
+
+    async def test_silenced_alert__silenced_status_returned(
+        self, app, client, slack_client, legacy_alert_alerting, legacy_alert_ok
+    ):
+        # arrange
+        await app['silence_backend'].add(create_silence('alerts', 'job="my_app"'))
+
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting, legacy_alert_ok])
+
+        # assert
+        assert resp.status == 200
+        assert (await resp.json())['results'] == [{'status': 'silenced'}, {'status': 'sent'}]
+        assert slack_client.chat_postMessage.call_count == 1
+
+    async def test_body_is_not_array__bad_request(self, client, legacy_alert_alerting):
+        # act
+        resp = await client.post(self.url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 400
+
+    async def test_delivery_timeout__rest_of_alerts_queued_and_sent_in_background(
+        self, app, client, slack_client, legacy_alert_alerting, legacy_alert_ok
+    ):
+        # arrange
+        app['bulk_delivery_concurrency'] = 1
+        app['bulk_delivery_timeout'] = 0.05
+        sent = asyncio.Event()
+
+        async def post_message(**kwargs):
+            if kwargs['text'].startswith('[OK]'):
+                await asyncio.sleep(0.1)
+                sent.set()
+            return {'channel': 'C1234567890', 'ts': '1689033600.000100'}
+
+        slack_client.chat_postMessage.side_effect = post_message
+        other_alert = {**legacy_alert_ok, 'ruleUrl': 'http://grafana/other-rule'}
+
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting, other_alert])
+
+        # assert
+        assert resp.status == 200
+        assert (await resp.json())['results'] == [{'status': 'sent'}, {'status': 'queued'}]
+        await asyncio.wait_for(sent.wait(), timeout=1)
+        assert slack_client.chat_postMessage.call_count == 2
+
+    async def test_alerts_of_same_rule__delivered_in_order(
+        self, client, slack_client, legacy_alert_alerting, legacy_alert_ok
+    ):
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting, legacy_alert_ok, legacy_alert_alerting])
+
+        # assert
+        assert resp.status == 200
+        states = [call[1]['text'].split()[0] for call in slack_client.chat_postMessage.call_args_list]
+        assert states == ['[Alerting]', '[OK]', '[Alerting]']
+
+    async def test_too_many_alerts__request_rejected(self, app, client, slack_client, legacy_alert_alerting):
+        # arrange
+        app['bulk_max_alerts'] = 2
+
+        # act
+        resp = await client.post(self.url, json=[legacy_alert_alerting] * 3)
+
+        # assert
+        assert resp.status == 413
+        assert slack_client.chat_postMessage.call_count == 0
+
+    @property
+    def url(self) -> str:
+        return '/webhook/grafana/bulk/?channel=alerts'
+
+
 async def test_grafana_alert_view(client: AiohttpClient, slack_client, webhook_url, channel):
     # act
     resp = await client.get('/health-check/')
@@ -269,6 +857,79 @@ async def test_grafana_alert_view(client: AiohttpClient, slack_client, webhook_u
     assert await resp.json() == {'status': 'ok'}
 
 
+def test_create_dedupe_key__fast_and_pydantic_payloads__same_key(legacy_alert_alerting):
+    # arrange
+    body = json.dumps(legacy_alert_alerting).encode()
+
+    # act
+    keys = {
+        create_dedupe_key('alerts', GrafanaAlertRequest.model_validate_json(body)),
+        create_dedupe_key('alerts', grafana_alert_decoder.decode(body)),
+    }
+
+    # assert
+    assert len(keys) == 1
+
+
+async def test_stats_view(client: AiohttpClient, app):
+    # arrange
+    app['slack_sender'].stats['throttled'] += 1
+
+    # act
+    resp = await client.get('/stats/')
+
+    # assert
+    assert resp.status == 200
+    assert await resp.json() == {'admission': {}, 'slack_sender': {'throttled': 1}, 'alert_notifier': {}}
+
+
+async def test_stats_view__accounts_configured__credentials_required(client: AiohttpClient, config):
+    # arrange
+    config.accounts.update({'admin': 'admin'})
+
+    # act
+    resp = await client.get('/stats/')
+    authorized_resp = await client.get('/stats/', auth=BasicAuth('admin', 'admin'))
+
+    # assert
+    assert resp.status == 401
+    assert authorized_resp.status == 200
+
+
+class TestAdmissionMiddleware:
+    async def test_too_many_requests_in_flight__webhook_request_shed(
+        self, app, client, slack_client, legacy_alert_alerting, webhook_url
+    ):
+        # arrange
+        app['admission_control'].in_flight = app['admission_control'].max_in_flight
+
+        # act
+        resp = await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert resp.status == 503
+        assert resp.headers['Retry-After'] == '1'
+        assert slack_client.chat_postMessage.call_count == 0
+        assert app['stats']['admission'] == {'shed': 1}
+
+    async def test_too_many_requests_in_flight__other_requests_handled(self, app, client):
+        # arrange
+        app['admission_control'].in_flight = app['admission_control'].max_in_flight
+
+        # act
+        resp = await client.get('/health-check/')
+
+        # assert
+        assert resp.status == 200
+
+    async def test_request_handled__in_flight_counter_released(self, app, client, legacy_alert_alerting, webhook_url):
+        # act
+        await client.post(webhook_url, json=legacy_alert_alerting)
+
+        # assert
+        assert app['admission_control'].in_flight == 0
+
+
 class TestErrorLoggingMiddleware:
     async def test_successful_response__no_logging(
         self,
@@ -390,3 +1051,13 @@ class TestErrorLoggingMiddleware:
     @pytest.fixture
     async def client(self, aiohttp_client, app) -> AiohttpClient:
         return await aiohttp_client(app)
+
+
+def create_silence(channel: str, matchers: str) -> Silence:
+    return Silence(
+        id='silence-id',
+        channel=channel,
+        matchers=parse_matchers(matchers),
+        created_by='user',
+        ends_at=datetime.now().timestamp() + 3600,
+    )